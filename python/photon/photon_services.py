@@ -20,7 +20,8 @@ def start_local_scheduler(plasma_store_name,
                           use_profiler=False,
                           redirect_output=False,
                           static_resource_list=None,
-                          num_workers=0):
+                          num_workers=0,
+                          worker_fork_server_name=None):
   """Start a local scheduler process.
 
   Args:
@@ -48,6 +49,9 @@ def start_local_scheduler(plasma_store_name,
       matching the order defined in task.h.
     num_workers (int): The number of workers that the local scheduler should
       start.
+    worker_fork_server_name (str): The socket of a worker fork server that the
+      local scheduler should ask to start workers. This is only used if the
+      worker_path is provided.
 
   Return:
     A tuple of the name of the local scheduler socket and the process ID of the
@@ -83,6 +87,8 @@ def start_local_scheduler(plasma_store_name,
                                                          local_scheduler_name,
                                                          redis_address)
     command += ["-w", start_worker_command]
+    if worker_fork_server_name is not None:
+      command += ["-z", worker_fork_server_name]
   if redis_address is not None:
     command += ["-r", redis_address]
   if plasma_address is not None:
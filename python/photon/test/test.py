@@ -125,6 +125,21 @@ class TestPhotonClient(unittest.TestCase):
       for num_return_vals in [0, 1, 2, 3, 5, 10, 100]:
         new_task = self.photon_client.get_task()
 
+  def test_submit_batch_and_get_task(self):
+    function_id = random_function_id()
+    tasks = [photon.Task(random_driver_id(), function_id, [i, "a"], 1, random_task_id(), 0) for i in range(100)]
+    # Submit all of the tasks in a single message.
+    self.photon_client.submit_batch(tasks)
+    # Get all of the tasks.
+    task_ids = set()
+    for _ in range(len(tasks)):
+      new_task = self.photon_client.get_task()
+      self.assertEqual(function_id.id(), new_task.function_id().id())
+      task_ids.add(new_task.task_id().id())
+    self.assertEqual(task_ids, set([task.task_id().id() for task in tasks]))
+    # Submitting an empty batch should be allowed.
+    self.photon_client.submit_batch([])
+
   def test_scheduling_when_objects_ready(self):
     # Create a task and submit it.
     object_id = random_object_id()
@@ -222,7 +222,9 @@ class PlasmaClient(object):
   def delete(self, object_id):
     """Delete the buffer in the PlasmaStore for a particular object ID.
 
-    Once a buffer has been deleted, the buffer is no longer accessible.
+    Once a buffer has been deleted, the buffer is no longer accessible. If other
+    clients are using the buffer, it is deleted once they have all released it.
+    Objects that are not present or have not been sealed are not deleted.
 
     Args:
       object_id (str): A string used to identify an object.
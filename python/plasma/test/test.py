@@ -308,47 +308,47 @@ class TestPlasmaClient(unittest.TestCase):
     # Check that all hashes were unique.
     self.assertEqual(len(set(hashes)), 256 + length + length)
 
-  # def test_individual_delete(self):
-  #   length = 100
-  #   # Create an object id string.
-  #   object_id = random_object_id()
-  #   # Create a random metadata string.
-  #   metadata = generate_metadata(100)
-  #   # Create a new buffer and write to it.
-  #   memory_buffer = self.plasma_client.create(object_id, length, metadata)
-  #   for i in range(length):
-  #     memory_buffer[i] = chr(i % 256)
-  #   # Seal the object.
-  #   self.plasma_client.seal(object_id)
-  #   # Check that the object is present.
-  #   self.assertTrue(self.plasma_client.contains(object_id))
-  #   # Delete the object.
-  #   self.plasma_client.delete(object_id)
-  #   # Make sure the object is no longer present.
-  #   self.assertFalse(self.plasma_client.contains(object_id))
-  #
-  # def test_delete(self):
-  #   # Create some objects.
-  #   object_ids = [random_object_id() for _ in range(100)]
-  #   for object_id in object_ids:
-  #     length = 100
-  #     # Create a random metadata string.
-  #     metadata = generate_metadata(100)
-  #     # Create a new buffer and write to it.
-  #     memory_buffer = self.plasma_client.create(object_id, length, metadata)
-  #     for i in range(length):
-  #       memory_buffer[i] = chr(i % 256)
-  #     # Seal the object.
-  #     self.plasma_client.seal(object_id)
-  #     # Check that the object is present.
-  #     self.assertTrue(self.plasma_client.contains(object_id))
-  #
-  #   # Delete the objects and make sure they are no longer present.
-  #   for object_id in object_ids:
-  #     # Delete the object.
-  #     self.plasma_client.delete(object_id)
-  #     # Make sure the object is no longer present.
-  #     self.assertFalse(self.plasma_client.contains(object_id))
+  def test_individual_delete(self):
+    length = 100
+    # Create an object id string.
+    object_id = random_object_id()
+    # Create a random metadata string.
+    metadata = generate_metadata(100)
+    # Create a new buffer and write to it.
+    memory_buffer = self.plasma_client.create(object_id, length, metadata)
+    for i in range(length):
+      memory_buffer[i] = chr(i % 256)
+    # Seal the object.
+    self.plasma_client.seal(object_id)
+    # Check that the object is present.
+    self.assertTrue(self.plasma_client.contains(object_id))
+    # Delete the object.
+    self.plasma_client.delete(object_id)
+    # Make sure the object is no longer present.
+    self.assertFalse(self.plasma_client.contains(object_id))
+
+  def test_delete(self):
+    # Create some objects.
+    object_ids = [random_object_id() for _ in range(100)]
+    for object_id in object_ids:
+      length = 100
+      # Create a random metadata string.
+      metadata = generate_metadata(100)
+      # Create a new buffer and write to it.
+      memory_buffer = self.plasma_client.create(object_id, length, metadata)
+      for i in range(length):
+        memory_buffer[i] = chr(i % 256)
+      # Seal the object.
+      self.plasma_client.seal(object_id)
+      # Check that the object is present.
+      self.assertTrue(self.plasma_client.contains(object_id))
+
+    # Delete the objects and make sure they are no longer present.
+    for object_id in object_ids:
+      # Delete the object.
+      self.plasma_client.delete(object_id)
+      # Make sure the object is no longer present.
+      self.assertFalse(self.plasma_client.contains(object_id))
 
   def test_illegal_functionality(self):
     # Create an object id string.
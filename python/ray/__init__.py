@@ -15,7 +15,8 @@ if hasattr(ctypes, "windll"):
 
 import ray.experimental
 import ray.serialization
-from ray.worker import register_class, error_info, init, connect, disconnect, get, put, wait, remote, log_event, log_span, flush_log
+from ray.worker import register_class, error_info, init, connect, disconnect, get, put, wait, as_completed, remote, log_event, log_span, flush_log
 from ray.actor import actor
+from ray.async_api import get_async, wait_async
 from ray.worker import EnvironmentVariable, env
 from ray.worker import SCRIPT_MODE, WORKER_MODE, PYTHON_MODE, SILENT_MODE
@@ -49,7 +49,9 @@ def fetch_and_register_actor(key, worker):
     worker.actors[actor_id_str] = unpickled_class.__new__(unpickled_class)
     for (k, v) in inspect.getmembers(unpickled_class, predicate=(lambda x: inspect.isfunction(x) or inspect.ismethod(x))):
       function_id = get_actor_method_function_id(k).id()
-      worker.function_names[function_id] = k
+      # Actor method function IDs only depend on the method name, so qualify
+      # the name with the class to tell the methods of different actors apart.
+      worker.function_names[function_id] = "{}.{}.{}".format(module, actor_name, k)
       worker.functions[function_id] = v
 
 def export_actor(actor_id, Class, worker):
@@ -94,7 +96,6 @@ def actor(Class):
   # method on their local actor stub object.
   def actor_method_call(actor_id, attr, *args, **kwargs):
     ray.worker.check_connected()
-    ray.worker.check_main_thread()
     args = list(args)
     if len(kwargs) > 0:
       raise Exception("Actors currently do not support **kwargs.")
@@ -112,6 +113,25 @@ def actor(Class):
     elif len(object_ids) > 1:
       return object_ids
 
+  # The function actor_method_batch_call gets called if somebody calls
+  # remote_batch on a method of their local actor stub object.
+  def actor_method_batch_call(actor_id, attr, args_list):
+    ray.worker.check_connected()
+    function_id = get_actor_method_function_id(attr)
+    num_cpus = 0
+    num_gpus = 0
+    results = []
+    for object_ids in ray.worker.global_worker.submit_task_batch(
+        function_id, "", [list(args) for args in args_list], num_cpus,
+        num_gpus, actor_id=actor_id):
+      if len(object_ids) == 1:
+        results.append(object_ids[0])
+      elif len(object_ids) > 1:
+        results.append(object_ids)
+      else:
+        results.append(None)
+    return results
+
   class NewClass(object):
     def __init__(self, *args, **kwargs):
       self._ray_actor_id = random_actor_id()
@@ -130,7 +150,10 @@ def actor(Class):
       if attr in ["_ray_actor_id", "_ray_actor_methods"]:
         return super(NewClass, self).__getattribute__(attr)
       if attr in self._ray_actor_methods.keys():
-        return lambda *args, **kwargs: actor_method_call(self._ray_actor_id, attr, *args, **kwargs)
+        actor_id = self._ray_actor_id
+        method = lambda *args, **kwargs: actor_method_call(actor_id, attr, *args, **kwargs)
+        method.remote_batch = lambda args_list: actor_method_batch_call(actor_id, attr, args_list)
+        return method
       # There is no method with this name, so raise an exception.
       raise AttributeError("'{}' Actor object has no attribute '{}'".format(Class, attr))
     def __repr__(self):
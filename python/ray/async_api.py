@@ -0,0 +1,275 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+
+import plasma
+
+import ray.worker
+
+class _Waiter(object):
+  """The state of a single call to get_async or wait_async.
+
+  Attributes:
+    object_ids (List[str]): The IDs of the objects being waited on.
+    num_returns (int): The number of objects that must be sealed before the
+      future is resolved.
+    ready (Set[str]): The IDs of the objects that have been sealed so far.
+    future (asyncio.Future): The future to resolve once enough objects have
+      been sealed.
+    reconstruct (bool): True if the local scheduler should be asked to
+      reconstruct objects that take a long time to appear.
+    timeout_handle (asyncio.TimerHandle): The handle of the call that resolves
+      the future when the timeout expires, or None if there is no timeout.
+  """
+
+  def __init__(self, object_ids, num_returns, future, reconstruct):
+    """Initialize a _Waiter object."""
+    self.object_ids = object_ids
+    self.num_returns = num_returns
+    self.ready = set()
+    self.future = future
+    self.reconstruct = reconstruct
+    self.timeout_handle = None
+
+  def is_done(self):
+    return len(self.ready) >= self.num_returns
+
+class AsyncNotifier(object):
+  """Resolve futures when objects are sealed in the local object store.
+
+  This uses a dedicated plasma client that is subscribed to the plasma store's
+  seal notifications. The notification socket is registered with an asyncio
+  event loop, so waiting for objects never blocks the loop.
+
+  Attributes:
+    loop: The asyncio event loop that the notification socket is registered
+      with.
+    worker: The worker whose object store and local scheduler are used.
+    plasma_client: The plasma client used for notifications.
+    waiters (Dict[str, List[_Waiter]]): A mapping from the ID of an object that
+      has not been sealed yet to the waiters that are waiting for it.
+  """
+
+  def __init__(self, loop, worker):
+    """Initialize an AsyncNotifier and start listening for notifications."""
+    self.loop = loop
+    self.worker = worker
+    self.plasma_client = plasma.PlasmaClient(worker.plasma_client.store_socket_name,
+                                             worker.plasma_client.manager_socket_name)
+    self.plasma_client.subscribe()
+    self.waiters = collections.defaultdict(list)
+    self.retry_handle = None
+    self.loop.add_reader(self.plasma_client.notification_fd,
+                         self._process_notification)
+
+  def shutdown(self):
+    """Stop listening for notifications and cancel all pending futures."""
+    self.loop.remove_reader(self.plasma_client.notification_fd)
+    if self.retry_handle is not None:
+      self.retry_handle.cancel()
+      self.retry_handle = None
+    for waiters in self.waiters.values():
+      for waiter in waiters:
+        if waiter.timeout_handle is not None:
+          waiter.timeout_handle.cancel()
+        if not waiter.future.done():
+          waiter.future.cancel()
+    self.waiters.clear()
+    self.plasma_client.shutdown()
+
+  def wait_for(self, object_ids, num_returns, timeout=None, reconstruct=False):
+    """Return a future that is resolved when num_returns objects are sealed.
+
+    Args:
+      object_ids (List[str]): The IDs of the objects to wait for.
+      num_returns (int): The number of objects that must be sealed.
+      timeout (int): The maximum amount of time in milliseconds to wait before
+        resolving the future. If this is None, wait indefinitely.
+      reconstruct (bool): True if objects that do not appear should be
+        reconstructed.
+
+    Returns:
+      A future whose result is the set of IDs of the sealed objects.
+    """
+    future = self.loop.create_future()
+    waiter = _Waiter(object_ids, num_returns, future, reconstruct)
+    # We check for objects that are already present after subscribing, so any
+    # object that is sealed after this check will produce a notification.
+    missing_ids = []
+    for object_id in object_ids:
+      if self.plasma_client.contains(object_id):
+        waiter.ready.add(object_id)
+      else:
+        missing_ids.append(object_id)
+    if waiter.is_done():
+      future.set_result(waiter.ready)
+      return future
+    for object_id in missing_ids:
+      self.waiters[object_id].append(waiter)
+    # Ask the plasma manager to transfer any objects that live on other nodes.
+    # The request is repeated until the objects appear, since a single fetch
+    # may fail.
+    self.worker.plasma_client.fetch(missing_ids)
+    if timeout is not None:
+      waiter.timeout_handle = self.loop.call_later(timeout / 1000,
+                                                   self._resolve, waiter)
+    self._schedule_retry()
+    return future
+
+  def _resolve(self, waiter):
+    """Resolve a waiter's future and stop tracking the waiter."""
+    if waiter.timeout_handle is not None:
+      waiter.timeout_handle.cancel()
+      waiter.timeout_handle = None
+    if not waiter.future.done():
+      waiter.future.set_result(waiter.ready)
+    for object_id in waiter.object_ids:
+      waiters = self.waiters.get(object_id)
+      if waiters is not None and waiter in waiters:
+        waiters.remove(waiter)
+        if len(waiters) == 0:
+          del self.waiters[object_id]
+
+  def _process_notification(self):
+    """Handle a single notification from the plasma store."""
+    object_id, data_size, metadata_size = self.plasma_client.get_next_notification()
+    # A data size of -1 indicates that the object was deleted.
+    if data_size == -1 or object_id not in self.waiters:
+      return
+    for waiter in self.waiters.pop(object_id):
+      waiter.ready.add(object_id)
+      if waiter.is_done():
+        self._resolve(waiter)
+
+  def _schedule_retry(self):
+    if self.retry_handle is None:
+      self.retry_handle = self.loop.call_later(
+          ray.worker.GET_TIMEOUT_MILLISECONDS / 1000, self._retry)
+
+  def _retry(self):
+    """Fetch the missing objects again and reconstruct those for get_async."""
+    self.retry_handle = None
+    unready_ids = list(self.waiters.keys())
+    if len(unready_ids) == 0:
+      return
+    self.worker.plasma_client.fetch(unready_ids)
+    reconstruct_ids = [object_id for object_id in unready_ids
+                       if any(waiter.reconstruct
+                              for waiter in self.waiters[object_id])]
+    if len(reconstruct_ids) > 0:
+      with self.worker.photon_lock:
+        for object_id in reconstruct_ids:
+          self.worker.photon_client.reconstruct_object(object_id)
+    self._schedule_retry()
+
+def _get_notifier(worker):
+  """Return the AsyncNotifier for the current event loop, creating it if needed."""
+  import asyncio
+  loop = asyncio.get_event_loop()
+  notifier = worker.async_notifier
+  if notifier is not None and notifier.loop is not loop:
+    notifier.shutdown()
+    notifier = None
+  if notifier is None:
+    notifier = AsyncNotifier(loop, worker)
+    worker.async_notifier = notifier
+  return notifier
+
+def _completed_future(value):
+  import asyncio
+  future = asyncio.get_event_loop().create_future()
+  future.set_result(value)
+  return future
+
+def get_async(object_ids, worker=ray.worker.global_worker):
+  """Get a remote object or a list of remote objects without blocking.
+
+  This is the awaitable version of ray.get. Instead of blocking until the
+  objects are available, it returns a future that is resolved with the values
+  once the objects have been sealed in the local object store. It must be
+  called from within a running asyncio event loop, for example with
+  'values = await ray.get_async(object_ids)'.
+
+  Args:
+    object_ids: Object ID of the object to get or a list of object IDs to get.
+
+  Returns:
+    An asyncio.Future whose result is a Python object or a list of Python
+      objects. If the task that created one of the objects failed, the future's
+      exception is a RayGetError.
+  """
+  ray.worker.check_connected(worker)
+  if worker.mode == ray.worker.PYTHON_MODE:
+    # In PYTHON_MODE, ray.get is the identity operation.
+    return _completed_future(object_ids)
+  import asyncio
+  is_list = isinstance(object_ids, list)
+  object_id_list = object_ids if is_list else [object_ids]
+  result = asyncio.get_event_loop().create_future()
+  # Deduplicate the IDs because we wait for every distinct object.
+  object_id_strs = list(set(object_id.id() for object_id in object_id_list))
+  ready = _get_notifier(worker).wait_for(object_id_strs, len(object_id_strs),
+                                         reconstruct=True)
+
+  def on_ready(ready_future):
+    if result.done():
+      return
+    if ready_future.cancelled():
+      result.cancel()
+      return
+    # All of the objects are local at this point, so this will not block.
+    try:
+      values = ray.worker.get(object_id_list, worker=worker)
+    except Exception as e:
+      result.set_exception(e)
+    else:
+      result.set_result(values if is_list else values[0])
+  ready.add_done_callback(on_ready)
+  return result
+
+def wait_async(object_ids, num_returns=1, timeout=None, worker=ray.worker.global_worker):
+  """Wait for object IDs to become ready without blocking.
+
+  This is the awaitable version of ray.wait, for example
+  'ready_ids, remaining_ids = await ray.wait_async(object_ids)'.
+
+  Args:
+    object_ids (List[ObjectID]): List of object IDs for objects that may or may
+      not be ready. Note that these IDs must be unique.
+    num_returns (int): The number of object IDs that should be returned.
+    timeout (int): The maximum amount of time in milliseconds to wait before
+      returning.
+
+  Returns:
+    An asyncio.Future whose result is a list of object IDs that are ready and a
+      list of the remaining object IDs.
+  """
+  ray.worker.check_connected(worker)
+  if worker.mode == ray.worker.PYTHON_MODE:
+    # In PYTHON_MODE, the object IDs are the values and are all ready.
+    return _completed_future((object_ids[:num_returns], object_ids[num_returns:]))
+  object_id_strs = [object_id.id() for object_id in object_ids]
+  if len(object_id_strs) != len(set(object_id_strs)):
+    raise Exception("Wait requires a list of unique object IDs.")
+  import asyncio
+  result = asyncio.get_event_loop().create_future()
+  ready = _get_notifier(worker).wait_for(object_id_strs, num_returns,
+                                         timeout=timeout)
+
+  def on_ready(ready_future):
+    if result.done():
+      return
+    if ready_future.cancelled():
+      result.cancel()
+      return
+    ready_id_strs = ready_future.result()
+    ready_ids = [object_id for object_id in object_ids
+                 if object_id.id() in ready_id_strs][:num_returns]
+    ready_id_strs = set(object_id.id() for object_id in ready_ids)
+    remaining_ids = [object_id for object_id in object_ids
+                     if object_id.id() not in ready_id_strs]
+    result.set_result((ready_ids, remaining_ids))
+  ready.add_done_callback(on_ready)
+  return result
@@ -0,0 +1,213 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import random
+import struct
+import threading
+import time
+
+# The version of the binary format produced by EventLog.flush.
+EVENT_LOG_VERSION = 1
+# The header of a flushed batch: the format version, the number of records, the
+# number of records that were dropped because the buffer was full, and the
+# number of event type names.
+HEADER = struct.Struct("<BIII")
+# A single event: the timestamp, the index of the event type name, the kind of
+# the event (LOG_POINT, LOG_SPAN_START or LOG_SPAN_END), and whether the event
+# has contents. The contents are appended after the records in the same order.
+RECORD = struct.Struct("<dHBB")
+STRING_LENGTH = struct.Struct("<I")
+NUM_PAIRS = struct.Struct("<H")
+
+# The default number of events that fit in the buffer of one worker.
+DEFAULT_CAPACITY = 4096
+
+def _encode_string(value):
+  if not isinstance(value, bytes):
+    value = str(value).encode("utf-8")
+  return STRING_LENGTH.pack(len(value)) + value
+
+def _encode_contents(contents):
+  encoded = [NUM_PAIRS.pack(len(contents))]
+  for key, value in contents.items():
+    encoded.append(_encode_string(key))
+    encoded.append(_encode_string(value))
+  return b"".join(encoded)
+
+def _decode_string(data, offset):
+  length, = STRING_LENGTH.unpack_from(data, offset)
+  offset += STRING_LENGTH.size
+  return data[offset:offset + length].decode("utf-8"), offset + length
+
+class EventLog(object):
+  """A buffer of fixed-size binary event records.
+
+  Logging an event packs a single record into one of two preallocated buffers.
+  Flushing swaps the buffers, so that events can be logged while the full one
+  is encoded. The event type names are interned, and the keys and values of the
+  contents of an event are converted to strings and encoded when it is logged,
+  so that later changes to them do not affect the log and objects such as
+  tracebacks are not kept alive. If more events are logged than fit in the
+  buffer, the oldest events are overwritten.
+
+  Events are logged for a batch (usually a single task) with probability
+  sampling_rate. The sampling decision is made once per batch so that sampled
+  batches contain all of their events.
+
+  Attributes:
+    capacity (int): The maximum number of events in the buffer.
+    sampling_rate (float): The fraction of batches for which events are logged.
+    sampled (bool): True if events are logged for the current batch.
+  """
+
+  def __init__(self, capacity=DEFAULT_CAPACITY, sampling_rate=1.0):
+    """Initialize an empty EventLog."""
+    self.capacity = capacity
+    self.sampling_rate = sampling_rate
+    self.sampled = random.random() < sampling_rate
+    self._buffer = bytearray(capacity * RECORD.size)
+    # The encoded contents of the event in each slot of the buffer, if any.
+    # Every slot that is written also sets its contents, so the buffers are
+    # never cleared.
+    self._contents = [None] * capacity
+    # The buffer and contents that are swapped in by the next flush.
+    self._spare_buffer = bytearray(capacity * RECORD.size)
+    self._spare_contents = [None] * capacity
+    self._num_events = 0
+    self._event_type_indices = {}
+    self._encoded_event_types = b""
+    # This lock is held while an event is written to the buffer and while the
+    # buffer is swapped out by flush, so that flush never sees a record
+    # without its contents.
+    self._lock = threading.Lock()
+    # This lock is held for the whole flush, since the spare buffer is in use
+    # until the flush has encoded it.
+    self._flush_lock = threading.Lock()
+
+  def set_sampling_rate(self, sampling_rate):
+    """Change the sampling rate, starting with the current batch."""
+    self.sampling_rate = sampling_rate
+    self.sampled = random.random() < sampling_rate
+
+  def append(self, event_type, kind, contents=None):
+    """Add an event to the buffer if the current batch is sampled.
+
+    Args:
+      event_type (str): The type of the event.
+      kind (int): Either LOG_POINT, LOG_SPAN_START, or LOG_SPAN_END.
+      contents (dict): More general data to store with the event.
+    """
+    if not self.sampled:
+      return
+    event_type_index = self._event_type_indices.get(event_type)
+    if event_type_index is None:
+      event_type_index = self._add_event_type(event_type)
+    timestamp = time.time()
+    if contents is not None:
+      contents = _encode_contents(contents)
+    with self._lock:
+      slot = self._num_events % self.capacity
+      self._num_events += 1
+      RECORD.pack_into(self._buffer, slot * RECORD.size, timestamp,
+                       event_type_index, kind, contents is not None)
+      self._contents[slot] = contents
+
+  def _add_event_type(self, event_type):
+    """Intern an event type name and return its index."""
+    with self._lock:
+      if event_type not in self._event_type_indices:
+        self._encoded_event_types += _encode_string(event_type)
+        self._event_type_indices[event_type] = len(self._event_type_indices)
+      return self._event_type_indices[event_type]
+
+  def flush(self):
+    """Encode the buffered events and start a new batch.
+
+    Returns:
+      The encoded events, or None if no events were logged in this batch.
+    """
+    with self._flush_lock:
+      with self._lock:
+        num_events = self._num_events
+        self.sampled = random.random() < self.sampling_rate
+        if num_events == 0:
+          return None
+        # Swap in the spare buffers so that events can be logged while this
+        # batch is encoded.
+        buffer, all_contents = self._buffer, self._contents
+        self._buffer, self._contents = self._spare_buffer, self._spare_contents
+        self._num_events = 0
+        encoded_event_types = self._encoded_event_types
+        num_event_types = len(self._event_type_indices)
+      encoded = self._encode(buffer, all_contents, num_events,
+                             encoded_event_types, num_event_types)
+      self._spare_buffer, self._spare_contents = buffer, all_contents
+      return encoded
+
+  def _encode(self, buffer, all_contents, num_events, encoded_event_types,
+              num_event_types):
+    num_records = min(num_events, self.capacity)
+    start = num_events % self.capacity if num_events > self.capacity else 0
+    # Order the records from oldest to newest.
+    slots = list(range(start, num_records)) + list(range(start))
+    encoded = [HEADER.pack(EVENT_LOG_VERSION, num_records,
+                           num_events - num_records, num_event_types),
+               bytes(buffer[start * RECORD.size:num_records * RECORD.size]),
+               bytes(buffer[:start * RECORD.size]), encoded_event_types]
+    for slot in slots:
+      if all_contents[slot] is not None:
+        encoded.append(all_contents[slot])
+    return b"".join(encoded)
+
+def decode_events(data):
+  """Decode a batch of events produced by EventLog.flush.
+
+  Args:
+    data (bytes): The encoded events.
+
+  Returns:
+    A list of (timestamp, event_type, kind, contents) tuples where contents is
+      a dictionary mapping strings to strings.
+  """
+  version, num_records, _, num_event_types = HEADER.unpack_from(data, 0)
+  if version != EVENT_LOG_VERSION:
+    raise Exception("Unknown event log version {}.".format(version))
+  offset = HEADER.size
+  records = [RECORD.unpack_from(data, offset + i * RECORD.size)
+             for i in range(num_records)]
+  offset += num_records * RECORD.size
+  event_types = []
+  for _ in range(num_event_types):
+    event_type, offset = _decode_string(data, offset)
+    event_types.append(event_type)
+  events = []
+  for timestamp, event_type_index, kind, has_contents in records:
+    contents = {}
+    if has_contents:
+      num_pairs, = NUM_PAIRS.unpack_from(data, offset)
+      offset += NUM_PAIRS.size
+      for _ in range(num_pairs):
+        key, offset = _decode_string(data, offset)
+        value, offset = _decode_string(data, offset)
+        contents[key] = value
+    events.append((timestamp, event_types[event_type_index], kind, contents))
+  return events
+
+def set_event_log_sampling_rate(sampling_rate):
+  """Set the fraction of tasks for which events are logged.
+
+  Events are logged for every task by default. The events of a task are either
+  all logged or all dropped. This applies to the driver and to all workers.
+
+  Args:
+    sampling_rate (float): A number between 0 and 1.
+  """
+  if not 0 <= sampling_rate <= 1:
+    raise ValueError("The sampling rate must be between 0 and 1, got {}."
+                     .format(sampling_rate))
+  import ray.worker
+
+  def set_sampling_rate(worker_info):
+    ray.worker.global_worker.events.set_sampling_rate(sampling_rate)
+  ray.worker.global_worker.run_function_on_all_workers(set_sampling_rate)
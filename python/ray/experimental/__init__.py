@@ -4,3 +4,11 @@ from __future__ import print_function
 
 from .utils import copy_directory
 from .tfutils import TensorFlowVariables
+from .object_cache import enable_object_cache, object_cache_stats
+from .array_buffers import create_array, seal_array
+from .task_arguments import set_inline_argument_threshold
+from .task_cache import set_task_cache_ttl, clear_task_cache
+from ray.event_log import set_event_log_sampling_rate
+from ray.profiling import profile_stats
+from ray.task_stats import task_stats
+from ray.reference_counting import enable_reference_counting
@@ -0,0 +1,61 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+import numbuf
+import photon
+import ray
+
+# A mapping from the IDs of the objects created by create_array that have not
+# been sealed yet to their arrays.
+_unsealed_arrays = {}
+
+def create_array(shape, dtype):
+  """Create a NumPy array that is backed by a buffer in the object store.
+
+  This avoids copying large arrays into the object store. The array can be
+  filled in place and must then be sealed with seal_array, after which it is
+  read-only and can be passed to remote functions or retrieved with ray.get
+  like the result of ray.put. The array must be created and sealed from the
+  same thread.
+
+  Args:
+    shape (Tuple[int]): The shape of the array.
+    dtype: The data type of the array. Only integer and floating point types
+      are supported.
+
+  Returns:
+    A tuple of the object ID of the array and a writable NumPy array.
+  """
+  worker = ray.worker.global_worker
+  ray.worker.check_connected(worker)
+  if worker.mode == ray.worker.PYTHON_MODE:
+    # In PYTHON_MODE, ray.put is the identity operation, so the array is its own
+    # object ID.
+    array = np.empty(shape, dtype=dtype)
+    return array, array
+  context = worker.thread_context()
+  object_id = photon.compute_put_id(context.task_id, context.put_index)
+  context.put_index += 1
+  array = numbuf.create_array(object_id.id(), worker.plasma_client.conn,
+                              tuple(shape), np.dtype(dtype))
+  _unsealed_arrays[object_id.id()] = array
+  return object_id, array
+
+def seal_array(object_id):
+  """Make an array created by create_array available to other workers.
+
+  The array returned by create_array becomes read-only. Views of the array
+  that were created before calling this must not be modified afterwards.
+
+  Args:
+    object_id: The object ID returned by create_array.
+  """
+  worker = ray.worker.global_worker
+  if worker.mode == ray.worker.PYTHON_MODE:
+    return
+  array = _unsealed_arrays.pop(object_id.id())
+  array.flags.writeable = False
+  worker.plasma_client.seal(object_id.id())
@@ -0,0 +1,175 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import marshal
+import sys
+import threading
+import time
+
+import numpy as np
+
+import ray
+
+# A hash mapping the ID of each worker to its marshalled cache statistics.
+OBJECT_CACHE_STATS_KEY = b"ObjectCacheStats"
+# The minimum number of seconds between two publications of the statistics of
+# one worker.
+STATS_PUBLISH_INTERVAL = 1.0
+
+def estimate_size(value):
+  """Estimate the number of bytes of memory used by a deserialized value.
+
+  Args:
+    value: A value returned by numbuf.retrieve_list.
+
+  Returns:
+    The estimated size in bytes.
+  """
+  if isinstance(value, np.ndarray):
+    return value.nbytes
+  if isinstance(value, (list, tuple)):
+    return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+  if isinstance(value, dict):
+    return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v)
+                                      for k, v in value.items())
+  if hasattr(value, "__dict__"):
+    return sys.getsizeof(value) + estimate_size(value.__dict__)
+  return sys.getsizeof(value)
+
+class ObjectCache(object):
+  """A cache of deserialized objects bounded by their total size in bytes.
+
+  Objects in the object store are immutable, so a cached value is always the
+  correct value for its object ID. However, the cached value itself is shared
+  by every task that gets the object on this worker, so tasks must not mutate
+  the values that they get.
+
+  Values that are backed by the object store (for example numpy arrays) keep
+  their plasma buffer in use while they are in the cache. When a value is
+  evicted, the buffer is released through the plasma client as usual, subject
+  to the client's release_delay.
+
+  Attributes:
+    max_bytes (int): The maximum total estimated size of the cached values.
+    num_bytes (int): The current total estimated size of the cached values.
+    hits (int): The number of lookups that found a value in the cache.
+    misses (int): The number of lookups that did not find a value.
+    evictions (int): The number of values that were evicted.
+  """
+
+  MISS = object()
+
+  def __init__(self, max_bytes):
+    """Initialize an empty ObjectCache."""
+    self.max_bytes = max_bytes
+    self.num_bytes = 0
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self._entries = collections.OrderedDict()
+    self._last_publish_time = 0
+    self._lock = threading.Lock()
+
+  def lookup(self, object_id):
+    """Return the cached value for object_id or ObjectCache.MISS.
+
+    Args:
+      object_id (str): The ID of the object to look up.
+    """
+    with self._lock:
+      entry = self._entries.pop(object_id, None)
+      if entry is None:
+        self.misses += 1
+        return ObjectCache.MISS
+      # Move the entry to the end to mark it as the most recently used.
+      self._entries[object_id] = entry
+      self.hits += 1
+      return entry[0]
+
+  def add(self, object_id, value):
+    """Add a value to the cache, evicting the least recently used values.
+
+    Values that are larger than max_bytes are not cached.
+
+    Args:
+      object_id (str): The ID of the object.
+      value: The deserialized value of the object.
+    """
+    size = estimate_size(value)
+    if size > self.max_bytes:
+      return
+    with self._lock:
+      if object_id in self._entries:
+        return
+      while self.num_bytes + size > self.max_bytes:
+        _, (_, evicted_size) = self._entries.popitem(last=False)
+        self.num_bytes -= evicted_size
+        self.evictions += 1
+      self._entries[object_id] = (value, size)
+      self.num_bytes += size
+
+  def clear(self):
+    """Remove all values from the cache."""
+    with self._lock:
+      self._entries.clear()
+      self.num_bytes = 0
+
+  def stats(self):
+    """Return a dictionary with the statistics of this cache."""
+    return {"hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "num_objects": len(self._entries),
+            "num_bytes": self.num_bytes,
+            "max_bytes": self.max_bytes}
+
+  def publish_stats(self, worker):
+    """Write the statistics of this cache to Redis if enough time has passed.
+
+    Args:
+      worker: The worker that owns this cache.
+    """
+    now = time.time()
+    if now - self._last_publish_time < STATS_PUBLISH_INTERVAL:
+      return
+    self._last_publish_time = now
+    worker.redis_client.hset(OBJECT_CACHE_STATS_KEY, worker.worker_id,
+                             marshal.dumps(self.stats()))
+
+def enable_object_cache(max_bytes):
+  """Cache deserialized objects on the driver and on every worker.
+
+  When this is enabled, ray.get and the arguments of remote functions are
+  served from a per-process cache of deserialized values when possible, so the
+  same object is deserialized only once per worker. Remote functions must not
+  mutate the values they get from the object store when the cache is enabled.
+
+  Args:
+    max_bytes (int): The maximum total size in bytes of the values cached by
+      each worker.
+  """
+  def enable(worker_info):
+    worker = ray.worker.global_worker
+    if worker.object_cache is None or worker.object_cache.max_bytes != max_bytes:
+      worker.object_cache = ObjectCache(max_bytes)
+  ray.worker.global_worker.run_function_on_all_workers(enable)
+
+def object_cache_stats():
+  """Return the object cache statistics of the driver and of all workers.
+
+  The statistics of the workers are published at most once per second, so they
+  may be slightly out of date.
+
+  Returns:
+    A dictionary mapping each worker ID (including this driver's) to a
+      dictionary of cache statistics.
+  """
+  worker = ray.worker.global_worker
+  ray.worker.check_connected(worker)
+  stats = {worker_id: marshal.loads(data) for worker_id, data in
+           worker.redis_client.hgetall(OBJECT_CACHE_STATS_KEY).items()}
+  if worker.object_cache is not None:
+    stats[worker.worker_id] = worker.object_cache.stats()
+  return stats
@@ -0,0 +1,25 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import ray
+
+def set_inline_argument_threshold(num_bytes):
+  """Set the size below which arguments are passed in the task spec.
+
+  Arguments to remote functions that are passed by value and are not simple
+  values are serialized. If the serialized argument takes at most num_bytes, it
+  is passed in the task spec. Otherwise it is put in the object store. This
+  applies to the driver and to all workers.
+
+  Args:
+    num_bytes (int): The maximum size of an inlined argument in bytes. If this
+      is 0, such arguments are always put in the object store.
+  """
+  if num_bytes < 0:
+    raise ValueError("The inline argument threshold must be nonnegative, got "
+                     "{}.".format(num_bytes))
+
+  def set_threshold(worker_info):
+    ray.worker.global_worker.inline_argument_threshold = num_bytes
+  ray.worker.global_worker.run_function_on_all_workers(set_threshold)
@@ -0,0 +1,38 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import ray
+
+def set_task_cache_ttl(seconds):
+  """Set how long the results of remote functions defined with cache=True are reused.
+
+  An entry of the cache expires if it has not been used for this many seconds.
+  This only affects tasks that are submitted by this driver from now on.
+
+  Args:
+    seconds (int): The time to live of the entries of the cache in seconds.
+  """
+  if seconds <= 0:
+    raise ValueError("The time to live of the task cache must be positive, "
+                     "got {}.".format(seconds))
+  ray.worker.global_worker.task_cache_ttl = int(seconds)
+
+def clear_task_cache():
+  """Remove the cached results of all remote functions defined with cache=True.
+
+  Tasks that are submitted afterwards are executed again even if an equivalent
+  task was executed before.
+  """
+  worker = ray.worker.global_worker
+  ray.worker.check_connected(worker)
+  if worker.mode == ray.worker.PYTHON_MODE:
+    return
+  # The entries expire on their own, so they are not tracked in a set, which
+  # would keep growing. SCAN walks the keyspace in small steps instead of
+  # blocking Redis like KEYS.
+  pipeline = worker.redis_client.pipeline(transaction=False)
+  for key in worker.redis_client.scan_iter(
+      match=ray.worker.TASK_CACHE_PREFIX + b"*", count=1000):
+    pipeline.delete(key)
+  pipeline.execute()
@@ -4,7 +4,6 @@ from __future__ import print_function
 
 import io
 import os
-import tarfile
 import sys
 
 import ray
@@ -18,6 +17,7 @@ def tarred_directory_as_bytes(source_dir):
   Returns:
     A byte string representing the tarred file.
   """
+  import tarfile
   # Get a BytesIO object.
   string_file = io.BytesIO()
   # Create an in-memory tarfile of the source directory.
@@ -34,6 +34,7 @@ def tarred_bytes_to_directory(tarred_bytes, target_dir):
       be the output of tarred_directory_as_bytes.
     target_dir (str): The directory to create the untarred files in.
   """
+  import tarfile
   string_file = io.BytesIO(tarred_bytes)
   with tarfile.open(fileobj=string_file) as tar:
     tar.extractall(path=target_dir)
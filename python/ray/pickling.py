@@ -4,9 +4,11 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import io
 import sys
 from ctypes import c_void_p
 from cloudpickle import pickle, cloudpickle, CloudPickler, load, loads
+import numpy as np
 
 try:
   from ctypes import pythonapi
@@ -22,6 +24,35 @@ def dumps(obj):
   dump(obj, stringio)
   return stringio.getvalue()
 
+def dumps_with_buffers(obj, min_buffer_size):
+  """Pickle an object and keep its large NumPy arrays out of the pickle.
+
+  Args:
+    obj: The object to pickle.
+    min_buffer_size (int): Arrays without Python objects of at least this
+      many bytes are not pickled. The pickle refers to them by their index in
+      the returned list instead.
+
+  Returns:
+    A tuple of the pickled object and the list of arrays that it refers to.
+  """
+  stringio = cloudpickle.StringIO()
+  pickler = BufferPickler(stringio, 2, min_buffer_size)
+  pickler.dump(obj)
+  return stringio.getvalue(), pickler.buffers
+
+def loads_with_buffers(data, buffers):
+  """Unpickle an object that was pickled by dumps_with_buffers.
+
+  Args:
+    data: The pickled object.
+    buffers (List[np.ndarray]): The arrays that the pickle refers to. They are
+      used as they are, without being copied.
+  """
+  unpickler = pickle.Unpickler(io.BytesIO(data))
+  unpickler.persistent_load = lambda index: buffers[index]
+  return unpickler.load()
+
 def _make_skel_func(code, closure, base_globals = None):
   """ Creates a skeleton function object that contains just the provided
       code and the correct number of cells in func_closure.  All other
@@ -65,3 +96,29 @@ class BetterPickler(CloudPickler):
     self.write(pickle.REDUCE)
   dispatch = CloudPickler.dispatch.copy()
   dispatch[(lambda _: lambda: _)(0).__closure__[0].__class__] = save_cell
+
+class BufferPickler(BetterPickler):
+  """A pickler that leaves large NumPy arrays out of the pickle.
+
+  The arrays are collected in the list buffers, so that they can be stored
+  next to the pickle without being copied into it, and the pickle refers to
+  them by their index in this list.
+  """
+  def __init__(self, file, protocol, min_buffer_size):
+    BetterPickler.__init__(self, file, protocol)
+    self.min_buffer_size = min_buffer_size
+    self.buffers = []
+    self.buffer_indices = {}
+
+  def persistent_id(self, obj):
+    if (type(obj) is not np.ndarray or obj.dtype.hasobject or
+        obj.dtype.itemsize == 0 or obj.nbytes < self.min_buffer_size):
+      return None
+    # Arrays that are referenced more than once are only stored once. The
+    # arrays are kept alive in buffers, so their IDs are not reused.
+    index = self.buffer_indices.get(id(obj))
+    if index is None:
+      index = len(self.buffers)
+      self.buffers.append(obj)
+      self.buffer_indices[id(obj)] = index
+    return index
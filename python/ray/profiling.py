@@ -0,0 +1,162 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import cProfile
+import marshal
+import pstats
+import threading
+import time
+
+# The key prefix under which the profiles of a remote function are stored. The
+# key is a hash mapping the ID of each worker to its marshalled statistics.
+PROFILE_STATS_PREFIX = b"ProfileStats:"
+# The minimum number of seconds between two publications of the profiles of
+# one worker.
+PUBLISH_INTERVAL = 5.0
+
+class _TaskProfile(object):
+  """A context manager that profiles a single task."""
+
+  def __init__(self, profiler, function_id):
+    self.profiler = profiler
+    self.function_id = function_id
+
+  def __enter__(self):
+    self.profiler._start(self.function_id)
+
+  def __exit__(self, type, value, tb):
+    self.profiler._stop(self.function_id)
+
+class _NoProfile(object):
+  """A context manager that does nothing, used for unprofiled tasks."""
+
+  def __enter__(self):
+    pass
+
+  def __exit__(self, type, value, tb):
+    pass
+
+_NO_PROFILE = _NoProfile()
+
+class FunctionProfiler(object):
+  """Profile the tasks of the remote functions that are defined with profile=True.
+
+  Each profiled task is run under a cProfile.Profile for its function, which
+  covers retrieving the arguments, executing the function and storing the
+  outputs. The accumulated statistics of the functions that ran since the last
+  publication are written to Redis in the background, at most once every
+  PUBLISH_INTERVAL seconds.
+
+  Attributes:
+    worker: The worker whose tasks are profiled.
+    profiles (Dict[str, cProfile.Profile]): A mapping from the ID of each
+      profiled function to its profile.
+    dirty (Set[str]): The IDs of the functions whose profiles changed since
+      they were last published.
+  """
+
+  def __init__(self, worker):
+    """Initialize a FunctionProfiler with no profiles."""
+    self.worker = worker
+    self.profiles = {}
+    self.dirty = set()
+    self.active = None
+    self.last_publish_time = 0
+    self.publish_timer = None
+    # Profiles are published from a timer thread. This lock protects the
+    # profiles and the set of dirty profiles, but it is not held while a task
+    # runs or while the profiles are sent to Redis.
+    self.lock = threading.Lock()
+
+  def profile(self, function_id, enabled):
+    """Return a context manager that profiles a task if enabled is True.
+
+    Args:
+      function_id (str): The ID of the function of the task.
+      enabled (bool): True if the function was defined with profile=True.
+    """
+    return _TaskProfile(self, function_id) if enabled else _NO_PROFILE
+
+  def _start(self, function_id):
+    with self.lock:
+      profile = self.profiles.get(function_id)
+      if profile is None:
+        profile = cProfile.Profile()
+        self.profiles[function_id] = profile
+      profile.enable()
+      self.active = function_id
+
+  def _stop(self, function_id):
+    with self.lock:
+      self.profiles[function_id].disable()
+      self.active = None
+      self.dirty.add(function_id)
+      if self.publish_timer is None:
+        delay = max(0, self.last_publish_time + PUBLISH_INTERVAL - time.time())
+        self.publish_timer = threading.Timer(delay, self.publish)
+        self.publish_timer.daemon = True
+        self.publish_timer.start()
+
+  def publish(self):
+    """Write the profiles that changed since the last publication to Redis."""
+    stats = {}
+    with self.lock:
+      self.publish_timer = None
+      self.last_publish_time = time.time()
+      for function_id in self.dirty:
+        # Taking a snapshot disables the profile, so a profile that is in use
+        # stays dirty and is published after its task finishes.
+        if function_id == self.active:
+          continue
+        profile = self.profiles[function_id]
+        profile.create_stats()
+        stats[function_id] = profile.stats
+      self.dirty = self.dirty - set(stats.keys())
+    if len(stats) == 0:
+      return
+    pipeline = self.worker.redis_client.pipeline(transaction=False)
+    for function_id, function_stats in stats.items():
+      pipeline.hset(PROFILE_STATS_PREFIX + function_id, self.worker.worker_id,
+                    marshal.dumps(function_stats))
+    pipeline.execute()
+
+class _ProfileData(object):
+  """Statistics in the format that pstats.Stats can load."""
+
+  def __init__(self, stats):
+    self.stats = stats
+
+  def create_stats(self):
+    pass
+
+def profile_stats(remote_function):
+  """Return the combined profile of a remote function across all workers.
+
+  The remote function must have been defined with @ray.remote(profile=True).
+  The profiles cover retrieving the arguments of each task, executing the
+  function and storing its outputs. Workers publish their profiles at most once
+  every few seconds, so the result may be slightly out of date.
+
+  Args:
+    remote_function: The remote function to get the profile of.
+
+  Returns:
+    A pstats.Stats object, or None if no task of the function has been
+      profiled yet.
+  """
+  import ray.worker
+  worker = ray.worker.global_worker
+  ray.worker.check_connected(worker)
+  if worker.mode == ray.worker.PYTHON_MODE:
+    return None
+  key = PROFILE_STATS_PREFIX + remote_function.function_id.id()
+  profiles = [marshal.loads(data)
+              for data in worker.redis_client.hgetall(key).values()]
+  profiles = [profile for profile in profiles if len(profile) > 0]
+  if len(profiles) == 0:
+    return None
+  stats = pstats.Stats(_ProfileData(profiles[0]))
+  for profile in profiles[1:]:
+    stats.add(_ProfileData(profile))
+  return stats
@@ -0,0 +1,323 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+
+import photon
+
+# A hash mapping the ID of each object that is referenced by a tracked handle,
+# a task argument, or another object to its number of references. Each process
+# counts as a single reference no matter how many handles to the object it has.
+REFERENCE_COUNTS_KEY = b"ReferenceCounts"
+# A hash mapping the ID of each object that contains object IDs to the
+# concatenated IDs of the objects that it contains.
+CONTAINED_OBJECT_IDS_KEY = b"ContainedObjectIDs"
+# A hash mapping the ID of each submitted task to the concatenated IDs of its
+# tracked arguments.
+TASK_ARGUMENTS_KEY = b"TaskArgumentReferences"
+# A hash mapping the ID of each return value of a submitted task to the
+# concatenated IDs of the task's tracked arguments. The return values keep the
+# arguments alive so that they can be reconstructed from lineage.
+LINEAGE_KEY = b"LineageReferences"
+# The channel on which the IDs of objects without references are published so
+# that every node deletes them from its object store.
+DELETION_CHANNEL = b"ObjectDeletions"
+# The maximum number of seconds that references which were dropped stay queued
+# before they are released in Redis.
+RELEASE_INTERVAL = 0.1
+
+OBJECT_ID_SIZE = 20
+
+# Register the references from an object to the objects that it contains. This
+# does nothing if the references were already registered, for example because
+# the object was reconstructed.
+_ADD_CONTAINED_SCRIPT = """
+if redis.call("HSETNX", KEYS[2], ARGV[1], ARGV[2]) == 1 then
+  for i = 1, #ARGV[2], 20 do
+    redis.call("HINCRBY", KEYS[1], string.sub(ARGV[2], i, i + 19), 1)
+  end
+end
+"""
+
+# Release the references that are held by the arguments of the finished tasks
+# in ARGV[2] and the references in ARGV[3]. Objects without references are
+# removed along with the references that they hold, including the references
+# from a task's return value to the task's arguments, and their IDs are
+# published on the channel ARGV[1].
+_RELEASE_SCRIPT = """
+local pending = {}
+local function add_pending(ids)
+  for i = 1, #ids, 20 do
+    table.insert(pending, string.sub(ids, i, i + 19))
+  end
+end
+for i = 1, #ARGV[2], 20 do
+  local task_id = string.sub(ARGV[2], i, i + 19)
+  local arguments = redis.call("HGET", KEYS[3], task_id)
+  if arguments then
+    redis.call("HDEL", KEYS[3], task_id)
+    add_pending(arguments)
+  end
+end
+add_pending(ARGV[3])
+local deleted = {}
+while #pending > 0 do
+  local object_id = table.remove(pending)
+  if redis.call("HINCRBY", KEYS[1], object_id, -1) <= 0 then
+    redis.call("HDEL", KEYS[1], object_id)
+    table.insert(deleted, object_id)
+    local contained = redis.call("HGET", KEYS[2], object_id)
+    if contained then
+      redis.call("HDEL", KEYS[2], object_id)
+      add_pending(contained)
+    end
+    local arguments = redis.call("HGET", KEYS[4], object_id)
+    if arguments then
+      redis.call("HDEL", KEYS[4], object_id)
+      add_pending(arguments)
+    end
+  end
+end
+if #deleted > 0 then
+  redis.call("PUBLISH", ARGV[1], table.concat(deleted))
+end
+return #deleted
+"""
+
+def _split_object_ids(data):
+  return [data[i:i + OBJECT_ID_SIZE] for i in range(0, len(data), OBJECT_ID_SIZE)]
+
+class TrackedObjectID(photon.ObjectID):
+  """An object ID whose lifetime is tracked by a ReferenceCounter.
+
+  When the last tracked handle to an object in a process is garbage collected,
+  the process releases its reference to the object.
+  """
+
+  __slots__ = ["_reference_counter"]
+
+  def __del__(self):
+    try:
+      self._reference_counter._drop_handle(self.id())
+    except Exception:
+      # This can happen while the interpreter is shutting down.
+      pass
+
+class ReferenceCounter(object):
+  """Count the references to objects across the cluster and delete garbage.
+
+  An object is referenced by every process that holds a tracked handle to it,
+  by every submitted task that takes it as an argument until the task has
+  executed, by every return value of such a task, and by every object that
+  contains its ID. The references from the return values keep the arguments of
+  a task alive as long as its outputs exist, so that the outputs can still be
+  reconstructed by resubmitting the task. The counts are kept in
+  Redis. When the count of an object drops to zero, its ID is published on
+  DELETION_CHANNEL, and each node deletes the object from its object store.
+  This in turn releases the references held by the object.
+
+  New references are sent to Redis before the handles that they belong to can
+  leave this process, that is, before a task is submitted or an object is put.
+  Dropped references are queued and released in the background, so that a
+  process never releases a reference before it has been added.
+
+  Only TrackedObjectIDs are counted. Object IDs that were created before
+  reference counting was enabled, or that were constructed by hand, never get
+  a reference, so the objects that they refer to are never deleted.
+
+  Attributes:
+    worker: The worker that owns the handles.
+    local_counts (Dict[str, int]): A mapping from the ID of each object that
+      this process references to the number of live handles to it.
+  """
+
+  def __init__(self, worker):
+    """Initialize a ReferenceCounter without references."""
+    self.worker = worker
+    self.local_counts = {}
+    self.pending_increments = []
+    self.pending_contained = []
+    self.pending_task_arguments = []
+    self.pending_released_tasks = []
+    self.pending_releases = []
+    self.release_timer = None
+    # Handles can be garbage collected at any point, including while this lock
+    # is held by the same thread, so the lock must be reentrant.
+    self.lock = threading.RLock()
+    self.add_contained_script = worker.redis_client.register_script(_ADD_CONTAINED_SCRIPT)
+    self.release_script = worker.redis_client.register_script(_RELEASE_SCRIPT)
+
+  def track(self, object_ids):
+    """Return tracked handles for some object IDs.
+
+    Args:
+      object_ids (List[ObjectID]): The object IDs.
+
+    Returns:
+      A list with a TrackedObjectID for each object ID.
+    """
+    handles = []
+    with self.lock:
+      for object_id in object_ids:
+        object_id_str = object_id.id()
+        handle = TrackedObjectID(object_id_str)
+        handle._reference_counter = self
+        count = self.local_counts.get(object_id_str, 0)
+        if count == 0:
+          self.pending_increments.append(object_id_str)
+        self.local_counts[object_id_str] = count + 1
+        handles.append(handle)
+    return handles
+
+  def add_task_arguments(self, task_id, return_ids, object_ids):
+    """Add references from a task that was submitted to its arguments.
+
+    The task references its arguments until it has executed, and each of its
+    return values references them until the return value is deleted.
+
+    Args:
+      task_id: The ID of the task.
+      return_ids (List[ObjectID]): The IDs of the return values of the task.
+      object_ids (List[TrackedObjectID]): The tracked arguments of the task.
+    """
+    if len(object_ids) > 0:
+      with self.lock:
+        self.pending_task_arguments.append(
+            (task_id.id(), [return_id.id() for return_id in return_ids],
+             b"".join([object_id.id() for object_id in object_ids])))
+
+  def add_contained(self, object_id, contained_object_ids):
+    """Add references from an object that was stored to the IDs it contains.
+
+    Args:
+      object_id: The ID of the object.
+      contained_object_ids (List[ObjectID]): The object IDs inside the object.
+    """
+    if len(contained_object_ids) > 0:
+      with self.lock:
+        self.pending_contained.append(
+            (object_id.id(),
+             b"".join([contained.id() for contained in contained_object_ids])))
+
+  def release_task_arguments(self, task_id):
+    """Release the references from a task that has executed to its arguments."""
+    with self.lock:
+      self.pending_released_tasks.append(task_id.id())
+      self._schedule_release()
+
+  def _drop_handle(self, object_id_str):
+    with self.lock:
+      count = self.local_counts[object_id_str] - 1
+      if count == 0:
+        del self.local_counts[object_id_str]
+        self.pending_releases.append(object_id_str)
+        self._schedule_release()
+      else:
+        self.local_counts[object_id_str] = count
+
+  def _schedule_release(self):
+    if self.release_timer is None:
+      self.release_timer = threading.Timer(RELEASE_INTERVAL, self.flush)
+      self.release_timer.daemon = True
+      self.release_timer.start()
+
+  def flush(self):
+    """Send the pending reference changes to Redis.
+
+    New references are added before any references are released.
+    """
+    with self.lock:
+      self.release_timer = None
+      increments = self.pending_increments
+      contained = self.pending_contained
+      task_arguments = self.pending_task_arguments
+      released_tasks = self.pending_released_tasks
+      releases = self.pending_releases
+      self.pending_increments = []
+      self.pending_contained = []
+      self.pending_task_arguments = []
+      self.pending_released_tasks = []
+      self.pending_releases = []
+      # Keep the lock while talking to Redis so that the changes of concurrent
+      # flushes are applied in order.
+      if (len(increments) + len(contained) + len(task_arguments) +
+          len(released_tasks) + len(releases) == 0):
+        return
+      pipeline = self.worker.redis_client.pipeline(transaction=False)
+      for object_id_str in increments:
+        pipeline.hincrby(REFERENCE_COUNTS_KEY, object_id_str, 1)
+      for task_id_str, return_id_strs, arguments in task_arguments:
+        pipeline.hset(TASK_ARGUMENTS_KEY, task_id_str, arguments)
+        for return_id_str in return_id_strs:
+          pipeline.hset(LINEAGE_KEY, return_id_str, arguments)
+        for object_id_str in _split_object_ids(arguments):
+          pipeline.hincrby(REFERENCE_COUNTS_KEY, object_id_str,
+                           1 + len(return_id_strs))
+      for object_id_str, contained_ids in contained:
+        self.add_contained_script(
+            keys=[REFERENCE_COUNTS_KEY, CONTAINED_OBJECT_IDS_KEY],
+            args=[object_id_str, contained_ids], client=pipeline)
+      if len(released_tasks) + len(releases) > 0:
+        self.release_script(
+            keys=[REFERENCE_COUNTS_KEY, CONTAINED_OBJECT_IDS_KEY,
+                  TASK_ARGUMENTS_KEY, LINEAGE_KEY],
+            args=[DELETION_CHANNEL, b"".join(released_tasks), b"".join(releases)],
+            client=pipeline)
+      pipeline.execute()
+
+  def release_all(self):
+    """Release all of the references held by this process."""
+    with self.lock:
+      self.pending_releases.extend(self.local_counts.keys())
+      self.local_counts = {}
+    self.flush()
+
+def deletion_thread(worker):
+  """Delete the objects without references from the local object store.
+
+  Args:
+    worker: The worker whose plasma client is used to delete the objects.
+  """
+  pubsub_client = worker.redis_client.pubsub()
+  pubsub_client.subscribe(DELETION_CHANNEL)
+  for msg in pubsub_client.listen():
+    if msg["type"] != "message":
+      continue
+    for object_id_str in _split_object_ids(msg["data"]):
+      worker.plasma_client.delete(object_id_str)
+
+def enable_reference_counting():
+  """Delete objects from the object stores once they are no longer referenced.
+
+  From now on, the driver and the workers count the references to the objects
+  that they create or receive. An object is referenced by each process that
+  holds its object ID, by each pending task that takes it as an argument, by
+  the return values of such tasks, and by each object that contains its ID.
+  Objects without references are deleted from all object stores instead of
+  waiting to be evicted.
+
+  Remote functions that were defined with cache=True submit a new task for
+  every call while reference counting is enabled, because the cached return
+  values could be deleted while the cache still refers to them.
+
+  Object IDs that were created before this is called, or that are constructed
+  by hand, are not counted, and the objects that they refer to are never
+  deleted this way.
+  """
+  import ray.worker
+  ray.worker.check_connected(ray.worker.global_worker)
+  if ray.worker.global_worker.mode == ray.worker.PYTHON_MODE:
+    # Objects are not put in an object store in PYTHON_MODE.
+    return
+
+  def enable(worker_info):
+    worker = ray.worker.global_worker
+    if worker.reference_counter is not None:
+      return
+    worker.reference_counter = ReferenceCounter(worker)
+    t = threading.Thread(target=deletion_thread, args=(worker,))
+    # Making the thread a daemon causes it to exit when the main thread exits.
+    t.daemon = True
+    t.start()
+  ray.worker.global_worker.run_function_on_all_workers(enable)
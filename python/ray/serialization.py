@@ -2,8 +2,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import itertools
 import numpy as np
 import numbuf
+import operator
 
 import ray.pickling as pickling
 
@@ -31,12 +33,21 @@ def check_serializable(cls):
   if hasattr(obj, "__slots__"):
     raise Exception("The class {} uses '__slots__', so Ray may not be able to serialize it efficiently. Try using 'ray.register_class(cls, pickle=True)'. However, note that pickle is inefficient.".format(cls))
 
+# NumPy arrays of at least this many bytes inside of objects that are
+# serialized with pickle are stored next to the pickle instead of in it, so
+# that they are not copied into the pickle and can be read without a copy.
+PICKLE_BUFFER_MIN_SIZE = 1 << 16
+
 # This field keeps track of a whitelisted set of classes that Ray will
 # serialize.
 whitelisted_classes = {}
 classes_to_pickle = set()
 custom_serializers = {}
 custom_deserializers = {}
+# The field names of the instances of each class whose lists have been
+# serialized column by column. A list is only serialized this way if all of
+# its instances have exactly these fields.
+class_schemas = {}
 
 def class_identifier(typ):
   """Return a string that identifies this type."""
@@ -72,12 +83,64 @@ def add_class_to_whitelist(cls, pickle=False, custom_serializer=None, custom_des
     custom_serializers[class_id] = custom_serializer
     custom_deserializers[class_id] = custom_deserializer
 
+# Describe a dtype with builtin types. Structured dtypes are described by the
+# names, formats and offsets of their fields and their itemsize, so that
+# padding and explicit offsets survive. Descriptors from
+# np.lib.format.dtype_to_descr would turn padding into extra fields.
+def dtype_to_description(dtype):
+  if dtype.names is not None:
+    return {"names": list(dtype.names),
+            "formats": [dtype_to_description(dtype.fields[name][0])
+                        for name in dtype.names],
+            "offsets": [dtype.fields[name][1] for name in dtype.names],
+            "itemsize": dtype.itemsize,
+            "aligned": dtype.isalignedstruct}
+  if dtype.subdtype is not None:
+    base, shape = dtype.subdtype
+    return (dtype_to_description(base), shape)
+  return dtype.str
+def dtype_from_description(description):
+  if isinstance(description, dict):
+    return np.dtype({"names": description["names"],
+                     "formats": [dtype_from_description(format)
+                                 for format in description["formats"]],
+                     "offsets": description["offsets"],
+                     "itemsize": description["itemsize"]},
+                    align=description["aligned"])
+  if isinstance(description, tuple):
+    return np.dtype((dtype_from_description(description[0]),
+                     tuple(description[1])))
+  return np.dtype(description)
+
 # Here we define a custom serializer and deserializer for handling numpy
-# arrays that contain objects.
+# arrays whose dtype numbuf does not support natively. Arrays without Python
+# objects, such as record arrays and arrays of fixed-width strings, are stored
+# as their raw data, viewed as an array of bytes, together with a description
+# of their dtype. Numbuf stores the bytes as a tensor, so reading them back does
+# not copy the data. Arrays of Python objects are stored as the flat list of
+# their elements, which numbuf can encode as a single array if the elements all
+# have the same primitive type.
 def array_custom_serializer(obj):
-  return obj.tolist(), obj.dtype.str
+  if obj.dtype.hasobject:
+    return "objects", obj.shape, obj.ravel().tolist()
+  if obj.dtype.itemsize == 0:
+    return "list", obj.tolist(), obj.dtype.str
+  data = np.ascontiguousarray(obj).reshape(-1).view(np.uint8)
+  return "raw", obj.shape, dtype_to_description(obj.dtype), data
 def array_custom_deserializer(serialized_obj):
-  return np.array(serialized_obj[0], dtype=np.dtype(serialized_obj[1]))
+  kind = serialized_obj[0]
+  if kind == "raw":
+    _, shape, description, data = serialized_obj
+    return data.view(dtype_from_description(description)).reshape(shape)
+  if kind == "objects":
+    _, shape, elements = serialized_obj
+    result = np.empty(len(elements), dtype=object)
+    # Assigning the elements one by one keeps numpy from treating elements
+    # that are sequences as additional dimensions.
+    for i, element in enumerate(elements):
+      result[i] = element
+    return result.reshape(shape)
+  return np.array(serialized_obj[1], dtype=np.dtype(serialized_obj[2]))
 add_class_to_whitelist(np.ndarray, pickle=False, custom_serializer=array_custom_serializer, custom_deserializer=array_custom_deserializer)
 
 def serialize(obj):
@@ -96,7 +159,10 @@ def serialize(obj):
   if class_id not in whitelisted_classes:
     raise Exception("Ray does not know how to serialize objects of type {}. To fix this, call 'ray.register_class' with this class.".format(type(obj)))
   if class_id in classes_to_pickle:
-    serialized_obj = {"data": pickling.dumps(obj)}
+    data, buffers = pickling.dumps_with_buffers(obj, PICKLE_BUFFER_MIN_SIZE)
+    serialized_obj = {"data": data}
+    if len(buffers) > 0:
+      serialized_obj["buffers"] = buffers
   elif class_id in custom_serializers.keys():
     serialized_obj = {"data": custom_serializers[class_id](obj)}
   else:
@@ -111,6 +177,67 @@ def serialize(obj):
   result = dict(serialized_obj, **{"_pytype_": class_id})
   return result
 
+def serialize_list(objs):
+  """This is the callback that numbuf uses for lists of objects of one class.
+
+  Numbuf calls this for long lists whose elements are all instances of the same
+  class that it does not know how to serialize. The instances are encoded
+  column by column, so that the field names and the class are only stored
+  once, and numbuf can store columns of primitive values as single arrays.
+
+  Args:
+    objs (list): The objects, which all have the same type.
+
+  Returns:
+    A dictionary that has the key "_pytype_" to identify the class, and
+      contains the columns, or None if the objects should be serialized one
+      by one with serialize.
+  """
+  cls = type(objs[0])
+  class_id = class_identifier(cls)
+  if (class_id not in whitelisted_classes or class_id in classes_to_pickle or
+      class_id in custom_serializers):
+    return None
+  if is_named_tuple(cls):
+    fields = cls._fields
+    columns = list(map(list, zip(*objs)))
+  else:
+    dicts = list(map(vars, objs))
+    fields = class_schemas.get(class_id)
+    if fields is None:
+      fields = tuple(dicts[0].keys())
+      class_schemas[class_id] = fields
+    # Instances with missing or extra fields are serialized one by one.
+    if set(map(len, dicts)) != {len(fields)}:
+      return None
+    try:
+      if len(fields) == 0:
+        columns = []
+      elif len(fields) == 1:
+        columns = [list(map(operator.itemgetter(fields[0]), dicts))]
+      else:
+        columns = list(map(list, zip(*map(operator.itemgetter(*fields), dicts))))
+    except KeyError:
+      return None
+  return {"_pytype_": class_id, "_ray_fields_": list(fields),
+          "_ray_columns_": columns, "_ray_length_": len(objs)}
+
+def deserialize_list(serialized_obj):
+  """Reconstruct a list of objects that was serialized by serialize_list."""
+  cls = whitelisted_classes[serialized_obj["_pytype_"]]
+  fields = serialized_obj["_ray_fields_"]
+  columns = serialized_obj["_ray_columns_"]
+  length = serialized_obj["_ray_length_"]
+  rows = zip(*columns) if len(fields) > 0 else itertools.repeat((), length)
+  if is_named_tuple(cls):
+    return list(itertools.starmap(cls, rows))
+  objs = []
+  for values in rows:
+    obj = cls.__new__(cls)
+    obj.__dict__.update(zip(fields, values))
+    objs.append(obj)
+  return objs
+
 def deserialize(serialized_obj):
   """This is the callback that will be used by numbuf.
 
@@ -123,10 +250,13 @@ def deserialize(serialized_obj):
   Returns:
     A Python object.
   """
+  if "_ray_columns_" in serialized_obj:
+    return deserialize_list(serialized_obj)
   class_id = serialized_obj["_pytype_"]
   cls = whitelisted_classes[class_id]
   if class_id in classes_to_pickle:
-    obj = pickling.loads(serialized_obj["data"])
+    obj = pickling.loads_with_buffers(serialized_obj["data"],
+                                      serialized_obj.get("buffers", []))
   elif class_id in custom_deserializers.keys():
     obj = custom_deserializers[class_id](serialized_obj["data"])
   else:
@@ -140,4 +270,4 @@ def deserialize(serialized_obj):
   return obj
 
 # Register the callbacks with numbuf.
-numbuf.register_callbacks(serialize, deserialize)
+numbuf.register_callbacks(serialize, deserialize, serialize_list)
@@ -3,9 +3,7 @@ from __future__ import division
 from __future__ import print_function
 
 from collections import namedtuple, OrderedDict
-import multiprocessing
 import os
-import psutil
 import random
 import redis
 import signal
@@ -22,6 +20,7 @@ import plasma
 import global_scheduler
 
 PROCESS_TYPE_WORKER = "worker"
+PROCESS_TYPE_WORKER_FORK_SERVER = "worker_fork_server"
 PROCESS_TYPE_LOCAL_SCHEDULER = "local_scheduler"
 PROCESS_TYPE_PLASMA_MANAGER = "plasma_manager"
 PROCESS_TYPE_PLASMA_STORE = "plasma_store"
@@ -35,6 +34,7 @@ PROCESS_TYPE_WEB_UI = "web_ui"
 # terminated when Ray exits, and certain orders will cause errors to be logged
 # to the screen.
 all_processes = OrderedDict([(PROCESS_TYPE_WORKER, []),
+                             (PROCESS_TYPE_WORKER_FORK_SERVER, []),
                              (PROCESS_TYPE_LOCAL_SCHEDULER, []),
                              (PROCESS_TYPE_PLASMA_MANAGER, []),
                              (PROCESS_TYPE_PLASMA_STORE, []),
@@ -47,6 +47,17 @@ RUN_PHOTON_PROFILER = False
 RUN_PLASMA_MANAGER_PROFILER = False
 RUN_PLASMA_STORE_PROFILER = False
 
+# True if local schedulers should fork new workers from a worker fork server
+# that has already imported everything a worker needs, instead of starting a
+# new Python interpreter for each worker. This is only done for the default
+# worker script.
+USE_WORKER_FORK_SERVER = True
+
+DEFAULT_WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   "workers/default_worker.py")
+WORKER_FORK_SERVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                       "workers/worker_fork_server.py")
+
 # ObjectStoreAddress tuples contain all information necessary to connect to an
 # object store. The fields are:
 # - name: The socket name for the object store
@@ -391,10 +402,15 @@ def start_local_scheduler(redis_address,
   if num_cpus is None:
     # By default, use the number of hardware execution threads for the number of
     # cores.
+    import multiprocessing
     num_cpus = multiprocessing.cpu_count()
   if num_gpus is None:
     # By default, assume this node has no GPUs.
     num_gpus = 0
+  worker_fork_server_name = None
+  if USE_WORKER_FORK_SERVER and worker_path == DEFAULT_WORKER_PATH:
+    worker_fork_server_name = start_worker_fork_server(cleanup=cleanup,
+                                                       redirect_output=redirect_output)
   local_scheduler_name, p = photon.start_local_scheduler(plasma_store_name,
                                                          plasma_manager_name,
                                                          worker_path=worker_path,
@@ -404,11 +420,49 @@ def start_local_scheduler(redis_address,
                                                          use_profiler=RUN_PHOTON_PROFILER,
                                                          redirect_output=redirect_output,
                                                          static_resource_list=[num_cpus, num_gpus],
-                                                         num_workers=num_workers)
+                                                         num_workers=num_workers,
+                                                         worker_fork_server_name=worker_fork_server_name)
   if cleanup:
     all_processes[PROCESS_TYPE_LOCAL_SCHEDULER].append(p)
   return local_scheduler_name
 
+def start_worker_fork_server(cleanup=True, redirect_output=False, timeout=10):
+  """Start a process that forks new workers on request.
+
+  The fork server imports everything a worker needs once, so that forking a
+  worker from it is much faster than starting a new Python interpreter. Local
+  schedulers that are given the socket of the fork server use it to start
+  workers and fall back to running the worker script if it is not available.
+
+  Args:
+    cleanup (bool): True if using Ray in local mode. If cleanup is true, then
+      this process will be killed by services.cleanup() when the Python process
+      that imported services exits.
+    redirect_output (bool): True if stdout and stderr should be redirected to
+      /dev/null.
+    timeout (float): The maximum number of seconds to wait for the fork server
+      to start listening.
+
+  Return:
+    The name of the socket that the fork server listens on.
+  """
+  socket_name = "/tmp/workerforkserver{}".format(random_name())
+  command = ["python", WORKER_FORK_SERVER_PATH, "--socket-name=" + socket_name]
+  with open(os.devnull, "w") as FNULL:
+    stdout = FNULL if redirect_output else None
+    stderr = FNULL if redirect_output else None
+    p = subprocess.Popen(command, stdout=stdout, stderr=stderr)
+  if cleanup:
+    all_processes[PROCESS_TYPE_WORKER_FORK_SERVER].append(p)
+  # Wait for the fork server to finish its imports so that the local scheduler
+  # can use it for its initial workers.
+  start_time = time.time()
+  while not os.path.exists(socket_name) and time.time() - start_time < timeout:
+    if p.poll() is not None:
+      break
+    time.sleep(0.01)
+  return socket_name
+
 def start_objstore(node_ip_address, redis_address, object_manager_port=None,
                    cleanup=True, redirect_output=False, objstore_memory=None):
   """This method starts an object store process.
@@ -430,6 +484,7 @@ def start_objstore(node_ip_address, redis_address, object_manager_port=None,
   """
   if objstore_memory is None:
     # Compute a fraction of the system memory for the Plasma store to use.
+    import psutil
     system_memory = psutil.virtual_memory().total
     if sys.platform == "linux" or sys.platform == "linux2":
       # On linux we use /dev/shm, its size is half the size of the physical
@@ -560,7 +615,7 @@ def start_ray_processes(address_info=None,
   address_info["node_ip_address"] = node_ip_address
 
   if worker_path is None:
-    worker_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workers/default_worker.py")
+    worker_path = DEFAULT_WORKER_PATH
 
   # Start Redis if there isn't already an instance running. TODO(rkn): We are
   # suppressing the output of Redis because on Linux it prints a bunch of
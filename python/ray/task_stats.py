@@ -0,0 +1,216 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import marshal
+import math
+import threading
+import time
+
+# The key prefix under which each worker publishes its task statistics. The key
+# is a hash mapping the ID of each function to its marshalled histograms.
+TASK_STATS_PREFIX = b"TaskStats:"
+# A set of the keys under which workers have published task statistics.
+TASK_STATS_KEYS = b"TaskStatsKeys"
+# The minimum number of seconds between two publications of the statistics of
+# one worker.
+PUBLISH_INTERVAL = 5.0
+
+# The phases of a task that are timed. These correspond to the spans logged by
+# main_loop and process_task in worker.py.
+PHASES = ["wait_for_function", "get_arguments", "execute", "store_outputs"]
+
+# Durations are assigned to logarithmically spaced buckets, so quantiles are
+# accurate to within BUCKET_GROWTH - 1 relative error no matter how long the
+# tasks take. Durations below MIN_DURATION all fall in the first bucket.
+MIN_DURATION = 1e-6
+BUCKET_GROWTH = 1.05
+_LOG_BUCKET_GROWTH = math.log(BUCKET_GROWTH)
+
+class LatencyHistogram(object):
+  """A streaming histogram of durations.
+
+  Attributes:
+    count (int): The number of recorded durations.
+    total (float): The sum of the recorded durations.
+    max (float): The largest recorded duration.
+    buckets (Dict[int, int]): A mapping from the index of each nonempty bucket
+      to the number of durations in it.
+  """
+
+  def __init__(self, count=0, total=0.0, max=0.0, buckets=None):
+    """Initialize a LatencyHistogram."""
+    self.count = count
+    self.total = total
+    self.max = max
+    self.buckets = {} if buckets is None else buckets
+
+  def record(self, duration):
+    """Add a duration in seconds to the histogram."""
+    if duration > MIN_DURATION:
+      index = int(math.log(duration / MIN_DURATION) / _LOG_BUCKET_GROWTH)
+    else:
+      index = 0
+    self.buckets[index] = self.buckets.get(index, 0) + 1
+    self.count += 1
+    self.total += duration
+    if duration > self.max:
+      self.max = duration
+
+  def merge(self, other):
+    """Add the durations recorded by another histogram to this one."""
+    for index, count in other.buckets.items():
+      self.buckets[index] = self.buckets.get(index, 0) + count
+    self.count += other.count
+    self.total += other.total
+    self.max = max(self.max, other.max)
+
+  def quantile(self, q):
+    """Return an estimate of the q-th quantile of the recorded durations."""
+    if self.count == 0:
+      return 0.0
+    rank = q * self.count
+    seen = 0
+    for index in sorted(self.buckets):
+      seen += self.buckets[index]
+      if seen >= rank:
+        # Use the geometric midpoint of the bucket.
+        return min(MIN_DURATION * BUCKET_GROWTH ** (index + 0.5), self.max)
+    return self.max
+
+  def summary(self):
+    """Return the count, mean, median, 99th percentile and maximum."""
+    return {"count": self.count,
+            "mean": self.total / self.count if self.count > 0 else 0.0,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "max": self.max}
+
+  def encode(self):
+    return (self.count, self.total, self.max, self.buckets)
+
+  @staticmethod
+  def decode(encoded):
+    count, total, max, buckets = encoded
+    return LatencyHistogram(count, total, max, buckets)
+
+class _PhaseTimer(object):
+  """A context manager that records the duration of one phase of a task."""
+
+  def __init__(self, task_stats, function_id, phase):
+    self.task_stats = task_stats
+    self.function_id = function_id
+    self.phase = phase
+
+  def __enter__(self):
+    self.start_time = time.time()
+
+  def __exit__(self, type, value, tb):
+    self.task_stats.record(self.function_id, self.phase,
+                           time.time() - self.start_time)
+
+class TaskStats(object):
+  """Latency histograms of the phases of the tasks executed by a worker.
+
+  The histograms are kept per function and per phase. They accumulate for the
+  lifetime of the worker and are written to Redis in the background, at most
+  once every PUBLISH_INTERVAL seconds, so that the statistics of all tasks can
+  be aggregated without logging the events of every task.
+
+  Attributes:
+    worker: The worker whose tasks are timed.
+    histograms (Dict[str, Dict[str, LatencyHistogram]]): A mapping from the ID
+      of each function to a mapping from each phase to its histogram.
+    dirty (Set[str]): The IDs of the functions whose histograms changed since
+      they were last published.
+  """
+
+  def __init__(self, worker):
+    """Initialize a TaskStats object with no histograms."""
+    self.worker = worker
+    self.histograms = {}
+    self.dirty = set()
+    self.last_publish_time = 0
+    self.publish_timer = None
+    # Histograms are published from a timer thread.
+    self.lock = threading.Lock()
+
+  def time(self, function_id, phase):
+    """Return a context manager that records the duration of a phase.
+
+    Args:
+      function_id (str): The ID of the function of the task.
+      phase (str): One of PHASES.
+    """
+    return _PhaseTimer(self, function_id, phase)
+
+  def record(self, function_id, phase, duration):
+    """Record the duration of a phase of a task of a function."""
+    with self.lock:
+      histograms = self.histograms.get(function_id)
+      if histograms is None:
+        histograms = {}
+        self.histograms[function_id] = histograms
+      if phase not in histograms:
+        histograms[phase] = LatencyHistogram()
+      histograms[phase].record(duration)
+      self.dirty.add(function_id)
+      if self.publish_timer is None:
+        delay = max(0, self.last_publish_time + PUBLISH_INTERVAL - time.time())
+        self.publish_timer = threading.Timer(delay, self.publish)
+        self.publish_timer.daemon = True
+        self.publish_timer.start()
+
+  def publish(self):
+    """Write the histograms that changed since the last publication to Redis."""
+    key = TASK_STATS_PREFIX + self.worker.worker_id
+    pipeline = self.worker.redis_client.pipeline(transaction=False)
+    with self.lock:
+      self.publish_timer = None
+      self.last_publish_time = time.time()
+      for function_id in self.dirty:
+        function_name = self.worker.function_names.get(function_id, "")
+        encoded = {phase: histogram.encode() for phase, histogram
+                   in self.histograms[function_id].items()}
+        pipeline.hset(key, function_id, marshal.dumps((function_name, encoded)))
+      self.dirty = set()
+    pipeline.sadd(TASK_STATS_KEYS, key)
+    pipeline.execute()
+
+def task_stats():
+  """Return latency statistics of the tasks of each remote function.
+
+  The statistics are aggregated over all workers in the cluster. For each
+  remote function, and for each phase of its tasks (waiting for the function
+  to be imported, getting the arguments, executing the function, and storing
+  the outputs), they contain the number of tasks and the mean, median, 99th
+  percentile and maximum duration in seconds. Workers publish their statistics
+  at most once every few seconds, so the result may be slightly out of date.
+
+  Returns:
+    A dictionary mapping the name of each remote function or actor method
+      (qualified by its actor class) to a dictionary mapping each phase to a
+      dictionary of statistics.
+  """
+  import ray.worker
+  worker = ray.worker.global_worker
+  ray.worker.check_connected(worker)
+  if worker.mode == ray.worker.PYTHON_MODE:
+    return {}
+  pipeline = worker.redis_client.pipeline(transaction=False)
+  for key in worker.redis_client.smembers(TASK_STATS_KEYS):
+    pipeline.hgetall(key)
+  histograms = {}
+  for worker_stats in pipeline.execute():
+    for data in worker_stats.values():
+      function_name, encoded = marshal.loads(data)
+      phases = histograms.setdefault(function_name, {})
+      for phase, encoded_histogram in encoded.items():
+        histogram = LatencyHistogram.decode(encoded_histogram)
+        if phase in phases:
+          phases[phase].merge(histogram)
+        else:
+          phases[phase] = histogram
+  return {function_name: {phase: histogram.summary()
+                          for phase, histogram in phases.items()}
+          for function_name, phases in histograms.items()}
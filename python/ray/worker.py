@@ -2,27 +2,33 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-import json
 import hashlib
+import inspect
 import os
 import sys
 import time
 import traceback
+import zlib
 import copy
 import collections
 import funcsigs
 import numpy as np
-import colorama
 import atexit
 import random
 import redis
+import select
+import struct
 import threading
 import string
 
 # Ray modules
+import ray.event_log as event_log
 import ray.pickling as pickling
+import ray.profiling as profiling
+import ray.reference_counting as reference_counting
 import ray.serialization as serialization
 import ray.services as services
+import ray.task_stats as task_stats
 import numbuf
 import photon
 import plasma
@@ -46,6 +52,32 @@ NIL_ACTOR_ID = 20 * b"\xff"
 # When performing ray.get, wait 1 second before attemping to reconstruct and
 # fetch the object again.
 GET_TIMEOUT_MILLISECONDS = 1000
+# The maximum number of object IDs that as_completed asks the plasma manager to
+# fetch again each time no object has arrived for GET_TIMEOUT_MILLISECONDS.
+AS_COMPLETED_REFETCH_SIZE = 1000
+
+# Pickled remote functions are stored once in Redis, under a key derived from a
+# hash of the pickled function. Functions that are larger than this many bytes
+# are stored compressed.
+FUNCTION_COMPRESSION_THRESHOLD = 4096
+FUNCTION_BLOB_PREFIX = b"FunctionBlob:"
+# The first byte of a stored function indicates whether it is compressed.
+FUNCTION_BLOB_UNCOMPRESSED = b"p"
+FUNCTION_BLOB_COMPRESSED = b"z"
+
+# Arguments that are passed by value but are not simple values are serialized
+# into the task spec if they take at most this many bytes. Larger arguments are
+# put in the object store. This can be changed with
+# ray.experimental.set_inline_argument_threshold.
+INLINE_ARGUMENT_THRESHOLD = 2048
+
+# The return object IDs of the tasks of remote functions defined with
+# cache=True are stored in Redis under this prefix followed by a hash of the
+# function ID and the arguments. The entries expire after this many seconds
+# unless they are used again. This can be changed with
+# ray.experimental.set_task_cache_ttl.
+TASK_CACHE_PREFIX = b"TaskCache:"
+TASK_CACHE_TTL = 3600
 
 def random_string():
   return np.random.bytes(20)
@@ -60,14 +92,27 @@ class FunctionID(object):
   def id(self):
     return self.function_id
 
-contained_objectids = []
+class _ContainedObjectIDs(threading.local):
+  """The object IDs found inside the value that each thread is serializing."""
+
+  def __init__(self):
+    self.object_ids = []
+
+  def pop(self):
+    """Return the object IDs found so far and reset the list."""
+    object_ids = self.object_ids
+    self.object_ids = []
+    return object_ids
+
+contained_objectids = _ContainedObjectIDs()
 def numbuf_serialize(value):
   """This serializes a value and tracks the object IDs inside the value.
 
   We also define a custom ObjectID serializer which also closes over the global
   variable contained_objectids, and whenever the custom serializer is called, it
-  adds the releevant ObjectID to the list contained_objectids. The list
-  contained_objectids should be reset between calls to numbuf_serialize.
+  adds the relevant ObjectID to the list of the current thread. The list should
+  be popped between calls to numbuf_serialize. The list is kept separately for
+  each thread so that threads can serialize values at the same time.
 
   Args:
     value: A Python object that will be serialized.
@@ -75,9 +120,150 @@ def numbuf_serialize(value):
   Returns:
     The serialized object.
   """
-  assert len(contained_objectids) == 0, "This should be unreachable."
+  assert len(contained_objectids.object_ids) == 0, "This should be unreachable."
   return numbuf.serialize_list([value])
 
+class InlinedArgument(object):
+  """An argument that was serialized with numbuf and passed by value.
+
+  Instances of this class are pickled into the task spec by photon.Task and are
+  deserialized by the worker that executes the task.
+
+  Attributes:
+    metadata (bytes): The serialized schema of the argument.
+    data (bytes): The serialized record batch of the argument.
+    header_end_offset (int): The offset returned by numbuf.write_to_buffer.
+  """
+
+  def __init__(self, metadata, data, header_end_offset):
+    self.metadata = metadata
+    self.data = data
+    self.header_end_offset = header_end_offset
+
+  def deserialize(self):
+    """Return the value of the argument."""
+    batch = numbuf.read_from_buffer(memoryview(self.data),
+                                    memoryview(self.metadata),
+                                    self.header_end_offset)
+    return numbuf.deserialize_list(batch, self.data)[0]
+
+if sys.version_info >= (3, 0):
+  _integer_types = (int,)
+else:
+  _integer_types = (int, long)
+
+def _encode_item(tag, data):
+  return tag + struct.pack("<Q", len(data)) + data
+
+def _canonical_encoding(value):
+  """Encode a value in a way that is the same in every process.
+
+  Unlike pickles, the encoding does not depend on the process that computes
+  it, so equal arguments of tasks submitted by different drivers are encoded
+  identically. Object IDs are encoded by ID, not by value.
+
+  Args:
+    value: The value to encode.
+
+  Returns:
+    The encoding as bytes.
+
+  Raises:
+    TypeError: The value contains an object of a type that cannot be encoded.
+  """
+  if value is None:
+    return b"N"
+  if isinstance(value, bool):
+    return b"T" if value else b"F"
+  if isinstance(value, photon.ObjectID):
+    return _encode_item(b"O", value.id())
+  if isinstance(value, _integer_types):
+    return _encode_item(b"i", str(value).encode("ascii"))
+  if isinstance(value, float):
+    return _encode_item(b"f", value.hex().encode("ascii"))
+  if isinstance(value, bytes):
+    return _encode_item(b"b", value)
+  if isinstance(value, type(u"")):
+    return _encode_item(b"s", value.encode("utf-8"))
+  if isinstance(value, (list, tuple)):
+    tag = b"l" if isinstance(value, list) else b"t"
+    return _encode_item(tag, b"".join([_canonical_encoding(item) for item in value]))
+  if isinstance(value, dict):
+    items = sorted([_canonical_encoding(key) + _canonical_encoding(item)
+                    for key, item in value.items()])
+    return _encode_item(b"d", b"".join(items))
+  if isinstance(value, (np.ndarray, np.generic)) and not value.dtype.hasobject:
+    array = np.ascontiguousarray(value)
+    header = "{}:{}".format(array.dtype.str, array.shape).encode("ascii")
+    return _encode_item(b"a", _encode_item(b"h", header) + array.tobytes())
+  raise TypeError("Values of type {} have no canonical encoding."
+                  .format(type(value)))
+
+def _task_cache_key(function_id, function_hash, args):
+  """Compute the key of the cached return object IDs of a task.
+
+  Args:
+    function_id: The ID of the remote function of the task.
+    function_hash (bytes): The hash of the pickled remote function, so that
+      tasks of a function that was redefined do not reuse the results of the
+      old definition.
+    args (List[Any]): The arguments of the task.
+
+  Returns:
+    The key, or None if the arguments cannot be encoded canonically, for
+      example because they contain instances of custom classes.
+  """
+  try:
+    encoded_args = _canonical_encoding(list(args))
+  except TypeError:
+    return None
+  return TASK_CACHE_PREFIX + hashlib.sha1(function_id.id() + function_hash +
+                                          encoded_args).digest()
+
+class ObjectIDStream(object):
+  """An iterator over the object IDs of the values yielded by a remote function.
+
+  A task of a remote function that yields values stores each value in the
+  object store as soon as it is produced. The object ID of the i-th value is
+  the return ID with index i + 1 of the task, so it can be computed in advance.
+  The only regular return value of the task is the number of values that it
+  yielded, which is stored when the task finishes. Iterating over the stream
+  blocks until the next value or the end of the stream is available.
+
+  Attributes:
+    task_id: The ID of the task that yields the values.
+    done_id: The object ID of the number of values that the task yielded.
+  """
+
+  def __init__(self, task_id, done_id, worker):
+    """Initialize an ObjectIDStream for a task that was just submitted."""
+    self.task_id = task_id
+    self.done_id = done_id
+    self.worker = worker
+    self.index = 0
+    # The number of values that the task yielded, once the task has finished.
+    self.num_values = None
+
+  def __iter__(self):
+    return self
+
+  def __next__(self):
+    object_id = photon.compute_return_id(self.task_id, self.index + 1)
+    if self.num_values is None:
+      ready_ids, _ = wait([object_id, self.done_id], num_returns=1,
+                          worker=self.worker)
+      if object_id.id() not in [ready_id.id() for ready_id in ready_ids]:
+        # The task finished. If it failed, this raises the task's error.
+        self.num_values = get(self.done_id, worker=self.worker)
+    if self.num_values is not None and self.index >= self.num_values:
+      raise StopIteration
+    self.index += 1
+    if self.worker.reference_counter is not None:
+      object_id = self.worker.reference_counter.track([object_id])[0]
+    return object_id
+
+  next = __next__
+
 class RayTaskError(Exception):
   """An object used internally to represent a task that threw an exception.
 
@@ -108,6 +294,8 @@ class RayTaskError(Exception):
 
   def __str__(self):
     """Format a RayTaskError as a string."""
+    # colorama is imported lazily because it is only needed to format errors.
+    import colorama
     if self.traceback_str is None:
       # This path is taken if getting the task arguments failed.
       return "Remote function {}{}{} failed with:\n\n{}".format(colorama.Fore.RED, self.function_name, colorama.Fore.RESET, self.exception)
@@ -131,6 +319,7 @@ class RayGetError(Exception):
 
   def __str__(self):
     """Format a RayGetError as a string."""
+    import colorama
     return "Could not get objectid {}. It was created by remote function {}{}{} which failed with:\n\n{}".format(self.objectid, colorama.Fore.RED, self.task_error.function_name, colorama.Fore.RESET, self.task_error)
 
 class RayGetArgumentError(Exception):
@@ -154,6 +343,7 @@ class RayGetArgumentError(Exception):
 
   def __str__(self):
     """Format a RayGetArgumentError as a string."""
+    import colorama
     return "Failed to get objectid {} as argument {} for remote function {}{}{}. It was created by remote function {}{}{} which failed with:\n{}".format(self.objectid, self.argument_index, colorama.Fore.RED, self.function_name, colorama.Fore.RESET, colorama.Fore.RED, self.task_error.function_name, colorama.Fore.RESET, self.task_error)
 
 
@@ -377,6 +567,31 @@ class Worker(object):
       exported. This is only used on the driver.
     worker_import_counter (int): The number of exports that the worker has
       imported so far. This is only used on the workers.
+    async_notifier (AsyncNotifier): The object used by ray.get_async and
+      ray.wait_async to receive notifications about sealed objects. This is
+      None until one of those methods is called.
+    photon_lock (threading.Lock): A lock that serializes messages sent to the
+      local scheduler, since the photon client may be used from many threads.
+    object_cache (ObjectCache): An optional cache of deserialized objects. This
+      is None unless ray.experimental.enable_object_cache has been called.
+    inline_argument_threshold (int): The maximum size in bytes of a serialized
+      argument that is passed in the task spec instead of the object store.
+    task_cache_ttl (int): The number of seconds for which the return object
+      IDs of a task of a remote function defined with cache=True are reused.
+    reference_counter (ReferenceCounter): The counter of the references that
+      this worker holds to objects. This is None unless
+      ray.experimental.enable_reference_counting has been called.
+    imported_function_hashes (Dict[str, Tuple]): A mapping from the ID of each
+      remote function that this worker imported successfully to the hash of the
+      pickled function and the options it was defined with. This is used to
+      skip importing a function again when a driver redefines it identically.
+    function_hashes (Dict[str, bytes]): A mapping from the ID of each remote
+      function that this driver exported to the hash of its latest pickled
+      definition.
+    profiler (FunctionProfiler): The profiler for the tasks of remote functions
+      that were defined with profile=True.
+    task_stats (TaskStats): The latency histograms of the phases of the tasks
+      executed by this worker.
   """
 
   def __init__(self):
@@ -387,45 +602,23 @@ class Worker(object):
     # pair is added to the dict.
     self.num_return_vals = collections.defaultdict(lambda: 1)
     self.function_names = {}
-    self.function_export_counters = {}
+    self.imported_function_hashes = {}
+    self.function_hashes = {}
     self.connected = False
     self.mode = None
     self.cached_remote_functions = []
     self.cached_functions_to_run = []
-    # The driver_export_counter and worker_import_counter are used to make sure
-    # that no task executes before everything it needs is present. For example,
-    # if we define a remote function f, a worker cannot execute a task for f
-    # until the worker has imported the function f.
-    #   - When a remote function, a reusable variable, or a function to run is
-    #     exported, the driver_export_counter is incremented. These exports must
-    #     take place from the driver.
-    #   - When an actor is created, the driver_export_counter is NOT
-    #     incremented. Note that an actor can be created from a driver or from
-    #     any worker.
-    #   - When a worker imports a remote function, a reusable variable, or a
-    #     function to run, its worker_import_counter is incremented.
-    #   - Notably, when an actor is imported, its worker_import_counter is NOT
-    #     incremented.
-    #   - Whenever a remote function is DEFINED on the driver, it records the
-    #     value of the driver_export_counter and a worker will not execute that
-    #     remote function until it has imported that many exports (excluding
-    #     actors).
-    #   - When an actor is defined.
-    #       a) If the actor is created on a driver, it records the
-    #          driver_export_counter.
-    #       b) If the actor is created inside a task on a regular worker, it
-    #          records the driver_export_counter associated with the function in
-    #          task creating the actor.
-    #       c) If the actor is created inside a task on an actor worker, it
-    #          records
-    #     The worker that ultimately runs the actor will not execute any tasks
-    #     until it has imported that many imports.
+    # The driver_export_counter and worker_import_counter count the exports
+    # (excluding actors) that the driver has exported and that the worker has
+    # imported. They are recorded with each export and in the worker's
+    # information in Redis, but they are not used to decide when a task can
+    # run. Workers import exports in the order in which they were exported, so
+    # a worker can execute a task for a remote function as soon as it has
+    # imported the function, and an actor worker can execute tasks as soon as
+    # it has imported the actor. The import thread notifies import_condition
+    # whenever it has imported a batch of exports. See wait_for_function.
     #
     # TODO(rkn): These counters must be tracked separately for each driver.
-    # TODO(rkn): Maybe none of these counters are necessary? When executing a
-    # regular task, workers can just wait until the function ID is present. When
-    # executing an actor task, the actor worker can just wait until the actor
-    # has been defined.
     self.driver_export_counter = 0
     self.worker_import_counter = 0
     self.fetch_and_register = {}
@@ -434,6 +627,95 @@ class Worker(object):
     # key, the default value of 0 is returned, and that key value pair is added
     # to the dict.
     self.actor_counters = collections.defaultdict(lambda: 0)
+    self.async_notifier = None
+    self.object_cache = None
+    self.inline_argument_threshold = INLINE_ARGUMENT_THRESHOLD
+    self.task_cache_ttl = TASK_CACHE_TTL
+    self.reference_counter = None
+    # The state that is used to compute object IDs and task IDs is kept
+    # separately for each thread so that the API can be used from many threads
+    # at once. See thread_context for details.
+    self.thread_local = threading.local()
+    self.thread_lock = threading.Lock()
+    self.thread_counter = (None, 0)
+    self.photon_lock = threading.Lock()
+    self.main_plasma_client = None
+    self.thread_plasma_clients = []
+
+  def thread_context(self):
+    """Return the state used to compute IDs in the current thread.
+
+    The main thread computes IDs from the current task ID, exactly as a single
+    threaded worker would. Every other thread that uses Ray within the current
+    task is numbered in the order in which it first calls into Ray, and it
+    computes its IDs from a task ID derived from the current task ID and that
+    number. This keeps IDs deterministic as long as the threads start using Ray
+    in the same order, and it guarantees that threads never produce the same
+    ID.
+
+    Returns:
+      A thread local object with the fields task_id, task_index, and
+        put_index.
+    """
+    context = self.thread_local
+    current_task_id = self.current_task_id.id()
+    if getattr(context, "parent_task_id", None) != current_task_id:
+      context.parent_task_id = current_task_id
+      if threading.current_thread().getName() == "MainThread":
+        context.task_id = self.current_task_id
+      else:
+        with self.thread_lock:
+          task_id, count = self.thread_counter
+          count = count + 1 if task_id == current_task_id else 1
+          self.thread_counter = (current_task_id, count)
+        thread_seed = current_task_id + "thread:{}".format(count).encode("ascii")
+        context.task_id = photon.ObjectID(hashlib.sha1(thread_seed).digest())
+      context.task_index = 0
+      context.put_index = 0
+    return context
+
+  @property
+  def task_index(self):
+    """The number of tasks submitted so far by this thread in this task."""
+    return self.thread_context().task_index
+
+  @task_index.setter
+  def task_index(self, value):
+    self.thread_context().task_index = value
+
+  @property
+  def put_index(self):
+    """The number of objects put so far by this thread in this task."""
+    return self.thread_context().put_index
+
+  @put_index.setter
+  def put_index(self, value):
+    self.thread_context().put_index = value
+
+  @property
+  def plasma_client(self):
+    """The plasma client to use from the current thread.
+
+    Plasma clients are not thread safe, so every thread other than the main
+    thread lazily creates its own client connected to the same plasma store and
+    plasma manager.
+    """
+    if self.main_plasma_client is None:
+      raise AttributeError("The worker does not have a plasma client yet.")
+    if threading.current_thread().getName() == "MainThread":
+      return self.main_plasma_client
+    client = getattr(self.thread_local, "plasma_client", None)
+    if client is None or client.store_socket_name != self.main_plasma_client.store_socket_name:
+      client = plasma.PlasmaClient(self.main_plasma_client.store_socket_name,
+                                   self.main_plasma_client.manager_socket_name)
+      self.thread_local.plasma_client = client
+      with self.thread_lock:
+        self.thread_plasma_clients.append(client)
+    return client
+
+  @plasma_client.setter
+  def plasma_client(self, client):
+    self.main_plasma_client = client
 
   def set_mode(self, mode):
     """Set the mode of the worker.
@@ -457,7 +739,11 @@ class Worker(object):
       mode: One of SCRIPT_MODE, WORKER_MODE, PYTHON_MODE, and SILENT_MODE.
     """
     self.mode = mode
-    colorama.init()
+    if mode in [SCRIPT_MODE, SILENT_MODE]:
+      # Only drivers print colored error messages, so workers do not import
+      # colorama at all.
+      import colorama
+      colorama.init()
 
   def put_object(self, objectid, value):
     """Put value in the local object store with object id objectid.
@@ -479,15 +765,40 @@ class Worker(object):
       # code to the caller instead of printing a message.
       print("This object already exists in the object store.")
 
-    global contained_objectids
-    # Optionally do something with the contained_objectids here.
-    contained_objectids = []
+    contained = contained_objectids.pop()
+    if self.reference_counter is not None:
+      # The object holds references to the objects whose IDs it contains.
+      self.reference_counter.add_contained(objectid, contained)
 
   def get_object(self, object_ids):
     """Get the value or values in the local object store associated with object_ids.
 
     Return the values from the local object store for object_ids. This will block
     until all the values for object_ids have been written to the local object store.
+    If the object cache is enabled, values that are in the cache are returned
+    without going through the object store.
+
+    Args:
+      object_ids (List[object_id.ObjectID]): A list of the object IDs whose
+        values should be retrieved.
+    """
+    if self.object_cache is None:
+      return self.retrieve_objects(object_ids)
+    values = [self.object_cache.lookup(object_id.id()) for object_id in object_ids]
+    missing_indices = [i for i, value in enumerate(values)
+                       if value is self.object_cache.MISS]
+    if len(missing_indices) > 0:
+      missing_values = self.retrieve_objects([object_ids[i] for i in missing_indices])
+      for i, value in zip(missing_indices, missing_values):
+        values[i] = value
+        self.object_cache.add(object_ids[i].id(), value)
+    return values
+
+  def retrieve_objects(self, object_ids):
+    """Retrieve and deserialize objects from the local object store.
+
+    This will block until all the values for object_ids have been written to
+    the local object store.
 
     Args:
       object_ids (List[object_id.ObjectID]): A list of the object IDs whose
@@ -504,11 +815,13 @@ class Worker(object):
     # their original index in the object_ids argument.
     unready_ids = dict((object_id, i) for (i, (object_id, val)) in
                        enumerate(final_results) if val is None)
-    # Try reconstructing any objects we haven't gotten yet. Try to get them
-    # until GET_TIMEOUT_MILLISECONDS milliseconds passes, then repeat.
+    # Block until the objects are sealed. The plasma store replies as soon as
+    # the last object is sealed, so the timeout only determines how often we
+    # ask the local scheduler to reconstruct objects that have not appeared.
+    # Most of those objects are still being computed, so we do not ask before
+    # waiting once, and the local scheduler backs off from checking the same
+    # object repeatedly. It only reexecutes a task if its object is lost.
     while len(unready_ids) > 0:
-      for unready_id in unready_ids:
-        self.photon_client.reconstruct_object(unready_id)
       results = numbuf.retrieve_list(list(unready_ids.keys()),
                                      self.plasma_client.conn,
                                      GET_TIMEOUT_MILLISECONDS)
@@ -519,6 +832,10 @@ class Worker(object):
           index = unready_ids[object_id]
           final_results[index] = (object_id, val)
           unready_ids.pop(object_id)
+      if len(unready_ids) > 0:
+        with self.photon_lock:
+          for unready_id in unready_ids:
+            self.photon_client.reconstruct_object(unready_id)
 
     # Unwrap the object from the list (it was wrapped put_object).
     assert len(final_results) == len(object_ids)
@@ -542,34 +859,251 @@ class Worker(object):
       num_gpus (int): The number of gpus this task requires to run.
     """
     with log_span("ray:submit_task", worker=self):
-      check_main_thread()
-      # Put large or complex arguments that are passed by value in the object
-      # store first.
-      args_for_photon = []
-      for arg in args:
-        if isinstance(arg, photon.ObjectID):
-          args_for_photon.append(arg)
-        elif photon.check_simple_value(arg):
-          args_for_photon.append(arg)
+      args = self._prepare_args(args)
+      with self.photon_lock:
+        task = self._create_task(function_id, args, num_cpus, num_gpus, actor_id)
+        returns = task.returns()
+        if self.reference_counter is not None:
+          returns = self._add_task_references([task], [args])[0]
+        self.photon_client.submit(task)
+
+      return returns
+
+  def submit_task_batch(self, function_id, func_name, args_list, num_cpus, num_gpus, actor_id=photon.ObjectID(NIL_ACTOR_ID)):
+    """Submit many tasks for the same function to the scheduler at once.
+
+    This is equivalent to calling submit_task once for each element of
+    args_list, except that all of the tasks are sent to the local scheduler in
+    a single message.
+
+    Args:
+      func_name (str): The name of the function to be executed.
+      args_list (List[List[Any]]): A list containing the arguments for each
+        task. See submit_task for a description of the arguments.
+      num_cpus (int): The number of cpu cores each task requires to run.
+      num_gpus (int): The number of gpus each task requires to run.
+
+    Returns:
+      A list containing the return object IDs of each task.
+    """
+    with log_span("ray:submit_task_batch", worker=self):
+      args_list = [self._prepare_args(args) for args in args_list]
+      with self.photon_lock:
+        tasks = [self._create_task(function_id, args, num_cpus, num_gpus, actor_id)
+                 for args in args_list]
+        returns = [task.returns() for task in tasks]
+        if self.reference_counter is not None:
+          returns = self._add_task_references(tasks, args_list)
+        self.photon_client.submit_batch(tasks)
+
+      return returns
+
+  def _add_task_references(self, tasks, args_list):
+    """Count the references held by tasks that are about to be submitted.
+
+    The tasks and their return values reference their arguments that are
+    tracked object IDs, and this process references the return values. The
+    references are sent to Redis before the tasks are submitted. Untracked
+    arguments are skipped, because their objects have no reference count that
+    could drop back to zero.
+
+    Args:
+      tasks (List[photon.Task]): The tasks.
+      args_list (List[List[Any]]): The prepared arguments of each task.
+
+    Returns:
+      A list containing the tracked return object IDs of each task.
+    """
+    for task, args in zip(tasks, args_list):
+      self.reference_counter.add_task_arguments(
+          task.task_id(), task.returns(),
+          [arg for arg in args if isinstance(arg, reference_counting.TrackedObjectID)])
+    returns = [self.reference_counter.track(task.returns()) for task in tasks]
+    self.reference_counter.flush()
+    return returns
+
+  def submit_streaming_task(self, function_id, func_name, args, num_cpus, num_gpus):
+    """Submit a task for a remote function that yields values.
+
+    Args:
+      func_name (str): The name of the function to be executed.
+      args (List[Any]): The arguments to pass into the function. See
+        submit_task for a description of the arguments.
+      num_cpus (int): The number of cpu cores this task requires to run.
+      num_gpus (int): The number of gpus this task requires to run.
+
+    Returns:
+      An ObjectIDStream over the object IDs of the values that the task yields.
+    """
+    with log_span("ray:submit_task", worker=self):
+      args = self._prepare_args(args)
+      with self.photon_lock:
+        task = self._create_task(function_id, args, num_cpus, num_gpus,
+                                 photon.ObjectID(NIL_ACTOR_ID))
+        returns = task.returns()
+        if self.reference_counter is not None:
+          returns = self._add_task_references([task], [args])[0]
+        self.photon_client.submit(task)
+
+      return ObjectIDStream(task.task_id(), returns[0], self)
+
+  def submit_cached_task_batch(self, function_id, func_name, args_list, num_cpus, num_gpus):
+    """Submit tasks for a remote function that was defined with cache=True.
+
+    A task is only submitted if no equivalent task was submitted before, that
+    is, no task for the same definition of the function with the same
+    arguments. Otherwise the return object IDs of the earlier task are reused.
+    Arguments that are object IDs are compared by ID, not by value. Tasks whose
+    arguments contain values other than builtin types, NumPy arrays and object
+    IDs are always submitted. The return object IDs of each task are
+    stored in Redis and expire after task_cache_ttl seconds unless they are
+    reused. If reference counting is enabled, the cache is not used, since its
+    entries do not hold references to the objects that they refer to.
+
+    Args:
+      func_name (str): The name of the function to be executed.
+      args_list (List[List[Any]]): A list containing the arguments for each
+        task. See submit_task for a description of the arguments.
+      num_cpus (int): The number of cpu cores each task requires to run.
+      num_gpus (int): The number of gpus each task requires to run.
+
+    Returns:
+      A list containing the return object IDs of each task.
+    """
+    if self.reference_counter is not None:
+      return self.submit_task_batch(function_id, func_name, args_list,
+                                    num_cpus, num_gpus)
+    with log_span("ray:submit_cached_task_batch", worker=self):
+      function_hash = self.function_hashes.get(function_id.id())
+      if function_hash is None:
+        keys = [None for _ in args_list]
+      else:
+        keys = [_task_cache_key(function_id, function_hash, args)
+                for args in args_list]
+      known_keys = list(set([key for key in keys if key is not None]))
+      returns = {}
+      if len(known_keys) > 0:
+        for key, value in zip(known_keys, self.redis_client.mget(known_keys)):
+          if value is not None:
+            returns[key] = [photon.ObjectID(value[i:i + 20])
+                            for i in range(0, len(value), 20)]
+      # Submit a task for each set of arguments that is not cached yet, but
+      # only once if it appears several times in args_list.
+      to_submit = []
+      for args, key in zip(args_list, keys):
+        if key is None or key not in returns:
+          to_submit.append((args, key))
+          if key is not None:
+            returns[key] = None
+      submitted = []
+      if len(to_submit) > 0:
+        submitted = self.submit_task_batch(function_id, func_name,
+                                           [args for args, _ in to_submit],
+                                           num_cpus, num_gpus)
+
+      pipeline = self.redis_client.pipeline(transaction=False)
+      for key, object_ids in returns.items():
+        if object_ids is not None:
+          pipeline.expire(key, self.task_cache_ttl)
+      uncached_returns = []
+      for (_, key), object_ids in zip(to_submit, submitted):
+        if key is None:
+          uncached_returns.append(object_ids)
         else:
-          args_for_photon.append(put(arg))
-
-      # Submit the task to Photon.
-      task = photon.Task(self.task_driver_id,
-                         photon.ObjectID(function_id.id()),
-                         args_for_photon,
-                         self.num_return_vals[function_id.id()],
-                         self.current_task_id,
-                         self.task_index,
-                         actor_id, self.actor_counters[actor_id],
-                         [num_cpus, num_gpus])
-      # Increment the worker's task index to track how many tasks have been
-      # submitted by the current task so far.
-      self.task_index += 1
-      self.actor_counters[actor_id] += 1
-      self.photon_client.submit(task)
-
-      return task.returns()
+          returns[key] = object_ids
+          # If another driver cached the same task in the meantime, keep its
+          # entry. Both sets of object IDs are valid.
+          pipeline.set(key, b"".join([object_id.id() for object_id in object_ids]),
+                       ex=self.task_cache_ttl, nx=True)
+      pipeline.execute()
+
+      uncached_returns = iter(uncached_returns)
+      return [next(uncached_returns) if key is None else returns[key]
+              for key in keys]
+
+  def _inline_argument(self, value):
+    """Serialize an argument so that it can be passed in the task spec.
+
+    Args:
+      value: An argument that is not a simple value.
+
+    Returns:
+      An InlinedArgument, or None if the serialized argument is larger than
+        inline_argument_threshold.
+    """
+    if self.inline_argument_threshold <= 0:
+      return None
+    # Avoid serializing large arrays twice.
+    if (isinstance(value, np.ndarray) and
+        value.nbytes > self.inline_argument_threshold):
+      return None
+    metadata, size, batch = numbuf_serialize(value)
+    contained = contained_objectids.pop()
+    if size > self.inline_argument_threshold:
+      return None
+    # When reference counting is enabled, arguments that contain object IDs are
+    # put in the object store, which records the references that they hold.
+    if len(contained) > 0 and self.reference_counter is not None:
+      return None
+    data = bytearray(size)
+    header_end_offset = numbuf.write_to_buffer(batch, memoryview(data))
+    return InlinedArgument(bytes(metadata), bytes(data), header_end_offset)
+
+  def _prepare_args(self, args):
+    """Put large or complex arguments that are passed by value in the object store.
+
+    Arguments that are not simple values but are small once serialized are
+    passed in the task spec as InlinedArguments.
+
+    Args:
+      args (List[Any]): The arguments to pass into the function.
+
+    Returns:
+      The arguments to pass to photon.Task.
+    """
+    args_for_photon = []
+    for arg in args:
+      if isinstance(arg, photon.ObjectID):
+        args_for_photon.append(arg)
+      elif photon.check_simple_value(arg):
+        args_for_photon.append(arg)
+      else:
+        inlined_arg = self._inline_argument(arg)
+        if inlined_arg is None:
+          inlined_arg = put(arg)
+        args_for_photon.append(inlined_arg)
+    return args_for_photon
+
+  def _create_task(self, function_id, args, num_cpus, num_gpus, actor_id):
+    """Create the task spec for a task and advance the task counters.
+
+    This must be called while holding photon_lock so that actor tasks are
+    submitted in the order of their actor counters.
+
+    Args:
+      function_id: The ID of the function to be executed.
+      args (List[Any]): The arguments returned by _prepare_args.
+      num_cpus (int): The number of cpu cores this task requires to run.
+      num_gpus (int): The number of gpus this task requires to run.
+      actor_id: The ID of the actor to run the task on, or NIL_ACTOR_ID.
+
+    Returns:
+      The photon.Task to submit.
+    """
+    context = self.thread_context()
+    task = photon.Task(self.task_driver_id,
+                       photon.ObjectID(function_id.id()),
+                       args,
+                       self.num_return_vals[function_id.id()],
+                       context.task_id,
+                       context.task_index,
+                       actor_id, self.actor_counters[actor_id],
+                       [num_cpus, num_gpus])
+    # Increment the thread's task index to track how many tasks have been
+    # submitted by the current task so far.
+    context.task_index += 1
+    self.actor_counters[actor_id] += 1
+    return task
 
   def run_function_on_all_workers(self, function):
     """Run arbitrary code on all of the workers.
@@ -710,11 +1244,15 @@ def initialize_numbuf(worker=global_worker):
   # Define a custom serializer and deserializer for handling Object IDs.
   def objectid_custom_serializer(obj):
     class_identifier = serialization.class_identifier(type(obj))
-    contained_objectids.append(obj)
+    contained_objectids.object_ids.append(obj)
     return obj.id()
   def objectid_custom_deserializer(serialized_obj):
-    return photon.ObjectID(serialized_obj)
+    object_id = photon.ObjectID(serialized_obj)
+    if worker.reference_counter is not None:
+      object_id = worker.reference_counter.track([object_id])[0]
+    return object_id
   serialization.add_class_to_whitelist(photon.ObjectID, pickle=False, custom_serializer=objectid_custom_serializer, custom_deserializer=objectid_custom_deserializer)
+  serialization.add_class_to_whitelist(reference_counting.TrackedObjectID, pickle=False, custom_serializer=objectid_custom_serializer, custom_deserializer=objectid_custom_deserializer)
 
   if worker.mode in [SCRIPT_MODE, SILENT_MODE]:
     # These should only be called on the driver because register_class will
@@ -961,12 +1499,22 @@ def cleanup(worker=global_worker):
     worker.redis_client.hmset(b"Drivers:" + worker.worker_id,
                               {"end_time": time.time()})
 
+  if worker.async_notifier is not None:
+    worker.async_notifier.shutdown()
+    worker.async_notifier = None
+  if worker.reference_counter is not None:
+    worker.reference_counter.release_all()
+    worker.reference_counter = None
   disconnect(worker)
+  worker.object_cache = None
   worker.set_mode(None)
   worker.driver_export_counter = 0
   worker.worker_import_counter = 0
-  if hasattr(worker, "plasma_client"):
-    worker.plasma_client.shutdown()
+  if worker.main_plasma_client is not None:
+    worker.main_plasma_client.shutdown()
+    for client in worker.thread_plasma_clients:
+      client.shutdown()
+    worker.thread_plasma_clients = []
   services.cleanup()
 
 atexit.register(cleanup)
@@ -1035,29 +1583,97 @@ If this driver is hanging, start a new one with
     # we catch here.
     pass
 
-def fetch_and_register_remote_function(key, worker=global_worker):
-  """Import a remote function."""
-  driver_id, function_id_str, function_name, serialized_function, num_return_vals, module, function_export_counter, num_cpus, num_gpus = \
-    worker.redis_client.hmget(key, ["driver_id",
-                                    "function_id",
-                                    "name",
-                                    "function",
-                                    "num_return_vals",
-                                    "module",
-                                    "function_export_counter",
-                                    "num_cpus",
-                                    "num_gpus"])
+def fetch_exports(keys, worker=global_worker):
+  """Fetch the contents of many exports from Redis in a single round trip.
+
+  Args:
+    keys (List[str]): The keys of the exports to fetch.
+
+  Returns:
+    A list with a dictionary of the fields of each export.
+  """
+  pipeline = worker.redis_client.pipeline(transaction=False)
+  for key in keys:
+    pipeline.hgetall(key)
+  return pipeline.execute()
+
+def encode_function_blob(pickled_function):
+  """Prepare a pickled remote function for storage in Redis.
+
+  Args:
+    pickled_function (str): The pickled function.
+
+  Returns:
+    The pickled function, compressed if it is large, prefixed with a byte that
+      indicates whether it is compressed.
+  """
+  if len(pickled_function) > FUNCTION_COMPRESSION_THRESHOLD:
+    compressed_function = zlib.compress(pickled_function)
+    if len(compressed_function) < len(pickled_function):
+      return FUNCTION_BLOB_COMPRESSED + compressed_function
+  return FUNCTION_BLOB_UNCOMPRESSED + pickled_function
+
+def decode_function_blob(function_blob):
+  """Recover a pickled remote function from the value stored in Redis."""
+  if function_blob[:1] == FUNCTION_BLOB_COMPRESSED:
+    return zlib.decompress(function_blob[1:])
+  assert function_blob[:1] == FUNCTION_BLOB_UNCOMPRESSED
+  return function_blob[1:]
+
+def fetch_function_blobs(exports, worker=global_worker):
+  """Fetch the pickled functions of remote function exports in one round trip.
+
+  The pickled function is stored in the b"function" field of each export. This
+  skips functions that this worker has already imported.
+
+  Args:
+    exports (List[dict]): The fields of exports of remote functions.
+  """
+  exports = [export for export in exports
+             if worker.imported_function_hashes.get(export[b"function_id"], (None,))[0] != export[b"function_hash"]]
+  if len(exports) == 0:
+    return
+  pipeline = worker.redis_client.pipeline(transaction=False)
+  for export in exports:
+    pipeline.get(FUNCTION_BLOB_PREFIX + export[b"function_hash"])
+  for export, function_blob in zip(exports, pipeline.execute()):
+    export[b"function"] = function_blob
+
+def fetch_and_register_remote_function(key, export=None, worker=global_worker):
+  """Import a remote function.
+
+  Args:
+    key (str): The key of the export in Redis.
+    export (dict): The fields of the export if they have already been fetched.
+  """
+  export = worker.redis_client.hgetall(key) if export is None else export
+  driver_id, function_id_str, function_name, function_hash, num_return_vals, module, function_export_counter, num_cpus, num_gpus, profile = \
+    [export[field] for field in [b"driver_id",
+                                 b"function_id",
+                                 b"name",
+                                 b"function_hash",
+                                 b"num_return_vals",
+                                 b"module",
+                                 b"function_export_counter",
+                                 b"num_cpus",
+                                 b"num_gpus",
+                                 b"profile"]]
   function_id = photon.ObjectID(function_id_str)
   function_name = function_name.decode("ascii")
   num_return_vals = int(num_return_vals)
   num_cpus = int(num_cpus)
   num_gpus = int(num_gpus)
+  profile = bool(int(profile))
   module = module.decode("ascii")
-  function_export_counter = int(function_export_counter)
 
   worker.function_names[function_id.id()] = function_name
   worker.num_return_vals[function_id.id()] = num_return_vals
-  worker.function_export_counters[function_id.id()] = function_export_counter
+  # If this worker already imported exactly this function, for example because
+  # another driver defined the same function, there is nothing left to do.
+  function_hash_and_options = (function_hash, num_return_vals, num_cpus, num_gpus, profile)
+  if worker.imported_function_hashes.get(function_id.id()) == function_hash_and_options:
+    return
+  worker.imported_function_hashes.pop(function_id.id(), None)
   # This is a placeholder in case the function can't be unpickled. This will be
   # overwritten if the function is unpickled successfully.
   def f():
@@ -1065,10 +1681,14 @@ def fetch_and_register_remote_function(key, worker=global_worker):
   worker.functions[function_id.id()] = remote(num_return_vals=num_return_vals,
                                               function_id=function_id,
                                               num_cpus=num_cpus,
-                                              num_gpus=num_gpus)(lambda *xs: f())
+                                              num_gpus=num_gpus,
+                                              profile=profile)(lambda *xs: f())
 
   try:
-    function = pickling.loads(serialized_function)
+    serialized_function = export.get(b"function")
+    if serialized_function is None:
+      serialized_function = worker.redis_client.get(FUNCTION_BLOB_PREFIX + function_hash)
+    function = pickling.loads(decode_function_blob(serialized_function))
   except:
     # If an exception was thrown when the remote function was imported, we
     # record the traceback and notify the scheduler of the failure.
@@ -1084,13 +1704,22 @@ def fetch_and_register_remote_function(key, worker=global_worker):
     worker.functions[function_id.id()] = remote(num_return_vals=num_return_vals,
                                                 function_id=function_id,
                                                 num_cpus=num_cpus,
-                                                num_gpus=num_gpus)(function)
+                                                num_gpus=num_gpus,
+                                                profile=profile)(function)
+    worker.imported_function_hashes[function_id.id()] = function_hash_and_options
     # Add the function to the function table.
     worker.redis_client.rpush("FunctionTable:{}".format(function_id.id()), worker.worker_id)
 
-def fetch_and_register_environment_variable(key, worker=global_worker):
-  """Import an environment variable."""
-  driver_id, environment_variable_name, serialized_initializer, serialized_reinitializer = worker.redis_client.hmget(key, ["driver_id", "name", "initializer", "reinitializer"])
+def fetch_and_register_environment_variable(key, export=None, worker=global_worker):
+  """Import an environment variable.
+
+  Args:
+    key (str): The key of the export in Redis.
+    export (dict): The fields of the export if they have already been fetched.
+  """
+  export = worker.redis_client.hgetall(key) if export is None else export
+  driver_id, environment_variable_name, serialized_initializer, serialized_reinitializer = \
+    [export[field] for field in [b"driver_id", b"name", b"initializer", b"reinitializer"]]
   environment_variable_name = environment_variable_name.decode("ascii")
   try:
     initializer = pickling.loads(serialized_initializer)
@@ -1105,9 +1734,15 @@ def fetch_and_register_environment_variable(key, worker=global_worker):
                                 traceback_str,
                                 data={"name": environment_variable_name})
 
-def fetch_and_execute_function_to_run(key, worker=global_worker):
-  """Run on arbitrary function on the worker."""
-  driver_id, serialized_function = worker.redis_client.hmget(key, ["driver_id", "function"])
+def fetch_and_execute_function_to_run(key, export=None, worker=global_worker):
+  """Run on arbitrary function on the worker.
+
+  Args:
+    key (str): The key of the export in Redis.
+    export (dict): The fields of the export if they have already been fetched.
+  """
+  export = worker.redis_client.hgetall(key) if export is None else export
+  driver_id, serialized_function = export[b"driver_id"], export[b"function"]
   # Get the number of workers on this node that have already started executing
   # this remote function, and increment that value. Subtract 1 so the counter
   # starts at 0.
@@ -1126,6 +1761,52 @@ def fetch_and_execute_function_to_run(key, worker=global_worker):
     worker.push_error_to_driver(driver_id, "function_to_run", traceback_str,
                                 data={"name": name})
 
+def import_exports(export_keys, worker_info_key, worker=global_worker):
+  """Import a batch of exports in the order in which they were exported.
+
+  The contents of all of the exports are fetched in a single round trip. Remote
+  functions and environment variables that are exported again with the same ID
+  overwrite the same key, so the key already holds the latest definition and
+  it is imported only once per batch.
+
+  Args:
+    export_keys (List[str]): The keys of the exports, in the order in which
+      they appear in the list of exports.
+    worker_info_key (str): The key of the hash with this worker's information.
+  """
+  distinct_keys = list(collections.OrderedDict.fromkeys(export_keys))
+  exports = dict(zip(distinct_keys, fetch_exports(distinct_keys, worker=worker)))
+  fetch_function_blobs([export for key, export in exports.items()
+                        if key.startswith(b"RemoteFunction")], worker=worker)
+  num_counted = 0
+  for key in export_keys:
+    # Actors do not contribute to the import counter.
+    if not key.startswith(b"Actor"):
+      num_counted += 1
+    export = exports.pop(key, None)
+    if export is None:
+      # This key was already imported earlier in this batch.
+      continue
+    if key.startswith(b"RemoteFunction"):
+      with log_span("ray:import_remote_function", worker=worker):
+        fetch_and_register_remote_function(key, export=export, worker=worker)
+    elif key.startswith(b"EnvironmentVariables"):
+      with log_span("ray:import_environment_variable", worker=worker):
+        fetch_and_register_environment_variable(key, export=export, worker=worker)
+    elif key.startswith(b"FunctionsToRun"):
+      with log_span("ray:import_function_to_run", worker=worker):
+        fetch_and_execute_function_to_run(key, export=export, worker=worker)
+    elif key.startswith(b"Actor"):
+      # Only get the actor if the actor ID matches the actor ID of this
+      # worker.
+      if worker.actor_id == export[b"actor_id"]:
+        worker.fetch_and_register["Actor"](key, worker)
+    else:
+      raise Exception("This code should be unreachable.")
+  if num_counted > 0:
+    worker.redis_client.hincrby(worker_info_key, "export_counter", num_counted)
+    worker.worker_import_counter += num_counted
+
 def import_thread(worker):
   worker.import_pubsub_client = worker.redis_client.pubsub()
   # Exports that are published after the call to import_pubsub_client.psubscribe
@@ -1142,58 +1823,22 @@ def import_thread(worker):
   # Get the exports that occurred before the call to psubscribe.
   with worker.lock:
     export_keys = worker.redis_client.lrange("Exports", 0, -1)
-    for key in export_keys:
-      if key.startswith(b"RemoteFunction"):
-        fetch_and_register_remote_function(key, worker=worker)
-      elif key.startswith(b"EnvironmentVariables"):
-        fetch_and_register_environment_variable(key, worker=worker)
-      elif key.startswith(b"FunctionsToRun"):
-        fetch_and_execute_function_to_run(key, worker=worker)
-      elif key.startswith(b"Actor"):
-        # Only get the actor if the actor ID matches the actor ID of this
-        # worker.
-        actor_id, = worker.redis_client.hmget(key, "actor_id")
-        if worker.actor_id == actor_id:
-          worker.fetch_and_register["Actor"](key, worker)
-      else:
-        raise Exception("This code should be unreachable.")
-      # Actors do not contribute to the import counter.
-      if not key.startswith(b"Actor"):
-        worker.redis_client.hincrby(worker_info_key, "export_counter", 1)
-        worker.worker_import_counter += 1
-      num_imported += 1
+    import_exports(export_keys, worker_info_key, worker=worker)
+    num_imported += len(export_keys)
+    worker.import_condition.notify_all()
 
   for msg in worker.import_pubsub_client.listen():
     with worker.lock:
       if msg["type"] == "psubscribe":
         continue
       assert msg["data"] == b"rpush"
-      num_imports = worker.redis_client.llen("Exports")
-      assert num_imports >= num_imported
-      for i in range(num_imported, num_imports):
-        key = worker.redis_client.lindex("Exports", i)
-        if key.startswith(b"RemoteFunction"):
-          with log_span("ray:import_remote_function", worker=worker):
-            fetch_and_register_remote_function(key, worker=worker)
-        elif key.startswith(b"EnvironmentVariables"):
-          with log_span("ray:import_environment_variable", worker=worker):
-            fetch_and_register_environment_variable(key, worker=worker)
-        elif key.startswith(b"FunctionsToRun"):
-          with log_span("ray:import_function_to_run", worker=worker):
-            fetch_and_execute_function_to_run(key, worker=worker)
-        elif key.startswith(b"Actor"):
-          # Only get the actor if the actor ID matches the actor ID of this
-          # worker.
-          actor_id, = worker.redis_client.hmget(key, "actor_id")
-          if worker.actor_id == actor_id:
-            worker.fetch_and_register["Actor"](key, worker)
-        else:
-          raise Exception("This code should be unreachable.")
-        # Actors do not contribute to the import counter.
-        if not key.startswith(b"Actor"):
-          worker.redis_client.hincrby(worker_info_key, "export_counter", 1)
-          worker.worker_import_counter += 1
-        num_imported += 1
+      # Get all of the exports that we have not imported yet. A single message
+      # may cover several exports, and the exports of earlier messages may have
+      # already been imported.
+      export_keys = worker.redis_client.lrange("Exports", num_imported, -1)
+      import_exports(export_keys, worker_info_key, worker=worker)
+      num_imported += len(export_keys)
+      worker.import_condition.notify_all()
 
 def connect(info, object_id_seed=None, mode=WORKER_MODE, worker=global_worker, actor_id=NIL_ACTOR_ID):
   """Connect this worker to the local scheduler, to Plasma, and to Redis.
@@ -1217,9 +1862,11 @@ def connect(info, object_id_seed=None, mode=WORKER_MODE, worker=global_worker, a
   worker.connected = True
   worker.set_mode(mode)
   # The worker.events field is used to aggregate logging information and display
-  # it in the web UI. Note that Python lists protected by the GIL, which is
-  # important because we will append to this field from multiple threads.
-  worker.events = []
+  # it in the web UI. The event log is thread safe, which is important because
+  # we will log events from multiple threads.
+  worker.events = event_log.EventLog()
+  worker.profiler = profiling.FunctionProfiler(worker)
+  worker.task_stats = task_stats.TaskStats(worker)
   # If running Ray in PYTHON_MODE, there is no need to create call create_worker
   # or to start the worker service.
   if mode == PYTHON_MODE:
@@ -1231,6 +1878,9 @@ def connect(info, object_id_seed=None, mode=WORKER_MODE, worker=global_worker, a
   redis_ip_address, redis_port = info["redis_address"].split(":")
   worker.redis_client = redis.StrictRedis(host=redis_ip_address, port=int(redis_port))
   worker.lock = threading.Lock()
+  # The import thread notifies this condition after importing each batch of
+  # exports.
+  worker.import_condition = threading.Condition(worker.lock)
   # Create an object store client.
   worker.plasma_client = plasma.PlasmaClient(info["store_socket_name"], info["manager_socket_name"])
   # Create the local scheduler client.
@@ -1320,8 +1970,8 @@ def connect(info, object_id_seed=None, mode=WORKER_MODE, worker=global_worker, a
     for name, environment_variable in env._cached_environment_variables:
       env.__setattr__(name, environment_variable)
     # Export cached remote functions to the workers.
-    for function_id, func_name, func, num_return_vals, num_cpus, num_gpus in worker.cached_remote_functions:
-      export_remote_function(function_id, func_name, func, num_return_vals, num_cpus, num_gpus, worker)
+    for function_id, func_name, func, num_return_vals, num_cpus, num_gpus, profile in worker.cached_remote_functions:
+      export_remote_function(function_id, func_name, func, num_return_vals, num_cpus, num_gpus, profile, worker)
   worker.cached_functions_to_run = None
   worker.cached_remote_functions = None
   env._cached_environment_variables = None
@@ -1401,6 +2051,10 @@ def log_span(event_type, contents=None, worker=global_worker):
   return RayLogSpan(event_type, contents=contents, worker=worker)
 
 def log_event(event_type, contents=None, worker=global_worker):
+  """Log an event that happens at a single point in time.
+
+  The keys and values of contents are stored as strings.
+  """
   log(event_type, kind=LOG_POINT, contents=contents, worker=worker)
 
 def log(event_type, kind, contents=None, worker=global_worker):
@@ -1411,27 +2065,31 @@ def log(event_type, kind, contents=None, worker=global_worker):
 
   Args:
     event_type (str): The type of the event.
-    contents: More general data to store with the event.
+    contents (dict): More general data to store with the event. The keys and
+      values are converted to strings with str, so numbers and nested values
+      reach the web UI as strings.
     kind (int): Either LOG_POINT, LOG_SPAN_START, or LOG_SPAN_END. This is
       LOG_POINT if the event being logged happens at a single point in time. It
       is LOG_SPAN_START if we are starting to log a span of time, and it is
       LOG_SPAN_END if we are finishing logging a span of time.
   """
-  # TODO(rkn): This code currently takes around half a microsecond. Since we
-  # call it tens of times per task, this adds up. We will need to redo the
-  # logging code, perhaps in C.
-  contents = {} if contents is None else contents
-  assert isinstance(contents, dict)
-  # Make sure all of the keys and values in the dictionary are strings.
-  contents = {str(k): str(v) for k, v in contents.items()}
-  worker.events.append((time.time(), event_type, kind, contents))
+  # The event is packed into a fixed-size binary record. The contents are
+  # converted to strings and encoded right away.
+  assert contents is None or isinstance(contents, dict)
+  worker.events.append(event_type, kind, contents)
 
 def flush_log(worker=global_worker):
-  """Send the logged worker events to the global state store."""
+  """Send the logged worker events to the global state store.
+
+  The events are sent in a single message to the local scheduler. Nothing is
+  sent if the events of the current task were not sampled.
+  """
+  event_log_value = worker.events.flush()
+  if event_log_value is None:
+    return
   event_log_key = b"event_log:" + worker.worker_id + b":" + worker.current_task_id.id()
-  event_log_value = json.dumps(worker.events)
-  worker.photon_client.log_event(event_log_key, event_log_value)
-  worker.events = []
+  with worker.photon_lock:
+    worker.photon_client.log_event(event_log_key, event_log_value)
 
 def get(object_ids, worker=global_worker):
   """Get a remote object or a list of remote objects from the object store.
@@ -1450,8 +2108,6 @@ def get(object_ids, worker=global_worker):
   """
   check_connected(worker)
   with log_span("ray:get", worker=worker):
-    check_main_thread()
-
     if worker.mode == PYTHON_MODE:
       # In PYTHON_MODE, ray.get is the identity operation (the input will actually be a value not an objectid)
       return object_ids
@@ -1480,14 +2136,16 @@ def put(value, worker=global_worker):
   """
   check_connected(worker)
   with log_span("ray:put", worker=worker):
-    check_main_thread()
-
     if worker.mode == PYTHON_MODE:
       # In PYTHON_MODE, ray.put is the identity operation
       return value
-    object_id = photon.compute_put_id(worker.current_task_id, worker.put_index)
+    context = worker.thread_context()
+    object_id = photon.compute_put_id(context.task_id, context.put_index)
+    context.put_index += 1
     worker.put_object(object_id, value)
-    worker.put_index += 1
+    if worker.reference_counter is not None:
+      object_id = worker.reference_counter.track([object_id])[0]
+      worker.reference_counter.flush()
     return object_id
 
 def wait(object_ids, num_returns=1, timeout=None, worker=global_worker):
@@ -1513,52 +2171,146 @@ def wait(object_ids, num_returns=1, timeout=None, worker=global_worker):
     A list of object IDs that are ready and a list of the remaining object IDs.
   """
   check_connected(worker)
+  if worker.mode == PYTHON_MODE:
+    # In PYTHON_MODE, the object IDs are the values and are all ready.
+    return object_ids[:num_returns], object_ids[num_returns:]
   with log_span("ray:wait", worker=worker):
-    check_main_thread()
     object_id_strs = [object_id.id() for object_id in object_ids]
     timeout = timeout if timeout is not None else 2 ** 30
     ready_ids, remaining_ids = worker.plasma_client.wait(object_id_strs, timeout, num_returns)
-    ready_ids = [photon.ObjectID(object_id) for object_id in ready_ids]
-    remaining_ids = [photon.ObjectID(object_id) for object_id in remaining_ids]
+    # Return the object IDs that were passed in rather than new ones, which
+    # would not be tracked if reference counting is enabled.
+    object_ids_by_str = dict(zip(object_id_strs, object_ids))
+    ready_ids = [object_ids_by_str[object_id] for object_id in ready_ids]
+    remaining_ids = [object_ids_by_str[object_id] for object_id in remaining_ids]
     return ready_ids, remaining_ids
 
-def wait_for_valid_import_counter(function_id, driver_id, timeout=5, worker=global_worker):
-  """Wait until this worker has imported enough to execute the function.
+def as_completed(object_ids, batch_size=1, fetch_values=False, worker=global_worker):
+  """Yield object IDs in the order in which the objects become ready.
 
-  This method will simply loop until the import thread has imported enough of
-  the exports to execute the function. If we spend too long in this loop, that
-  may indicate a problem somewhere and we will push an error message to the
-  user.
+  This is a more efficient replacement for repeatedly calling
+  'ready_ids, object_ids = ray.wait(object_ids)'. The object IDs are only sent
+  to the object store once, in a single request that also finds the objects
+  that are already ready, as in ray.wait. After that, each object is reported
+  as soon as it is sealed in the local object store.
+
+  Args:
+    object_ids (List[ObjectID]): List of object IDs for objects that may or may
+      not be ready. Note that these IDs must be unique.
+    batch_size (int): The maximum number of object IDs to yield at once. All of
+      the object IDs that are ready when the generator resumes are yielded,
+      up to this many.
+    fetch_values (bool): If this is True, yield the values of the objects
+      instead of their IDs.
+
+  Yields:
+    A list of between 1 and batch_size object IDs that are ready, or a list of
+      their values if fetch_values is True.
+  """
+  check_connected(worker)
+  if batch_size < 1:
+    raise ValueError("The batch size must be positive, got {}.".format(batch_size))
+  if worker.mode == PYTHON_MODE:
+    # In PYTHON_MODE, the object IDs are the values and are all ready.
+    for i in range(0, len(object_ids), batch_size):
+      yield object_ids[i:i + batch_size]
+    return
+  object_id_strs = [object_id.id() for object_id in object_ids]
+  if len(object_id_strs) != len(set(object_id_strs)):
+    raise Exception("as_completed requires a list of unique object IDs.")
+
+  # Subscribe to seal notifications before checking which objects are already
+  # present so that no object is missed.
+  notification_client = plasma.PlasmaClient(
+      worker.plasma_client.store_socket_name)
+  notification_client.subscribe()
+  try:
+    # Find the objects that are already ready with a single request.
+    ready_id_strs, _ = worker.plasma_client.wait(object_id_strs, timeout=0,
+                                                 num_returns=len(object_id_strs))
+    ready_id_strs = set(ready_id_strs)
+    ready_ids = collections.deque()
+    pending_ids = {}
+    for object_id_str, object_id in zip(object_id_strs, object_ids):
+      if object_id_str in ready_id_strs:
+        ready_ids.append(object_id)
+      else:
+        pending_ids[object_id_str] = object_id
+    if len(pending_ids) > 0:
+      worker.plasma_client.fetch(list(pending_ids.keys()))
+    # The pending object IDs in the order in which they are fetched again.
+    refetch_queue = collections.deque(pending_ids.keys())
+
+    while len(ready_ids) > 0 or len(pending_ids) > 0:
+      if len(ready_ids) == 0:
+        # Block until at least one notification arrives. If none arrives in
+        # time, ask the plasma manager to fetch the next chunk of the remaining
+        # objects again, so that each retry sends a bounded number of IDs.
+        readable, _, _ = select.select([notification_client.notification_fd],
+                                       [], [], GET_TIMEOUT_MILLISECONDS / 1000)
+        if len(readable) == 0:
+          refetch_ids = []
+          for _ in range(len(refetch_queue)):
+            if len(refetch_ids) == AS_COMPLETED_REFETCH_SIZE:
+              break
+            # IDs of objects that have become ready are dropped from the queue.
+            object_id_str = refetch_queue.popleft()
+            if object_id_str in pending_ids:
+              refetch_ids.append(object_id_str)
+              refetch_queue.append(object_id_str)
+          if len(refetch_ids) > 0:
+            worker.plasma_client.fetch(refetch_ids)
+          continue
+      # Process all of the notifications that have arrived so far without
+      # blocking.
+      while (len(pending_ids) > 0 and
+             len(select.select([notification_client.notification_fd],
+                               [], [], 0)[0]) > 0):
+        object_id, data_size, _ = notification_client.get_next_notification()
+        # A data size of -1 indicates that the object was deleted.
+        if data_size != -1 and object_id in pending_ids:
+          ready_ids.append(pending_ids.pop(object_id))
+      batch = [ready_ids.popleft()
+               for _ in range(min(batch_size, len(ready_ids)))]
+      yield get(batch, worker=worker) if fetch_values else batch
+  finally:
+    notification_client.shutdown()
+
+def wait_for_function(function_id, driver_id, timeout=5, worker=global_worker):
+  """Wait until this worker has imported the function it was asked to execute.
+
+  This method blocks on worker.import_condition until the import thread has
+  imported the function. Exports are imported in the order in which they were
+  exported, so everything that was exported before the function has been
+  imported by then as well. If we spend too long waiting, that may indicate a
+  problem somewhere and we will push an error message to the user.
 
   If this worker is an actor, then this will wait until the actor has been
   defined.
 
   Args:
-    is_actor (bool): True if this worker is an actor, and false otherwise.
     function_id (str): The ID of the function that we want to execute.
     driver_id (str): The ID of the driver to push the error message to if this
       times out.
+    timeout (float): The number of seconds to wait before pushing a warning.
   """
+  def is_imported():
+    if worker.actor_id == NIL_ACTOR_ID:
+      return function_id.id() in worker.functions
+    return worker.actor_id in worker.actors
+
   start_time = time.time()
   # Only send the warning once.
   warning_sent = False
-  num_warnings_sent = 0
-  while True:
-    with worker.lock:
-      if worker.actor_id == NIL_ACTOR_ID and function_id.id() in worker.functions and (worker.function_export_counters[function_id.id()] <= worker.worker_import_counter):
-        break
-      elif worker.actor_id != NIL_ACTOR_ID and worker.actor_id in worker.actors:
-        break
-      if time.time() - start_time > timeout * (num_warnings_sent + 1):
-        if function_id.id() not in worker.functions:
-          warning_message = "This worker was asked to execute a function that it does not have registered. You may have to restart Ray."
-        else:
-          warning_message = "This worker's import counter is too small."
-        if not warning_sent:
-          worker.push_error_to_driver(driver_id, "import_counter",
-                                      warning_message)
+  with worker.import_condition:
+    while not is_imported():
+      worker.import_condition.wait(timeout)
+      if (not warning_sent and not is_imported() and
+          time.time() - start_time > timeout):
+        warning_message = "This worker was asked to execute a function that it does not have registered. You may have to restart Ray."
+        worker.push_error_to_driver(driver_id, "import_counter",
+                                    warning_message)
         warning_sent = True
-    time.sleep(0.001)
 
 def format_error_message(exception_message, task_exception=False):
   """Improve the formatting of an exception thrown by a remote function.
@@ -1581,6 +2333,20 @@ def format_error_message(exception_message, task_exception=False):
     lines = lines[0:1] + lines[5:]
   return "\n".join(lines)
 
+def prefetch_arguments(task, worker=global_worker):
+  """Ask the plasma manager to start fetching the object arguments of a task.
+
+  This does not block. The arguments are retrieved later by
+  get_arguments_for_execution.
+
+  Args:
+    task: The task whose arguments should be fetched.
+  """
+  object_ids = [arg.id() for arg in task.arguments()
+                if isinstance(arg, photon.ObjectID)]
+  if len(object_ids) > 0:
+    worker.plasma_client.fetch(list(set(object_ids)))
+
 def main_loop(worker=global_worker):
   """The main loop a worker runs to receive and execute tasks.
 
@@ -1616,22 +2382,33 @@ def main_loop(worker=global_worker):
       return_object_ids = task.returns()
       function_name = worker.function_names[function_id.id()]
 
-      # Get task arguments from the object store.
-      with log_span("ray:task:get_arguments", worker=worker):
-        arguments = get_arguments_for_execution(worker.functions[function_id.id()], args, worker)
-
-      # Execute the task.
-      with log_span("ray:task:execute", worker=worker):
-        if task.actor_id().id() == NIL_ACTOR_ID:
-          outputs = worker.functions[task.function_id().id()].executor(arguments)
-        else:
-          outputs = worker.functions[task.function_id().id()](worker.actors[task.actor_id().id()], *arguments)
-
-      # Store the outputs in the local object store.
-      with log_span("ray:task:store_outputs", worker=worker):
-        if len(return_object_ids) == 1:
-          outputs = (outputs,)
-        store_outputs_in_objstore(return_object_ids, outputs, worker)
+      # If the function was defined with profile=True, profile all of the
+      # phases of the task.
+      profile = getattr(worker.functions[function_id.id()], "profile", False)
+      with worker.profiler.profile(function_id.id(), profile):
+        # Get task arguments from the object store.
+        with log_span("ray:task:get_arguments", worker=worker), \
+             worker.task_stats.time(function_id.id(), "get_arguments"):
+          arguments = get_arguments_for_execution(worker.functions[function_id.id()], args, worker)
+
+        # Execute the task.
+        with log_span("ray:task:execute", worker=worker), \
+             worker.task_stats.time(function_id.id(), "execute"):
+          if task.actor_id().id() == NIL_ACTOR_ID:
+            outputs = worker.functions[task.function_id().id()].executor(arguments)
+            if getattr(worker.functions[task.function_id().id()], "streaming", False):
+              # Store each value as soon as it is yielded. The task itself
+              # returns the number of values.
+              outputs = store_streaming_outputs(task.task_id(), outputs, worker)
+          else:
+            outputs = worker.functions[task.function_id().id()](worker.actors[task.actor_id().id()], *arguments)
+
+        # Store the outputs in the local object store.
+        with log_span("ray:task:store_outputs", worker=worker), \
+             worker.task_stats.time(function_id.id(), "store_outputs"):
+          if len(return_object_ids) == 1:
+            outputs = (outputs,)
+          store_outputs_in_objstore(return_object_ids, outputs, worker)
     except Exception as e:
       # We determine whether the exception was caused by the call to
       # get_arguments_for_execution or by the execution of the remote function
@@ -1659,6 +2436,9 @@ def main_loop(worker=global_worker):
                                   str(failure_object),
                                   data={"function_id": function_id.id(),
                                         "function_name": function_name})
+    if worker.reference_counter is not None:
+      # The task no longer needs its arguments.
+      worker.reference_counter.release_task_arguments(task.task_id())
     try:
       # Reinitialize the values of environment variables that were used in the
       # task above so that changes made to their state do not affect other tasks.
@@ -1677,14 +2457,23 @@ def main_loop(worker=global_worker):
   check_main_thread()
   while True:
     with log_span("ray:get_task", worker=worker):
-      task = worker.photon_client.get_task()
+      # Other threads may send messages to the local scheduler at the same
+      # time, so the request is sent under the lock. Only this thread reads
+      # from the connection, so the lock is not held while waiting for a task.
+      with worker.photon_lock:
+        worker.photon_client.request_task()
+      task = worker.photon_client.receive_task()
+
+    # Start fetching the arguments that were passed by object ID right away so
+    # that any transfers overlap with waiting for imports and for the lock.
+    prefetch_arguments(task, worker=worker)
 
     function_id = task.function_id()
-    # Check that the number of imports we have is at least as great as the
-    # export counter for the task. If not, wait until we have imported enough.
-    # We will push warnings to the user if we spend too long in this loop.
-    with log_span("ray:wait_for_import_counter", worker=worker):
-      wait_for_valid_import_counter(function_id, task.driver_id().id(), worker=worker)
+    # Wait until the function (or actor) has been imported. We will push
+    # warnings to the user if we spend too long waiting.
+    with log_span("ray:wait_for_function", worker=worker), \
+         worker.task_stats.time(function_id.id(), "wait_for_function"):
+      wait_for_function(function_id, task.driver_id().id(), worker=worker)
 
     # Execute the task.
     # TODO(rkn): Consider acquiring this lock with a timeout and pushing a
@@ -1703,6 +2492,10 @@ def main_loop(worker=global_worker):
     # Push all of the log events to the global state store.
     flush_log()
 
+    # Report the object cache statistics if the cache is enabled.
+    if worker.object_cache is not None:
+      worker.object_cache.publish_stats(worker)
+
 def _submit_task(function_id, func_name, args, num_cpus, num_gpus, worker=global_worker):
   """This is a wrapper around worker.submit_task.
 
@@ -1713,6 +2506,27 @@ def _submit_task(function_id, func_name, args, num_cpus, num_gpus, worker=global
   """
   return worker.submit_task(function_id, func_name, args, num_cpus, num_gpus)
 
+def _submit_task_batch(function_id, func_name, args_list, num_cpus, num_gpus, worker=global_worker):
+  """This is a wrapper around worker.submit_task_batch.
+
+  See _submit_task for why this wrapper is needed.
+  """
+  return worker.submit_task_batch(function_id, func_name, args_list, num_cpus, num_gpus)
+
+def _submit_streaming_task(function_id, func_name, args, num_cpus, num_gpus, worker=global_worker):
+  """This is a wrapper around worker.submit_streaming_task.
+
+  See _submit_task for why this wrapper is needed.
+  """
+  return worker.submit_streaming_task(function_id, func_name, args, num_cpus, num_gpus)
+
+def _submit_cached_task_batch(function_id, func_name, args_list, num_cpus, num_gpus, worker=global_worker):
+  """This is a wrapper around worker.submit_cached_task_batch.
+
+  See _submit_task for why this wrapper is needed.
+  """
+  return worker.submit_cached_task_batch(function_id, func_name, args_list, num_cpus, num_gpus)
+
 def _mode(worker=global_worker):
   """This is a wrapper around worker.mode.
 
@@ -1753,23 +2567,31 @@ def _export_environment_variable(name, environment_variable, worker=global_worke
   worker.redis_client.rpush("Exports", key)
   worker.driver_export_counter += 1
 
-def export_remote_function(function_id, func_name, func, num_return_vals, num_cpus, num_gpus, worker=global_worker):
+def export_remote_function(function_id, func_name, func, num_return_vals, num_cpus, num_gpus, profile, worker=global_worker):
   check_main_thread()
   if _mode(worker) not in [SCRIPT_MODE, SILENT_MODE]:
     raise Exception("export_remote_function can only be called on a driver.")
   key = "RemoteFunction:{}".format(function_id.id())
   worker.num_return_vals[function_id.id()] = num_return_vals
   pickled_func = pickling.dumps(func)
-  worker.redis_client.hmset(key, {"driver_id": worker.task_driver_id.id(),
-                                  "function_id": function_id.id(),
-                                  "name": func_name,
-                                  "module": func.__module__,
-                                  "function": pickled_func,
-                                  "num_return_vals": num_return_vals,
-                                  "function_export_counter": worker.driver_export_counter,
-                                  "num_cpus": num_cpus,
-                                  "num_gpus": num_gpus})
-  worker.redis_client.rpush("Exports", key)
+  function_hash = hashlib.sha1(pickled_func).digest()
+  worker.function_hashes[function_id.id()] = function_hash
+  pipeline = worker.redis_client.pipeline(transaction=False)
+  # The pickled function is stored once, no matter how many drivers export it.
+  pipeline.set(FUNCTION_BLOB_PREFIX + function_hash,
+               encode_function_blob(pickled_func), nx=True)
+  pipeline.hmset(key, {"driver_id": worker.task_driver_id.id(),
+                       "function_id": function_id.id(),
+                       "name": func_name,
+                       "module": func.__module__,
+                       "function_hash": function_hash,
+                       "num_return_vals": num_return_vals,
+                       "function_export_counter": worker.driver_export_counter,
+                       "num_cpus": num_cpus,
+                       "num_gpus": num_gpus,
+                       "profile": int(profile)})
+  pipeline.rpush("Exports", key)
+  pipeline.execute()
   worker.driver_export_counter += 1
 
 def remote(*args, **kwargs):
@@ -1778,40 +2600,95 @@ def remote(*args, **kwargs):
   Args:
     num_return_vals (int): The number of object IDs that a call to this function
       should return.
+    num_cpus (int): The number of CPUs needed to execute this function.
+    num_gpus (int): The number of GPUs needed to execute this function.
+    profile (bool): True if the tasks of this function should be profiled. The
+      profile can be retrieved with ray.experimental.profile_stats.
+    cache (bool): True if calls to this function from the driver should reuse
+      the results of earlier calls with the same arguments instead of
+      submitting a new task. The function should be deterministic.
   """
   worker = global_worker
-  def make_remote_decorator(num_return_vals, num_cpus, num_gpus, func_id=None):
+  def make_remote_decorator(num_return_vals, num_cpus, num_gpus, profile, cache, func_id=None):
     def remote_decorator(func):
       func_name = "{}.{}".format(func.__module__, func.__name__)
+      # Remote functions that yield values return a stream of object IDs.
+      streaming = inspect.isgeneratorfunction(func)
+      if streaming and (num_return_vals != 1 or cache):
+        raise Exception("The remote function {} yields values, so it cannot "
+                        "be defined with num_return_vals or cache."
+                        .format(func_name))
       if func_id is None:
         function_id = FunctionID((hashlib.sha256(func_name.encode("ascii")).digest())[:20])
       else:
         function_id = func_id
 
-      def func_call(*args, **kwargs):
-        """This gets run immediately when a worker calls a remote function."""
-        check_connected()
-        check_main_thread()
+      def complete_args(args, kwargs):
+        """Fill in keyword and default arguments for a call to the function."""
         args = list(args)
         args.extend([kwargs[keyword] if keyword in kwargs else default for keyword, default in keyword_defaults[len(args):]]) # fill in the remaining arguments
         if any([arg is funcsigs._empty for arg in args]):
           raise Exception("Not enough arguments were provided to {}.".format(func_name))
+        return args
+      def run_locally(args):
+        """Execute the function on the driver in PYTHON_MODE."""
+        # In PYTHON_MODE, remote calls simply execute the function. We copy the
+        # arguments to prevent the function call from mutating them and to match
+        # the usual behavior of immutable remote objects.
+        try:
+          _env()._running_remote_function_locally = True
+          result = func(*copy.deepcopy(args))
+          if streaming:
+            # Run the generator to completion here so that it runs with the
+            # environment variables of this call.
+            result = iter(list(result))
+        finally:
+          _env()._reinitialize()
+          _env()._running_remote_function_locally = False
+        return result
+      def func_call(*args, **kwargs):
+        """This gets run immediately when a worker calls a remote function."""
+        check_connected()
+        args = complete_args(args, kwargs)
         if _mode() == PYTHON_MODE:
-          # In PYTHON_MODE, remote calls simply execute the function. We copy the
-          # arguments to prevent the function call from mutating them and to match
-          # the usual behavior of immutable remote objects.
-          try:
-            _env()._running_remote_function_locally = True
-            result = func(*copy.deepcopy(args))
-          finally:
-            _env()._reinitialize()
-            _env()._running_remote_function_locally = False
-          return result
-        objectids = _submit_task(function_id, func_name, args, num_cpus, num_gpus)
+          return run_locally(args)
+        if streaming:
+          return _submit_streaming_task(function_id, func_name, args, num_cpus, num_gpus)
+        if cache:
+          objectids = _submit_cached_task_batch(function_id, func_name, [args], num_cpus, num_gpus)[0]
+        else:
+          objectids = _submit_task(function_id, func_name, args, num_cpus, num_gpus)
         if len(objectids) == 1:
           return objectids[0]
         elif len(objectids) > 1:
           return objectids
+      def func_batch_call(args_list):
+        """This gets run when a worker calls a remote function many times.
+
+        Args:
+          args_list: A list of argument tuples, one for each task to submit.
+
+        Returns:
+          A list with the value that func_call would have returned for each
+            element of args_list.
+        """
+        check_connected()
+        args_list = [complete_args(args, {}) for args in args_list]
+        if _mode() == PYTHON_MODE:
+          return [run_locally(args) for args in args_list]
+        if streaming:
+          return [_submit_streaming_task(function_id, func_name, args, num_cpus, num_gpus)
+                  for args in args_list]
+        submit = _submit_cached_task_batch if cache else _submit_task_batch
+        results = []
+        for objectids in submit(function_id, func_name, args_list, num_cpus, num_gpus):
+          if len(objectids) == 1:
+            results.append(objectids[0])
+          elif len(objectids) > 1:
+            results.append(objectids)
+          else:
+            results.append(None)
+        return results
       def func_executor(arguments):
         """This gets run when the remote function is executed."""
         start_time = time.time()
@@ -1822,8 +2699,13 @@ def remote(*args, **kwargs):
         """This is returned by the decorator and used to invoke the function."""
         raise Exception("Remote functions cannot be called directly. Instead of running '{}()', try '{}.remote()'.".format(func_name, func_name))
       func_invoker.remote = func_call
+      func_invoker.remote_batch = func_batch_call
       func_invoker.executor = func_executor
       func_invoker.is_remote = True
+      func_invoker.function_id = function_id
+      func_invoker.profile = profile
+      func_invoker.cache = cache
+      func_invoker.streaming = streaming
       func_name = "{}.{}".format(func.__module__, func.__name__)
       func_invoker.func_name = func_name
       if sys.version_info >= (3, 0):
@@ -1851,9 +2733,9 @@ def remote(*args, **kwargs):
           if func_name_global_valid: func.__globals__[func.__name__] = func_name_global_value
           else: del func.__globals__[func.__name__]
       if worker.mode in [SCRIPT_MODE, SILENT_MODE]:
-        export_remote_function(function_id, func_name, func, num_return_vals, num_cpus, num_gpus)
+        export_remote_function(function_id, func_name, func, num_return_vals, num_cpus, num_gpus, profile)
       elif worker.mode is None:
-        worker.cached_remote_functions.append((function_id, func_name, func, num_return_vals, num_cpus, num_gpus))
+        worker.cached_remote_functions.append((function_id, func_name, func, num_return_vals, num_cpus, num_gpus, profile))
       return func_invoker
 
     return remote_decorator
@@ -1861,28 +2743,32 @@ def remote(*args, **kwargs):
   num_return_vals = kwargs["num_return_vals"] if "num_return_vals" in kwargs.keys() else 1
   num_cpus = kwargs["num_cpus"] if "num_cpus" in kwargs.keys() else 1
   num_gpus = kwargs["num_gpus"] if "num_gpus" in kwargs.keys() else 0
+  profile = kwargs["profile"] if "profile" in kwargs.keys() else False
+  cache = kwargs["cache"] if "cache" in kwargs.keys() else False
 
   if _mode() == WORKER_MODE:
     if "function_id" in kwargs:
       function_id = kwargs["function_id"]
-      return make_remote_decorator(num_return_vals, num_cpus, num_gpus, function_id)
+      return make_remote_decorator(num_return_vals, num_cpus, num_gpus, profile, cache, function_id)
 
   if len(args) == 1 and len(kwargs) == 0 and callable(args[0]):
     # This is the case where the decorator is just @ray.remote.
-    return make_remote_decorator(num_return_vals, num_cpus, num_gpus)(args[0])
+    return make_remote_decorator(num_return_vals, num_cpus, num_gpus, profile, cache)(args[0])
   else:
     # This is the case where the decorator is something like
     # @ray.remote(num_return_vals=2).
     error_string = ("The @ray.remote decorator must be applied either with no "
                     "arguments and no parentheses, for example '@ray.remote', "
                     "or it must be applied using some of the arguments "
-                    "'num_return_vals', 'num_cpus', or 'num_gpus', like "
-                    "'@ray.remote(num_return_vals=2)'.")
+                    "'num_return_vals', 'num_cpus', 'num_gpus', 'profile', or "
+                    "'cache', like '@ray.remote(num_return_vals=2)'.")
     assert len(args) == 0 and ("num_return_vals" in kwargs or
                                "num_cpus" in kwargs or
-                               "num_gpus" in kwargs), error_string
+                               "num_gpus" in kwargs or
+                               "profile" in kwargs or
+                               "cache" in kwargs), error_string
     assert not "function_id" in kwargs
-    return make_remote_decorator(num_return_vals, num_cpus, num_gpus)
+    return make_remote_decorator(num_return_vals, num_cpus, num_gpus, profile, cache)
 
 def check_signature_supported(has_kwargs_param, has_vararg_param, keyword_defaults, name):
   """Check if we support the signature of this function.
@@ -1913,7 +2799,8 @@ def get_arguments_for_execution(function, serialized_args, worker=global_worker)
   """Retrieve the arguments for the remote function.
 
   This retrieves the values for the arguments to the remote function that were
-  passed in as object IDs. Argumens that were passed by value are not changed.
+  passed in as object IDs and deserializes the arguments that were inlined into
+  the task spec. Other arguments that were passed by value are not changed.
   This is called by the worker that is executing the remote function.
 
   Args:
@@ -1931,22 +2818,58 @@ def get_arguments_for_execution(function, serialized_args, worker=global_worker)
     RayGetArgumentError: This exception is raised if a task that created one of
       the arguments failed.
   """
-  arguments = []
+  arguments = list(serialized_args)
   for (i, arg) in enumerate(serialized_args):
-    if isinstance(arg, photon.ObjectID):
-      # get the object from the local object store
-      argument = worker.get_object([arg])[0]
-      if isinstance(argument, RayTaskError):
-        # If the result is a RayTaskError, then the task that created this
-        # object failed, and we should propagate the error message here.
-        raise RayGetArgumentError(function.__name__, i, arg, argument)
-    else:
-      # pass the argument by value
-      argument = arg
-
-    arguments.append(argument)
+    if isinstance(arg, InlinedArgument):
+      arguments[i] = arg.deserialize()
+  # Get all of the arguments that were passed by object ID from the local
+  # object store in a single call. The same object ID may be passed more than
+  # once, so we only get each distinct object once.
+  object_ids = []
+  object_id_indices = {}
+  for arg in serialized_args:
+    if isinstance(arg, photon.ObjectID) and arg.id() not in object_id_indices:
+      object_id_indices[arg.id()] = len(object_ids)
+      object_ids.append(arg)
+  if len(object_ids) > 0:
+    values = worker.get_object(object_ids)
+    for (i, arg) in enumerate(serialized_args):
+      if isinstance(arg, photon.ObjectID):
+        argument = values[object_id_indices[arg.id()]]
+        if isinstance(argument, RayTaskError):
+          # If the result is a RayTaskError, then the task that created this
+          # object failed, and we should propagate the error message here.
+          raise RayGetArgumentError(function.__name__, i, arg, argument)
+        arguments[i] = argument
   return arguments
 
+def store_streaming_outputs(task_id, values, worker=global_worker):
+  """Store the values yielded by a remote function in the local object store.
+
+  Each value is stored as soon as it is yielded, under the object ID that the
+  ObjectIDStream of the task expects. The local scheduler only adds result
+  table entries for the declared return values of a task, so the entry that
+  maps each value to this task is added here, before the value is stored. This
+  lets the local scheduler reconstruct values that are evicted or lost.
+
+  Args:
+    task_id: The ID of the task that yields the values.
+    values: The generator returned by the remote function.
+
+  Returns:
+    The number of values that were yielded.
+  """
+  num_values = 0
+  for value in values:
+    if isinstance(value, photon.ObjectID):
+      raise Exception("This remote function yielded an ObjectID as its {}th value. This is not allowed.".format(num_values))
+    object_id = photon.compute_return_id(task_id, num_values + 1)
+    worker.redis_client.execute_command("RAY.RESULT_TABLE_ADD", object_id.id(),
+                                        task_id.id())
+    worker.put_object(object_id, value)
+    num_values += 1
+  return num_values
+
 def store_outputs_in_objstore(objectids, outputs, worker=global_worker):
   """Store the outputs of a remote function in the local object store.
 
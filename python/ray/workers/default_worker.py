@@ -22,8 +22,14 @@ parser.add_argument("--actor-id", required=False, type=str, help="the actor ID o
 def random_string():
   return np.random.bytes(20)
 
-if __name__ == "__main__":
-  args = parser.parse_args()
+def main(argv=None):
+  """Connect to Ray and execute tasks until the worker is killed.
+
+  Args:
+    argv (List[str]): The command line options of the worker. If this is None,
+      they are taken from sys.argv.
+  """
+  args = parser.parse_args(argv)
   info = {"node_ip_address": args.node_ip_address,
           "redis_address": args.redis_address,
           "store_socket_name": args.object_store_name,
@@ -69,3 +75,6 @@ being caught in "lib/python/ray/workers/default_worker.py".
     # After putting the error message in Redis, this worker will attempt to
     # reenter the main loop. TODO(rkn): We should probably reset it's state and
     # call connect again.
+
+if __name__ == "__main__":
+  main()
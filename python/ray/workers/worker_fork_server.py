@@ -0,0 +1,149 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import errno
+import os
+import random
+import signal
+import socket
+import struct
+
+import numpy as np
+
+# Import everything that a worker needs before forking so that the forked
+# workers do not have to.
+import ray
+import ray.workers.default_worker as default_worker
+
+parser = argparse.ArgumentParser(description="Fork new workers on request.")
+parser.add_argument("--socket-name", required=True, type=str, help="the socket to listen on for requests")
+
+# Requests start with their type. Requests to start a worker continue with the
+# length of the message followed by the null separated command line options of
+# the worker, and the reply is the process ID of the worker. Requests to kill a
+# worker continue with the process ID of the worker, and the reply is sent once
+# the worker has exited. This must be kept in sync with photon_scheduler.c.
+LENGTH = struct.Struct("=q")
+START_WORKER = 0
+KILL_WORKER = 1
+
+# The process IDs of the workers that have not been reaped yet. Only these are
+# killed on request, so that a process that reused the ID of a worker which
+# already exited is never killed.
+children = set()
+
+def receive_exactly(conn, length):
+  data = b""
+  while len(data) < length:
+    chunk = conn.recv(length - len(data))
+    if len(chunk) == 0:
+      raise IOError("The connection was closed.")
+    data += chunk
+  return data
+
+def reap_children(signum, frame):
+  """Wait for any workers that have exited so that they do not linger."""
+  try:
+    while True:
+      pid, _ = os.waitpid(-1, os.WNOHANG)
+      if pid == 0:
+        break
+      children.discard(pid)
+  except OSError:
+    # There are no more children.
+    pass
+
+def set_sigchld_blocked(blocked):
+  """Block or unblock SIGCHLD, which keeps reap_children from running.
+
+  Python 2 cannot block signals, so there this does nothing and a small window
+  remains in which a worker can be reaped unexpectedly.
+  """
+  if hasattr(signal, "pthread_sigmask"):
+    signal.pthread_sigmask(signal.SIG_BLOCK if blocked else signal.SIG_UNBLOCK,
+                           [signal.SIGCHLD])
+
+def kill_worker(pid):
+  """Kill a worker that this process forked and wait for it to exit."""
+  # The worker must not be reaped, which would let its process ID be reused,
+  # between checking that it is alive and killing it.
+  set_sigchld_blocked(True)
+  try:
+    if pid not in children:
+      return
+    os.kill(pid, signal.SIGKILL)
+    while True:
+      try:
+        os.waitpid(pid, 0)
+        break
+      except OSError as e:
+        if e.errno != errno.EINTR:
+          # The worker was already reaped by reap_children.
+          break
+    children.discard(pid)
+  finally:
+    set_sigchld_blocked(False)
+
+def run_worker(worker_args):
+  """Run a worker in a process that was just forked from the fork server."""
+  signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+  set_sigchld_blocked(False)
+  # The worker and object IDs are generated randomly, so each worker must not
+  # share the state of the random number generators with the fork server.
+  np.random.seed()
+  random.seed()
+  try:
+    default_worker.main(worker_args)
+  finally:
+    os._exit(1)
+
+def serve(sock):
+  """Fork a worker for each request that arrives on the socket."""
+  while True:
+    try:
+      conn, _ = sock.accept()
+    except socket.error as e:
+      # Python 2 does not retry system calls that are interrupted by SIGCHLD.
+      if e.args[0] == errno.EINTR:
+        continue
+      raise
+    try:
+      request_type, = LENGTH.unpack(receive_exactly(conn, LENGTH.size))
+      if request_type == KILL_WORKER:
+        pid, = LENGTH.unpack(receive_exactly(conn, LENGTH.size))
+        kill_worker(pid)
+        conn.sendall(LENGTH.pack(pid))
+        conn.close()
+        continue
+      length, = LENGTH.unpack(receive_exactly(conn, LENGTH.size))
+      worker_args = receive_exactly(conn, length).decode("ascii").split("\0")
+    except IOError:
+      conn.close()
+      continue
+    # Record the worker before it can exit and be reaped.
+    set_sigchld_blocked(True)
+    pid = os.fork()
+    if pid == 0:
+      sock.close()
+      conn.close()
+      run_worker(worker_args)
+    children.add(pid)
+    set_sigchld_blocked(False)
+    try:
+      conn.sendall(LENGTH.pack(pid))
+    except IOError:
+      # The local scheduler will fall back to starting the worker itself, so
+      # kill this one.
+      kill_worker(pid)
+    finally:
+      conn.close()
+
+if __name__ == "__main__":
+  args = parser.parse_args()
+  signal.signal(signal.SIGCHLD, reap_children)
+  sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+  sock.bind(args.socket_name)
+  sock.listen(128)
+  serve(sock)
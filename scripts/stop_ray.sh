@@ -8,6 +8,10 @@ kill $(ps aux | grep redis-server | awk '{ print $2 }') 2> /dev/null
 # Find the PIDs of the worker processes and kill them.
 kill $(ps aux | grep default_worker.py | awk '{ print $2 }') 2> /dev/null
 
+# Find the PIDs of the worker fork servers and of the workers forked from them
+# and kill them.
+kill $(ps aux | grep worker_fork_server.py | awk '{ print $2 }') 2> /dev/null
+
 # Kill the processes related to the web UI.
 killall polymer
 
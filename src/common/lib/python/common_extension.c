@@ -239,7 +239,7 @@ PyTypeObject PyObjectIDType = {
     0,                                    /* tp_getattro */
     0,                                    /* tp_setattro */
     0,                                    /* tp_as_buffer */
-    Py_TPFLAGS_DEFAULT,                   /* tp_flags */
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /* tp_flags */
     "ObjectID object",                    /* tp_doc */
     0,                                    /* tp_traverse */
     0,                                    /* tp_clear */
@@ -577,3 +577,18 @@ PyObject *compute_put_id(PyObject *self, PyObject *args) {
   object_id put_id = task_compute_put_id(task_id, put_index);
   return PyObjectID_make(put_id);
 }
+
+PyObject *compute_return_id(PyObject *self, PyObject *args) {
+  int return_index;
+  task_id task_id;
+  if (!PyArg_ParseTuple(args, "O&i", &PyObjectToUniqueID, &task_id,
+                        &return_index)) {
+    return NULL;
+  }
+  if (return_index < 0) {
+    PyErr_SetString(PyExc_ValueError, "The return index must be nonnegative.");
+    return NULL;
+  }
+  object_id return_id = task_compute_return_id(task_id, return_index);
+  return PyObjectID_make(return_id);
+}
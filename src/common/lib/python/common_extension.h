@@ -46,6 +46,8 @@ PyObject *PyTask_from_string(PyObject *, PyObject *args);
 
 PyObject *compute_put_id(PyObject *self, PyObject *args);
 
+PyObject *compute_return_id(PyObject *self, PyObject *args);
+
 PyObject *PyTask_make(task_spec *task_spec);
 
 #endif /* COMMON_EXTENSION_H */
@@ -301,6 +301,16 @@ void task_spec_set_required_resource(task_spec *spec,
 double task_spec_get_required_resource(const task_spec *spec,
                                        int64_t resource_index);
 
+/**
+ * Compute the object id of a return value of a task.
+ *
+ * @param task_id The task id of the task.
+ * @param return_index The index of the return value. This must be
+ *        nonnegative.
+ * @return The object ID of the return value.
+ */
+object_id task_compute_return_id(task_id task_id, int64_t return_index);
+
 /**
  * Compute the object id associated to a put call.
  *
@@ -27,7 +27,15 @@ SequenceBuilder::SequenceBuilder(MemoryPool* pool)
       double_tensors_(std::make_shared<DoubleType>(), pool),
       list_offsets_({0}),
       tuple_offsets_({0}),
-      dict_offsets_({0}) {}
+      dict_offsets_({0}),
+      int_list_values_(pool, std::make_shared<Int64Type>()),
+      double_list_values_(pool, std::make_shared<DoubleType>()),
+      string_list_values_(pool, std::make_shared<StringType>()),
+      bytes_list_values_(pool, std::make_shared<BinaryType>()),
+      int_list_offsets_({0}),
+      double_list_offsets_({0}),
+      string_list_offsets_({0}),
+      bytes_list_offsets_({0}) {}
 
 #define UPDATE(OFFSET, TAG)               \
   if (TAG == -1) {                        \
@@ -115,6 +123,39 @@ Status SequenceBuilder::AppendDict(int32_t size) {
   return Status::OK();
 }
 
+Status SequenceBuilder::AppendInt64List(const int64_t* data, int32_t length) {
+  UPDATE(int_list_offsets_.size() - 1, int_list_tag);
+  int_list_offsets_.push_back(int_list_offsets_.back() + length);
+  return int_list_values_.Append(data, length);
+}
+
+Status SequenceBuilder::AppendDoubleList(const double* data, int32_t length) {
+  UPDATE(double_list_offsets_.size() - 1, double_list_tag);
+  double_list_offsets_.push_back(double_list_offsets_.back() + length);
+  return double_list_values_.Append(data, length);
+}
+
+Status SequenceBuilder::AppendStringList(
+    const std::vector<const char*>& data, const std::vector<int32_t>& lengths) {
+  UPDATE(string_list_offsets_.size() - 1, string_list_tag);
+  string_list_offsets_.push_back(string_list_offsets_.back() + data.size());
+  for (size_t i = 0; i < data.size(); ++i) {
+    RETURN_NOT_OK(string_list_values_.Append(data[i], lengths[i]));
+  }
+  return Status::OK();
+}
+
+Status SequenceBuilder::AppendBytesList(
+    const std::vector<const char*>& data, const std::vector<int32_t>& lengths) {
+  UPDATE(bytes_list_offsets_.size() - 1, bytes_list_tag);
+  bytes_list_offsets_.push_back(bytes_list_offsets_.back() + data.size());
+  for (size_t i = 0; i < data.size(); ++i) {
+    RETURN_NOT_OK(bytes_list_values_.Append(
+        reinterpret_cast<const uint8_t*>(data[i]), lengths[i]));
+  }
+  return Status::OK();
+}
+
 #define ADD_ELEMENT(VARNAME, TAG)                             \
   if (TAG != -1) {                                            \
     types[TAG] = std::make_shared<Field>("", VARNAME.type()); \
@@ -169,6 +210,27 @@ Status SequenceBuilder::Finish(std::shared_ptr<Array> list_data,
   ADD_SUBSEQUENCE(tuple_data, tuple_offsets_, tuple_builder, tuple_tag, "tuple");
   ADD_SUBSEQUENCE(dict_data, dict_offsets_, dict_builder, dict_tag, "dict");
 
+  std::shared_ptr<Array> int_list_data;
+  if (int_list_tag != -1) { RETURN_NOT_OK(int_list_values_.Finish(&int_list_data)); }
+  ADD_SUBSEQUENCE(
+      int_list_data, int_list_offsets_, int_list_builder, int_list_tag, "int_list");
+  std::shared_ptr<Array> double_list_data;
+  if (double_list_tag != -1) {
+    RETURN_NOT_OK(double_list_values_.Finish(&double_list_data));
+  }
+  ADD_SUBSEQUENCE(double_list_data, double_list_offsets_, double_list_builder,
+      double_list_tag, "double_list");
+  std::shared_ptr<Array> string_list_data;
+  if (string_list_tag != -1) {
+    RETURN_NOT_OK(string_list_values_.Finish(&string_list_data));
+  }
+  ADD_SUBSEQUENCE(string_list_data, string_list_offsets_, string_list_builder,
+      string_list_tag, "string_list");
+  std::shared_ptr<Array> bytes_list_data;
+  if (bytes_list_tag != -1) { RETURN_NOT_OK(bytes_list_values_.Finish(&bytes_list_data)); }
+  ADD_SUBSEQUENCE(bytes_list_data, bytes_list_offsets_, bytes_list_builder,
+      bytes_list_tag, "bytes_list");
+
   std::vector<uint8_t> type_ids = {};
   TypePtr type = TypePtr(new UnionType(types, type_ids, UnionMode::DENSE));
   out->reset(new UnionArray(type, types_.length(), children, types_.data(),
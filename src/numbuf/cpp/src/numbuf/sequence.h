@@ -78,6 +78,32 @@ class SequenceBuilder {
 
   arrow::Status AppendDict(int32_t size);
 
+  /*! Append a list whose elements all have the same primitive type. The
+      elements are stored contiguously in a single Arrow array instead of
+      one union entry each.
+
+      \param data
+        A pointer to the elements of the list
+
+      \param length
+        The number of elements of the list
+  */
+  arrow::Status AppendInt64List(const int64_t* data, int32_t length);
+  arrow::Status AppendDoubleList(const double* data, int32_t length);
+
+  /*! Append a list of strings or bytes objects.
+
+      \param data
+        The pointers to the data of the elements of the list
+
+      \param lengths
+        The lengths of the elements of the list
+  */
+  arrow::Status AppendStringList(
+      const std::vector<const char*>& data, const std::vector<int32_t>& lengths);
+  arrow::Status AppendBytesList(
+      const std::vector<const char*>& data, const std::vector<int32_t>& lengths);
+
   //! Finish building the sequence and return the result
   arrow::Status Finish(std::shared_ptr<arrow::Array> list_data,
       std::shared_ptr<arrow::Array> tuple_data, std::shared_ptr<arrow::Array> dict_data,
@@ -112,6 +138,16 @@ class SequenceBuilder {
   std::vector<int32_t> tuple_offsets_;
   std::vector<int32_t> dict_offsets_;
 
+  arrow::Int64Builder int_list_values_;
+  arrow::DoubleBuilder double_list_values_;
+  arrow::StringBuilder string_list_values_;
+  arrow::BinaryBuilder bytes_list_values_;
+
+  std::vector<int32_t> int_list_offsets_;
+  std::vector<int32_t> double_list_offsets_;
+  std::vector<int32_t> string_list_offsets_;
+  std::vector<int32_t> bytes_list_offsets_;
+
   int8_t bool_tag = -1;
   int8_t int_tag = -1;
   int8_t string_tag = -1;
@@ -134,6 +170,11 @@ class SequenceBuilder {
   int8_t tuple_tag = -1;
   int8_t dict_tag = -1;
 
+  int8_t int_list_tag = -1;
+  int8_t double_list_tag = -1;
+  int8_t string_list_tag = -1;
+  int8_t bytes_list_tag = -1;
+
   int8_t num_tags = 0;
 };
 
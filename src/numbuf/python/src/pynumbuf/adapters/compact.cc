@@ -0,0 +1,251 @@
+#include "compact.h"
+
+#include <string.h>
+
+using namespace arrow;
+
+namespace numbuf {
+
+#if PY_MAJOR_VERSION >= 3
+#define PyInt_FromLong PyLong_FromLong
+#endif
+
+int64_t COMPACT_MAX_SIZE = 1024;
+
+/* Containers nested deeper than this are serialized with Arrow. */
+static const int32_t COMPACT_MAX_DEPTH = 16;
+
+/* Every item of the encoding starts with one of these tags. Integers and
+ * floats are followed by their 8 bytes, bytes and strings by their 4-byte
+ * length and their data, and lists, tuples and dicts by their 4-byte number of
+ * elements and the elements (for dicts, alternating keys and values). */
+enum CompactTag : uint8_t {
+  COMPACT_NONE = 'N',
+  COMPACT_TRUE = 'T',
+  COMPACT_FALSE = 'F',
+  COMPACT_INT64 = 'i',
+  COMPACT_DOUBLE = 'd',
+  COMPACT_BYTES = 'b',
+  COMPACT_STRING = 's',
+  COMPACT_LIST = 'l',
+  COMPACT_TUPLE = 't',
+  COMPACT_DICT = 'D',
+};
+
+class CompactWriter {
+ public:
+  CompactWriter(int64_t max_size, std::vector<uint8_t>* out)
+      : max_size_(max_size), out_(out) {}
+
+  bool Append(PyObject* elem, int32_t depth) {
+    if (depth > COMPACT_MAX_DEPTH) { return false; }
+    // The bool case must precede the int case (PyInt_Check passes for bools)
+    if (PyBool_Check(elem)) {
+      return AppendTag(elem == Py_True ? COMPACT_TRUE : COMPACT_FALSE);
+    } else if (elem == Py_None) {
+      return AppendTag(COMPACT_NONE);
+    } else if (PyFloat_CheckExact(elem)) {
+      double data = PyFloat_AS_DOUBLE(elem);
+      return AppendTag(COMPACT_DOUBLE) && AppendRaw(&data, sizeof(data));
+    } else if (PyLong_CheckExact(elem)) {
+      int overflow = 0;
+      int64_t data = PyLong_AsLongLongAndOverflow(elem, &overflow);
+      if (overflow) { return false; }
+      return AppendTag(COMPACT_INT64) && AppendRaw(&data, sizeof(data));
+#if PY_MAJOR_VERSION < 3
+    } else if (PyInt_CheckExact(elem)) {
+      int64_t data = static_cast<int64_t>(PyInt_AS_LONG(elem));
+      return AppendTag(COMPACT_INT64) && AppendRaw(&data, sizeof(data));
+#endif
+    } else if (PyBytes_CheckExact(elem)) {
+      return AppendData(COMPACT_BYTES, PyBytes_AS_STRING(elem), PyBytes_GET_SIZE(elem));
+    } else if (PyUnicode_CheckExact(elem)) {
+#if PY_MAJOR_VERSION >= 3
+      Py_ssize_t size;
+      const char* data = PyUnicode_AsUTF8AndSize(elem, &size);
+      if (data == NULL) {
+        // Let the Arrow path report the error.
+        PyErr_Clear();
+        return false;
+      }
+      return AppendData(COMPACT_STRING, data, size);
+#else
+      PyObject* str = PyUnicode_AsUTF8String(elem);
+      if (str == NULL) {
+        PyErr_Clear();
+        return false;
+      }
+      bool ok =
+          AppendData(COMPACT_STRING, PyString_AS_STRING(str), PyString_GET_SIZE(str));
+      Py_DECREF(str);
+      return ok;
+#endif
+    } else if (PyList_CheckExact(elem)) {
+      Py_ssize_t size = PyList_GET_SIZE(elem);
+      if (!AppendContainer(COMPACT_LIST, size)) { return false; }
+      for (Py_ssize_t i = 0; i < size; ++i) {
+        if (!Append(PyList_GET_ITEM(elem, i), depth + 1)) { return false; }
+      }
+      return true;
+    } else if (PyTuple_CheckExact(elem)) {
+      Py_ssize_t size = PyTuple_GET_SIZE(elem);
+      if (!AppendContainer(COMPACT_TUPLE, size)) { return false; }
+      for (Py_ssize_t i = 0; i < size; ++i) {
+        if (!Append(PyTuple_GET_ITEM(elem, i), depth + 1)) { return false; }
+      }
+      return true;
+    } else if (PyDict_CheckExact(elem)) {
+      if (!AppendContainer(COMPACT_DICT, PyDict_Size(elem))) { return false; }
+      PyObject *key, *value;
+      Py_ssize_t pos = 0;
+      while (PyDict_Next(elem, &pos, &key, &value)) {
+        if (!Append(key, depth + 1) || !Append(value, depth + 1)) { return false; }
+      }
+      return true;
+    }
+    // Everything else, including NumPy arrays and scalars and objects that
+    // need the serialization callback, goes through Arrow.
+    return false;
+  }
+
+ private:
+  bool AppendRaw(const void* data, int64_t size) {
+    if (static_cast<int64_t>(out_->size()) + size > max_size_) { return false; }
+    const uint8_t* bytes = reinterpret_cast<const uint8_t*>(data);
+    out_->insert(out_->end(), bytes, bytes + size);
+    return true;
+  }
+
+  bool AppendTag(CompactTag tag) {
+    uint8_t data = tag;
+    return AppendRaw(&data, sizeof(data));
+  }
+
+  bool AppendContainer(CompactTag tag, Py_ssize_t size) {
+    if (size > max_size_) { return false; }
+    uint32_t length = static_cast<uint32_t>(size);
+    return AppendTag(tag) && AppendRaw(&length, sizeof(length));
+  }
+
+  bool AppendData(CompactTag tag, const char* data, Py_ssize_t size) {
+    return AppendContainer(tag, size) && AppendRaw(data, size);
+  }
+
+  int64_t max_size_;
+  std::vector<uint8_t>* out_;
+};
+
+bool SerializeCompact(PyObject* value, int64_t max_size, std::vector<uint8_t>* out) {
+  out->clear();
+  CompactWriter writer(max_size, out);
+  return writer.Append(value, 0);
+}
+
+class CompactReader {
+ public:
+  CompactReader(const uint8_t* data, int64_t size) : pos_(data), end_(data + size) {}
+
+  Status Read(PyObject** out) {
+    uint8_t tag;
+    RETURN_NOT_OK(ReadRaw(&tag, sizeof(tag)));
+    switch (tag) {
+      case COMPACT_NONE:
+        Py_INCREF(Py_None);
+        *out = Py_None;
+        return Status::OK();
+      case COMPACT_TRUE:
+        *out = PyBool_FromLong(1);
+        return Status::OK();
+      case COMPACT_FALSE:
+        *out = PyBool_FromLong(0);
+        return Status::OK();
+      case COMPACT_INT64: {
+        int64_t data;
+        RETURN_NOT_OK(ReadRaw(&data, sizeof(data)));
+        *out = PyInt_FromLong(data);
+        return Status::OK();
+      }
+      case COMPACT_DOUBLE: {
+        double data;
+        RETURN_NOT_OK(ReadRaw(&data, sizeof(data)));
+        *out = PyFloat_FromDouble(data);
+        return Status::OK();
+      }
+      case COMPACT_BYTES:
+      case COMPACT_STRING: {
+        uint32_t size;
+        RETURN_NOT_OK(ReadRaw(&size, sizeof(size)));
+        if (end_ - pos_ < size) { return Status::Invalid("compact object is truncated"); }
+        const char* data = reinterpret_cast<const char*>(pos_);
+        pos_ += size;
+        *out = tag == COMPACT_BYTES ? PyBytes_FromStringAndSize(data, size)
+                                    : PyUnicode_FromStringAndSize(data, size);
+        return Status::OK();
+      }
+      case COMPACT_LIST:
+      case COMPACT_TUPLE: {
+        uint32_t size;
+        RETURN_NOT_OK(ReadRaw(&size, sizeof(size)));
+        PyObject* result = tag == COMPACT_LIST ? PyList_New(size) : PyTuple_New(size);
+        for (uint32_t i = 0; i < size; ++i) {
+          PyObject* item;
+          Status s = Read(&item);
+          if (!s.ok()) {
+            Py_DECREF(result);
+            return s;
+          }
+          if (tag == COMPACT_LIST) {
+            PyList_SET_ITEM(result, i, item);
+          } else {
+            PyTuple_SET_ITEM(result, i, item);
+          }
+        }
+        *out = result;
+        return Status::OK();
+      }
+      case COMPACT_DICT: {
+        uint32_t size;
+        RETURN_NOT_OK(ReadRaw(&size, sizeof(size)));
+        PyObject* result = PyDict_New();
+        for (uint32_t i = 0; i < size; ++i) {
+          PyObject *key, *value;
+          Status s = Read(&key);
+          if (!s.ok()) {
+            Py_DECREF(result);
+            return s;
+          }
+          s = Read(&value);
+          if (!s.ok()) {
+            Py_DECREF(key);
+            Py_DECREF(result);
+            return s;
+          }
+          PyDict_SetItem(result, key, value);
+          Py_DECREF(key);
+          Py_DECREF(value);
+        }
+        *out = result;
+        return Status::OK();
+      }
+      default:
+        return Status::Invalid("compact object has an unknown tag");
+    }
+  }
+
+ private:
+  Status ReadRaw(void* data, int64_t size) {
+    if (end_ - pos_ < size) { return Status::Invalid("compact object is truncated"); }
+    memcpy(data, pos_, size);
+    pos_ += size;
+    return Status::OK();
+  }
+
+  const uint8_t* pos_;
+  const uint8_t* end_;
+};
+
+Status DeserializeCompact(const uint8_t* data, int64_t size, PyObject** out) {
+  CompactReader reader(data, size);
+  return reader.Read(out);
+}
+}
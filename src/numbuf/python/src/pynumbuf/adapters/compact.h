@@ -0,0 +1,28 @@
+#ifndef PYNUMBUF_COMPACT_H
+#define PYNUMBUF_COMPACT_H
+
+#include <Python.h>
+
+#include <arrow/api.h>
+
+#include <vector>
+
+namespace numbuf {
+
+/* Values whose compact encoding is larger than this are serialized with
+ * Arrow, which has a fixed overhead but scales better. */
+extern int64_t COMPACT_MAX_SIZE;
+
+/* Encode a small value of one of the builtin types None, bool, int, float,
+ * bytes, str, list, tuple and dict as a sequence of tagged items.
+ *
+ * Returns true if the value was encoded into out, and false if it contains a
+ * value of another type, is nested too deeply, or its encoding is larger than
+ * max_size. No Python exception is set if this returns false. */
+bool SerializeCompact(PyObject* value, int64_t max_size, std::vector<uint8_t>* out);
+
+/* Decode a value that was encoded by SerializeCompact. */
+arrow::Status DeserializeCompact(const uint8_t* data, int64_t size, PyObject** out);
+}
+
+#endif
@@ -8,10 +8,15 @@ using namespace arrow;
 
 int32_t MAX_RECURSION_DEPTH = 100;
 
+// Lists with at least this many elements are checked for whether all of their
+// elements have the same primitive type.
+int32_t HOMOGENEOUS_LIST_MIN_SIZE = 16;
+
 extern "C" {
 
 extern PyObject* numbuf_serialize_callback;
 extern PyObject* numbuf_deserialize_callback;
+extern PyObject* numbuf_serialize_list_callback;
 }
 
 namespace numbuf {
@@ -20,6 +25,48 @@ namespace numbuf {
 #define PyInt_FromLong PyLong_FromLong
 #endif
 
+Status DeserializePrimitiveList(std::shared_ptr<Array> array, int32_t start_idx,
+    int32_t stop_idx, PyObject** out) {
+  PyObject* result = PyList_New(stop_idx - start_idx);
+  switch (array->type()->type) {
+    case Type::INT64: {
+      auto values = std::static_pointer_cast<Int64Array>(array);
+      for (int32_t i = start_idx; i < stop_idx; ++i) {
+        PyList_SET_ITEM(result, i - start_idx, PyInt_FromLong(values->Value(i)));
+      }
+    } break;
+    case Type::DOUBLE: {
+      auto values = std::static_pointer_cast<DoubleArray>(array);
+      for (int32_t i = start_idx; i < stop_idx; ++i) {
+        PyList_SET_ITEM(result, i - start_idx, PyFloat_FromDouble(values->Value(i)));
+      }
+    } break;
+    case Type::STRING: {
+      auto values = std::static_pointer_cast<StringArray>(array);
+      for (int32_t i = start_idx; i < stop_idx; ++i) {
+        int32_t nchars;
+        const uint8_t* str = values->GetValue(i, &nchars);
+        PyList_SET_ITEM(result, i - start_idx,
+            PyUnicode_FromStringAndSize(reinterpret_cast<const char*>(str), nchars));
+      }
+    } break;
+    case Type::BINARY: {
+      auto values = std::static_pointer_cast<BinaryArray>(array);
+      for (int32_t i = start_idx; i < stop_idx; ++i) {
+        int32_t nchars;
+        const uint8_t* str = values->GetValue(i, &nchars);
+        PyList_SET_ITEM(result, i - start_idx,
+            PyBytes_FromStringAndSize(reinterpret_cast<const char*>(str), nchars));
+      }
+    } break;
+    default:
+      Py_DECREF(result);
+      return Status::NotImplemented("homogeneous list type not recognized");
+  }
+  *out = result;
+  return Status::OK();
+}
+
 Status get_value(
     ArrayPtr arr, int32_t index, int32_t type, PyObject* base, PyObject** result) {
   switch (arr->type()->type) {
@@ -55,7 +102,12 @@ Status get_value(
     case Type::STRUCT: {
       auto s = std::static_pointer_cast<StructArray>(arr);
       auto l = std::static_pointer_cast<ListArray>(s->field(0));
-      if (s->type()->child(0)->name == "list") {
+      const std::string& name = s->type()->child(0)->name;
+      if (name == "int_list" || name == "double_list" || name == "string_list" ||
+          name == "bytes_list") {
+        return DeserializePrimitiveList(
+            l->values(), l->value_offset(index), l->value_offset(index + 1), result);
+      } else if (s->type()->child(0)->name == "list") {
         return DeserializeList(l->values(), l->value_offset(index),
             l->value_offset(index + 1), base, result);
       } else if (s->type()->child(0)->name == "tuple") {
@@ -74,6 +126,147 @@ Status get_value(
   return Status::OK();
 }
 
+/* Append a list whose elements are all exact floats, ints that fit into an
+ * int64, strings or bytes objects as a single primitive array. Sets *appended
+ * to false and appends nothing if the list is not homogeneous. */
+Status AppendHomogeneousList(PyObject* list, SequenceBuilder& builder, bool* appended) {
+  *appended = false;
+  Py_ssize_t size = PyList_GET_SIZE(list);
+  PyObject* first = PyList_GET_ITEM(list, 0);
+  if (PyFloat_CheckExact(first)) {
+    std::vector<double> data(size);
+    for (Py_ssize_t i = 0; i < size; ++i) {
+      PyObject* item = PyList_GET_ITEM(list, i);
+      if (!PyFloat_CheckExact(item)) { return Status::OK(); }
+      data[i] = PyFloat_AS_DOUBLE(item);
+    }
+    *appended = true;
+    return builder.AppendDoubleList(data.data(), size);
+  }
+#if PY_MAJOR_VERSION < 3
+  if (PyLong_CheckExact(first) || PyInt_CheckExact(first)) {
+#else
+  if (PyLong_CheckExact(first)) {
+#endif
+    std::vector<int64_t> data(size);
+    for (Py_ssize_t i = 0; i < size; ++i) {
+      PyObject* item = PyList_GET_ITEM(list, i);
+      if (PyLong_CheckExact(item)) {
+        int overflow = 0;
+        data[i] = PyLong_AsLongLongAndOverflow(item, &overflow);
+        if (overflow) { return Status::OK(); }
+#if PY_MAJOR_VERSION < 3
+      } else if (PyInt_CheckExact(item)) {
+        data[i] = static_cast<int64_t>(PyInt_AS_LONG(item));
+#endif
+      } else {
+        return Status::OK();
+      }
+    }
+    *appended = true;
+    return builder.AppendInt64List(data.data(), size);
+  }
+  if (PyUnicode_CheckExact(first) || PyBytes_CheckExact(first)) {
+    bool is_unicode = PyUnicode_CheckExact(first);
+    std::vector<const char*> data(size);
+    std::vector<int32_t> lengths(size);
+#if PY_MAJOR_VERSION < 3
+    // The UTF-8 encodings of unicode objects must stay alive until they have
+    // been appended.
+    std::vector<PyObject*> encoded;
+#endif
+    bool homogeneous = true;
+    for (Py_ssize_t i = 0; i < size && homogeneous; ++i) {
+      PyObject* item = PyList_GET_ITEM(list, i);
+      if (is_unicode && PyUnicode_CheckExact(item)) {
+        Py_ssize_t length = 0;
+#if PY_MAJOR_VERSION >= 3
+        data[i] = PyUnicode_AsUTF8AndSize(item, &length);
+#else
+        PyObject* str = PyUnicode_AsUTF8String(item);
+        if (str != NULL) {
+          encoded.push_back(str);
+          data[i] = PyString_AS_STRING(str);
+          length = PyString_GET_SIZE(str);
+        } else {
+          data[i] = NULL;
+        }
+#endif
+        lengths[i] = length;
+        homogeneous = data[i] != NULL;
+      } else if (!is_unicode && PyBytes_CheckExact(item)) {
+        data[i] = PyBytes_AS_STRING(item);
+        lengths[i] = PyBytes_GET_SIZE(item);
+      } else {
+        homogeneous = false;
+      }
+    }
+    Status s;
+    if (homogeneous) {
+      *appended = true;
+      s = is_unicode ? builder.AppendStringList(data, lengths)
+                     : builder.AppendBytesList(data, lengths);
+    } else {
+      // Strings that cannot be encoded are reported by the general path.
+      PyErr_Clear();
+    }
+#if PY_MAJOR_VERSION < 3
+    for (const auto& str : encoded) {
+      Py_DECREF(str);
+    }
+#endif
+    return s;
+  }
+  return Status::OK();
+}
+
+/* Return true if append serializes objects of this type without calling the
+ * serialization callback. */
+static bool is_builtin_type(PyObject* elem) {
+#if PY_MAJOR_VERSION < 3
+  if (PyInt_Check(elem)) { return true; }
+#endif
+  return PyBool_Check(elem) || PyFloat_Check(elem) || PyLong_Check(elem) ||
+         PyBytes_Check(elem) || PyUnicode_Check(elem) || PyList_Check(elem) ||
+         PyDict_Check(elem) || PyTuple_CheckExact(elem) ||
+         PyArray_IsScalar(elem, Generic) || PyArray_Check(elem) || elem == Py_None;
+}
+
+/* Append a list whose elements are all instances of the same class that
+ * numbuf does not know as a single dictionary, so that the serialization
+ * callback is not called once per element. The dictionary is produced by the
+ * list serialization callback, which can encode the instances column by
+ * column. Sets *appended to false and appends nothing if the elements have
+ * different types or the callback declines the list. */
+Status AppendObjectList(PyObject* list, SequenceBuilder& builder,
+    std::vector<PyObject*>& subdicts, bool* appended) {
+  *appended = false;
+  Py_ssize_t size = PyList_GET_SIZE(list);
+  PyObject* first = PyList_GET_ITEM(list, 0);
+  if (is_builtin_type(first)) { return Status::OK(); }
+  for (Py_ssize_t i = 1; i < size; ++i) {
+    if (Py_TYPE(PyList_GET_ITEM(list, i)) != Py_TYPE(first)) { return Status::OK(); }
+  }
+  PyObject* arglist = Py_BuildValue("(O)", list);
+  // The reference count of the result must be decremented. This is done in
+  // SerializeDict in this file.
+  PyObject* result = PyObject_CallObject(numbuf_serialize_list_callback, arglist);
+  Py_XDECREF(arglist);
+  if (!result) { return Status::NotImplemented("python error"); }
+  if (result == Py_None) {
+    Py_DECREF(result);
+    return Status::OK();
+  }
+  if (!PyDict_Check(result)) {
+    Py_DECREF(result);
+    return Status::NotImplemented("list serialization callback must return a dict");
+  }
+  *appended = true;
+  builder.AppendDict(PyDict_Size(result));
+  subdicts.push_back(result);
+  return Status::OK();
+}
+
 Status append(PyObject* elem, SequenceBuilder& builder, std::vector<PyObject*>& sublists,
     std::vector<PyObject*>& subtuples, std::vector<PyObject*>& subdicts) {
   // The bool case must precede the int case (PyInt_Check passes for bools)
@@ -107,8 +300,17 @@ Status append(PyObject* elem, SequenceBuilder& builder, std::vector<PyObject*>&
     Status s = builder.AppendString(data, size);
     RETURN_NOT_OK(s);
   } else if (PyList_Check(elem)) {
-    builder.AppendList(PyList_Size(elem));
-    sublists.push_back(elem);
+    bool appended = false;
+    if (PyList_CheckExact(elem) && PyList_GET_SIZE(elem) >= HOMOGENEOUS_LIST_MIN_SIZE) {
+      RETURN_NOT_OK(AppendHomogeneousList(elem, builder, &appended));
+      if (!appended && numbuf_serialize_list_callback) {
+        RETURN_NOT_OK(AppendObjectList(elem, builder, subdicts, &appended));
+      }
+    }
+    if (!appended) {
+      builder.AppendList(PyList_Size(elem));
+      sublists.push_back(elem);
+    }
   } else if (PyDict_Check(elem)) {
     builder.AppendDict(PyDict_Size(elem));
     subdicts.push_back(elem);
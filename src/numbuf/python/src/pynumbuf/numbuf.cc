@@ -11,6 +11,7 @@
 
 #include <arrow/ipc/metadata.h>
 
+#include "adapters/compact.h"
 #include "adapters/python.h"
 #include "memory.h"
 
@@ -71,6 +72,7 @@ static PyObject* NumbufError;
 
 PyObject* numbuf_serialize_callback = NULL;
 PyObject* numbuf_deserialize_callback = NULL;
+PyObject* numbuf_serialize_list_callback = NULL;
 
 int PyObjectToArrow(PyObject* object, std::shared_ptr<RecordBatch>** result) {
   if (PyCapsule_IsValid(object, "arrow")) {
@@ -165,12 +167,18 @@ static PyObject* deserialize_list(PyObject* self, PyObject* args) {
   return result;
 }
 
+/* The optional third callback is called with lists of at least
+ * HOMOGENEOUS_LIST_MIN_SIZE objects of the same type that numbuf does not know
+ * how to serialize. It returns a dictionary with the key "_pytype_" that
+ * represents the whole list, or None if the objects should be serialized one
+ * by one with the first callback. */
 static PyObject* register_callbacks(PyObject* self, PyObject* args) {
   PyObject* result = NULL;
   PyObject* serialize_callback;
   PyObject* deserialize_callback;
-  if (PyArg_ParseTuple(
-          args, "OO:register_callbacks", &serialize_callback, &deserialize_callback)) {
+  PyObject* serialize_list_callback = NULL;
+  if (PyArg_ParseTuple(args, "OO|O:register_callbacks", &serialize_callback,
+          &deserialize_callback, &serialize_list_callback)) {
     if (!PyCallable_Check(serialize_callback)) {
       PyErr_SetString(PyExc_TypeError, "serialize_callback must be callable");
       return NULL;
@@ -179,12 +187,19 @@ static PyObject* register_callbacks(PyObject* self, PyObject* args) {
       PyErr_SetString(PyExc_TypeError, "deserialize_callback must be callable");
       return NULL;
     }
+    if (serialize_list_callback && !PyCallable_Check(serialize_list_callback)) {
+      PyErr_SetString(PyExc_TypeError, "serialize_list_callback must be callable");
+      return NULL;
+    }
     Py_XINCREF(serialize_callback);    // Add a reference to new serialization callback
     Py_XINCREF(deserialize_callback);  // Add a reference to new deserialization callback
     Py_XDECREF(numbuf_serialize_callback);    // Dispose of old serialization callback
     Py_XDECREF(numbuf_deserialize_callback);  // Dispose of old deserialization callback
+    Py_XINCREF(serialize_list_callback);
+    Py_XDECREF(numbuf_serialize_list_callback);
     numbuf_serialize_callback = serialize_callback;
     numbuf_deserialize_callback = deserialize_callback;
+    numbuf_serialize_list_callback = serialize_list_callback;
     Py_INCREF(Py_None);
     result = Py_None;
   }
@@ -223,13 +238,260 @@ static void BufferCapsule_Destructor(PyObject* capsule) {
   delete id;
 }
 
+/* Contiguous NumPy arrays of the following types are stored without going
+ * through Arrow. The plasma metadata of such an object is an ndarray_header
+ * followed by the dimensions of the array, and the plasma data is the raw data
+ * of the array. The metadata of Arrow objects is a flatbuffer whose first four
+ * bytes are the offset of its root table, which is always smaller than the
+ * metadata itself, so Arrow metadata can never start with NDARRAY_TAG. */
+static const char NDARRAY_TAG[8] = {'R', 'A', 'Y', ':', 'N', 'D', 'A', '1'};
+
+struct ndarray_header {
+  char tag[sizeof(NDARRAY_TAG)];
+  int32_t type_num;
+  int32_t ndim;
+};
+
+static bool is_fast_path_type(int type_num) {
+  switch (type_num) {
+    case NPY_INT8:
+    case NPY_INT16:
+    case NPY_INT32:
+    case NPY_INT64:
+    case NPY_UINT8:
+    case NPY_UINT16:
+    case NPY_UINT32:
+    case NPY_UINT64:
+    case NPY_FLOAT:
+    case NPY_DOUBLE:
+      return true;
+    default:
+      return false;
+  }
+}
+
+static std::vector<uint8_t> make_ndarray_metadata(
+    int type_num, int ndim, const npy_intp* dims) {
+  std::vector<uint8_t> metadata(sizeof(ndarray_header) + ndim * sizeof(int64_t));
+  ndarray_header header;
+  memcpy(header.tag, NDARRAY_TAG, sizeof(NDARRAY_TAG));
+  header.type_num = type_num;
+  header.ndim = ndim;
+  memcpy(metadata.data(), &header, sizeof(header));
+  for (int i = 0; i < ndim; ++i) {
+    int64_t dim = dims[i];
+    memcpy(metadata.data() + sizeof(header) + i * sizeof(int64_t), &dim, sizeof(dim));
+  }
+  return metadata;
+}
+
+static bool is_ndarray_metadata(const uint8_t* metadata, int64_t metadata_size) {
+  return metadata_size >= static_cast<int64_t>(sizeof(ndarray_header)) &&
+         memcmp(metadata, NDARRAY_TAG, sizeof(NDARRAY_TAG)) == 0;
+}
+
+/* Lists of small builtin values (see SerializeCompact) are stored in a compact
+ * tagged encoding instead of an Arrow record batch, which needs a schema and a
+ * header even for a single scalar. The plasma metadata of such an object is
+ * just COMPACT_TAG and the plasma data is the encoding. Like NDARRAY_TAG, this
+ * can never be mistaken for Arrow metadata. */
+static const char COMPACT_TAG[8] = {'R', 'A', 'Y', ':', 'S', 'M', 'L', '1'};
+
+static bool is_compact_metadata(const uint8_t* metadata, int64_t metadata_size) {
+  return metadata_size == sizeof(COMPACT_TAG) &&
+         memcmp(metadata, COMPACT_TAG, sizeof(COMPACT_TAG)) == 0;
+}
+
+/**
+ * Create a plasma object and set a Python exception if this fails.
+ *
+ * @return True if the object was created and false otherwise.
+ */
+static bool create_plasma_object(plasma_connection* conn, object_id obj_id,
+    int64_t data_size, uint8_t* metadata, int64_t metadata_size, uint8_t** data) {
+  int error_code =
+      plasma_create(conn, obj_id, data_size, metadata, metadata_size, data);
+  if (error_code == PlasmaError_ObjectExists) {
+    PyErr_SetString(NumbufPlasmaObjectExistsError,
+        "An object with this ID already exists in the plasma "
+        "store.");
+    return false;
+  }
+  if (error_code == PlasmaError_OutOfMemory) {
+    PyErr_SetString(NumbufPlasmaOutOfMemoryError,
+        "The plasma store ran out of memory and could not create "
+        "this object.");
+    return false;
+  }
+  CHECK(error_code == PlasmaError_OK);
+  return true;
+}
+
+/**
+ * Make a PyCapsule that releases a plasma object when it goes out of scope.
+ * This is used as the base object of NumPy arrays backed by plasma buffers.
+ */
+static PyObject* make_buffer_capsule(object_id obj_id, PyObject* plasma_conn) {
+  object_id* buffer_obj_id = new object_id(obj_id);
+  PyObject* base = PyCapsule_New(buffer_obj_id, "buffer", BufferCapsule_Destructor);
+  PyCapsule_SetContext(base, plasma_conn);
+  Py_XINCREF(plasma_conn);
+  return base;
+}
+
+/**
+ * Store a NumPy array in the plasma store without converting it to Arrow.
+ *
+ * The data is copied into the plasma buffer with a single memcpy, during which
+ * the GIL is released.
+ */
+static PyObject* store_ndarray(
+    plasma_connection* conn, object_id obj_id, PyArrayObject* array) {
+  std::vector<uint8_t> metadata = make_ndarray_metadata(
+      PyArray_TYPE(array), PyArray_NDIM(array), PyArray_DIMS(array));
+  PyArrayObject* contiguous = PyArray_GETCONTIGUOUS(array);
+  int64_t size = PyArray_NBYTES(contiguous);
+  uint8_t* data;
+  if (!create_plasma_object(
+          conn, obj_id, size, metadata.data(), metadata.size(), &data)) {
+    Py_DECREF(contiguous);
+    return NULL;
+  }
+  void* source = PyArray_DATA(contiguous);
+  Py_BEGIN_ALLOW_THREADS;
+  memcpy(data, source, size);
+  Py_END_ALLOW_THREADS;
+  Py_DECREF(contiguous);
+  /* Do the plasma_release corresponding to the call to plasma_create. */
+  plasma_release(conn, obj_id);
+  plasma_seal(conn, obj_id);
+  Py_RETURN_NONE;
+}
+
+/**
+ * Store the compact encoding of a value in the plasma store.
+ */
+static PyObject* store_compact(
+    plasma_connection* conn, object_id obj_id, const std::vector<uint8_t>& encoding) {
+  uint8_t* data;
+  if (!create_plasma_object(conn, obj_id, encoding.size(),
+          (uint8_t*)COMPACT_TAG, sizeof(COMPACT_TAG), &data)) {
+    return NULL;
+  }
+  memcpy(data, encoding.data(), encoding.size());
+  /* Do the plasma_release corresponding to the call to plasma_create. */
+  plasma_release(conn, obj_id);
+  plasma_seal(conn, obj_id);
+  Py_RETURN_NONE;
+}
+
+/**
+ * Construct a read-only NumPy array backed by a plasma buffer that was stored
+ * by store_ndarray or create_array.
+ *
+ * @param buffer The plasma buffer.
+ * @param base The object that keeps the plasma buffer alive. This function
+ *        takes a new reference to it.
+ * @return The array, or NULL with a Python exception set if the array could
+ *         not be allocated.
+ */
+static PyObject* ndarray_from_plasma_buffer(object_buffer* buffer, PyObject* base) {
+  ndarray_header header;
+  memcpy(&header, buffer->metadata, sizeof(header));
+  std::vector<npy_intp> dims(header.ndim);
+  for (int i = 0; i < header.ndim; ++i) {
+    int64_t dim;
+    memcpy(&dim, buffer->metadata + sizeof(header) + i * sizeof(int64_t), sizeof(dim));
+    dims[i] = dim;
+  }
+  PyObject* array = PyArray_SimpleNewFromData(
+      header.ndim, dims.data(), header.type_num, buffer->data);
+  if (array == NULL) { return NULL; }
+  Py_XINCREF(base);
+  if (PyArray_SetBaseObject(reinterpret_cast<PyArrayObject*>(array), base) < 0) {
+    Py_DECREF(array);
+    return NULL;
+  }
+  PyArray_CLEARFLAGS(reinterpret_cast<PyArrayObject*>(array), NPY_ARRAY_WRITEABLE);
+  return array;
+}
+
+/**
+ * Create an object for a NumPy array in the plasma store without sealing it.
+ *
+ * @param args The arguments are, in order:
+ *        1) The object ID of the object to create.
+ *        2) The connection to the plasma store.
+ *        3) The shape of the array.
+ *        4) The dtype of the array.
+ * @return A writable NumPy array backed by the plasma buffer. The object must
+ *         be sealed with the same plasma connection once the array is filled.
+ */
+static PyObject* create_array(PyObject* self, PyObject* args) {
+  object_id obj_id;
+  PyObject* plasma_conn;
+  PyArray_Dims shape;
+  PyArray_Descr* dtype;
+  if (!PyArg_ParseTuple(args, "O&OO&O&", PyStringToUniqueID, &obj_id, &plasma_conn,
+          PyArray_IntpConverter, &shape, PyArray_DescrConverter, &dtype)) {
+    return NULL;
+  }
+  plasma_connection* conn;
+  if (!PyObjectToPlasmaConnection(plasma_conn, &conn) ||
+      !is_fast_path_type(dtype->type_num) || !PyArray_ISNBO(dtype->byteorder)) {
+    if (!PyErr_Occurred()) {
+      PyErr_SetString(PyExc_TypeError,
+          "create_array only supports numeric types in native byte order.");
+    }
+    PyDimMem_FREE(shape.ptr);
+    Py_DECREF(dtype);
+    return NULL;
+  }
+  int type_num = dtype->type_num;
+  int64_t size = dtype->elsize;
+  Py_DECREF(dtype);
+  for (int i = 0; i < shape.len; ++i) {
+    if (shape.ptr[i] < 0) {
+      PyErr_SetString(PyExc_ValueError, "negative dimensions are not allowed");
+      PyDimMem_FREE(shape.ptr);
+      return NULL;
+    }
+    size *= shape.ptr[i];
+  }
+  std::vector<uint8_t> metadata = make_ndarray_metadata(type_num, shape.len, shape.ptr);
+  uint8_t* data;
+  if (!create_plasma_object(
+          conn, obj_id, size, metadata.data(), metadata.size(), &data)) {
+    PyDimMem_FREE(shape.ptr);
+    return NULL;
+  }
+  PyObject* array = PyArray_SimpleNewFromData(shape.len, shape.ptr, type_num, data);
+  PyDimMem_FREE(shape.ptr);
+  if (array == NULL) {
+    /* The plasma store cannot abort an object, so just drop the reference that
+     * plasma_create returned. The object is never sealed. */
+    plasma_release(conn, obj_id);
+    return NULL;
+  }
+  /* The array keeps the reference to the object that plasma_create returned
+   * until it goes out of scope. If setting the base fails, the capsule has
+   * already been released, which releases the plasma object. */
+  if (PyArray_SetBaseObject(reinterpret_cast<PyArrayObject*>(array),
+          make_buffer_capsule(obj_id, plasma_conn)) < 0) {
+    Py_DECREF(array);
+    return NULL;
+  }
+  return array;
+}
+
 /**
  * Store a PyList in the plasma store.
  *
  * This function converts the PyList into an arrow RecordBatch, constructs the
  * metadata (schema) of the PyList, creates a new plasma object, puts the data
- * into the plasma buffer and the schema into the plasma metadata. This raises
- *
+ * into the plasma buffer and the schema into the plasma metadata. Lists that
+ * contain a single NumPy array and lists of small builtin values are stored
+ * without Arrow instead.
  *
  * @param args Contains the object ID the list is stored under, the
  *        connection to the plasma store and the PyList we want to store.
@@ -245,6 +507,21 @@ static PyObject* store_list(PyObject* self, PyObject* args) {
   }
   if (!PyList_Check(value)) { return NULL; }
 
+  if (PyList_Size(value) == 1) {
+    PyObject* item = PyList_GetItem(value, 0);
+    if (PyArray_CheckExact(item)) {
+      PyArrayObject* ndarray = reinterpret_cast<PyArrayObject*>(item);
+      if (is_fast_path_type(PyArray_TYPE(ndarray)) && PyArray_ISNOTSWAPPED(ndarray)) {
+        return store_ndarray(conn, obj_id, ndarray);
+      }
+    }
+  }
+
+  std::vector<uint8_t> encoding;
+  if (SerializeCompact(value, COMPACT_MAX_SIZE, &encoding)) {
+    return store_compact(conn, obj_id, encoding);
+  }
+
   std::shared_ptr<Array> array;
   int32_t recursion_depth = 0;
   Status s = SerializeSequences(std::vector<PyObject*>({value}), recursion_depth, &array);
@@ -260,21 +537,10 @@ static PyObject* store_list(PyObject* self, PyObject* args) {
    * stored in the plasma data buffer. The header end offset is stored in
    * the first sizeof(int64_t) bytes of the data buffer. The RecordBatch
    * data is stored after that. */
-  int error_code = plasma_create(conn, obj_id, sizeof(size) + size,
-      (uint8_t*)metadata->data(), metadata->size(), &data);
-  if (error_code == PlasmaError_ObjectExists) {
-    PyErr_SetString(NumbufPlasmaObjectExistsError,
-        "An object with this ID already exists in the plasma "
-        "store.");
-    return NULL;
-  }
-  if (error_code == PlasmaError_OutOfMemory) {
-    PyErr_SetString(NumbufPlasmaOutOfMemoryError,
-        "The plasma store ran out of memory and could not create "
-        "this object.");
+  if (!create_plasma_object(conn, obj_id, sizeof(size) + size,
+          (uint8_t*)metadata->data(), metadata->size(), &data)) {
     return NULL;
   }
-  CHECK(error_code == PlasmaError_OK);
 
   auto target = std::make_shared<FixedBufferStream>(sizeof(size) + data, size);
   int64_t body_end_offset;
@@ -338,15 +604,46 @@ static PyObject* retrieve_list(PyObject* self, PyObject* args) {
     Py_XINCREF(obj_id);
     PyTuple_SetItem(t, 0, obj_id);
 
-    if (object_buffers[i].data_size != -1) {
-      /* The object was retrieved, so return the object. */
-      object_id* buffer_obj_id = new object_id(object_ids[i]);
-      /* This keeps a Plasma buffer in scope as long as an object that is backed by that
-       * buffer is in scope. This prevents memory in the object store from getting
-       * released while it is still being used to back a Python object. */
-      PyObject* base = PyCapsule_New(buffer_obj_id, "buffer", BufferCapsule_Destructor);
-      PyCapsule_SetContext(base, plasma_conn);
-      Py_XINCREF(plasma_conn);
+    if (object_buffers[i].data_size != -1 &&
+        is_ndarray_metadata(
+            object_buffers[i].metadata, object_buffers[i].metadata_size)) {
+      /* The object is a NumPy array that was stored without Arrow. */
+      PyObject* base = make_buffer_capsule(object_ids[i], plasma_conn);
+      PyObject* array = ndarray_from_plasma_buffer(&object_buffers[i], base);
+      Py_XDECREF(base);
+      if (array == NULL) {
+        /* Release the buffers of the objects that were not converted yet. */
+        for (int j = i + 1; j < num_object_ids; ++j) {
+          if (object_buffers[j].data_size != -1) {
+            plasma_release(conn, object_ids[j]);
+          }
+        }
+        Py_DECREF(t);
+        Py_DECREF(returns);
+        delete[] object_ids;
+        delete[] object_buffers;
+        return NULL;
+      }
+      PyObject* result = PyList_New(1);
+      PyList_SetItem(result, 0, array);
+      PyTuple_SetItem(t, 1, result);
+    } else if (object_buffers[i].data_size != -1 &&
+               is_compact_metadata(
+                   object_buffers[i].metadata, object_buffers[i].metadata_size)) {
+      /* The object is a list of small values. Decoding copies them, so the
+       * plasma buffer can be released right away. */
+      PyObject* result;
+      Status s = DeserializeCompact(
+          object_buffers[i].data, object_buffers[i].data_size, &result);
+      plasma_release(conn, object_ids[i]);
+      CHECK_SERIALIZATION_ERROR(s);
+      PyTuple_SetItem(t, 1, result);
+    } else if (object_buffers[i].data_size != -1) {
+      /* The object was retrieved, so return the object. This keeps a Plasma
+       * buffer in scope as long as an object that is backed by that buffer is in
+       * scope. This prevents memory in the object store from getting released
+       * while it is still being used to back a Python object. */
+      PyObject* base = make_buffer_capsule(object_ids[i], plasma_conn);
 
       /* Remember: The metadata offset was written at the beginning of the plasma buffer.
        */
@@ -393,6 +690,8 @@ static PyMethodDef NumbufMethods[] = {
 #ifdef HAS_PLASMA
     {"store_list", store_list, METH_VARARGS, "store a Python list in plasma"},
     {"retrieve_list", retrieve_list, METH_VARARGS, "retrieve a Python list from plasma"},
+    {"create_array", create_array, METH_VARARGS,
+        "create an unsealed NumPy array in plasma"},
 #endif
     {NULL, NULL, 0, NULL}};
 
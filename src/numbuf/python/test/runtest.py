@@ -37,6 +37,19 @@ class SerializationTests(unittest.TestCase):
     self.roundTripTest([{'hello': 1.0, 'world': 42}])
     self.roundTripTest([True, False])
 
+  def testHomogeneousLists(self):
+    # Long lists whose elements all have the same primitive type are stored as
+    # a single array. Lists that only almost qualify must round trip as well.
+    lists = [[float(i) for i in range(100)], list(range(100)),
+             [str(i) for i in range(100)], [u"\u262F" * i for i in range(100)],
+             [str(i).encode("ascii") for i in range(100)],
+             list(range(100)) + [1.0], [1.0] * 100 + [1], [True] * 100,
+             ["a"] * 100 + [b"a"], [{"x": [[0.5] * 100, list(range(100))]}]]
+    for data in lists:
+      self.roundTripTest(data)
+      result = numbuf.deserialize_list(numbuf.serialize_list(data)[2])
+      self.assertEqual([type(x) for x in result], [type(x) for x in data])
+
   def testNone(self):
     self.roundTripTest([1, 2, None, 3])
 
@@ -15,6 +15,20 @@ static const retry_info photon_retry = {.num_retries = 0,
                                         .timeout = 1000,
                                         .fail_callback = NULL};
 
+/* The amount of time that the local scheduler waits after checking whether an
+ * object needs to be reconstructed before it checks the same object again. This
+ * doubles after every check, up to the maximum. */
+#define RECONSTRUCTION_INITIAL_BACKOFF_MILLISECONDS 1000
+#define RECONSTRUCTION_MAX_BACKOFF_MILLISECONDS 10000
+/* The backoff state of an object is dropped once nobody has asked for the
+ * object for this long after it could have been checked again. Objects that
+ * are still waited on are asked for much more often than this. */
+#define RECONSTRUCTION_EXPIRY_MILLISECONDS RECONSTRUCTION_MAX_BACKOFF_MILLISECONDS
+
+/* The amount of time that the local scheduler waits for the worker fork server
+ * to accept or answer a request before it gives up on the request. */
+#define FORK_SERVER_TIMEOUT_MILLISECONDS 1000
+
 enum photon_message_type {
   /** Notify the local scheduler that a task has finished. */
   TASK_DONE = 64,
@@ -29,9 +43,17 @@ enum photon_message_type {
   EVENT_LOG_MESSAGE,
   /** Send an initial connection message to the local scheduler.
    *  This contains the worker's process ID and actor ID. */
-  REGISTER_WORKER_INFO
+  REGISTER_WORKER_INFO,
+  /** Submit a batch of tasks to the local scheduler in a single message. The
+   *  message is the number of tasks followed by the task specs, each padded to
+   *  TASK_BATCH_PADDED_SIZE. */
+  SUBMIT_TASK_BATCH
 };
 
+/* The task specs in a SUBMIT_TASK_BATCH message are padded to a multiple of 8
+ * bytes, so that the 64-bit fields of every spec in the message are aligned. */
+#define TASK_BATCH_PADDED_SIZE(size) (((size) + 7) & ~((int64_t) 7))
+
 /* These are needed to define the UT_arrays. */
 UT_icd task_ptr_icd;
 UT_icd workers_icd;
@@ -58,6 +80,20 @@ typedef struct {
   UT_hash_handle hh;
 } actor_map_entry;
 
+/** This struct is used to rate limit the reconstruction checks for an object
+ *  that is not available locally. */
+typedef struct {
+  /** The ID of the object. This is used as a key in the hash table. */
+  object_id object_id;
+  /** The earliest time in milliseconds at which the object may be checked
+   *  again. */
+  int64_t next_attempt_time;
+  /** The amount of time to wait after the next check. */
+  int64_t backoff;
+  /** Handle for the hash table. */
+  UT_hash_handle hh;
+} reconstruction_entry;
+
 /** Internal state of the scheduling algorithm. */
 typedef struct scheduling_algorithm_state scheduling_algorithm_state;
 
@@ -67,6 +103,9 @@ typedef struct scheduling_algorithm_state scheduling_algorithm_state;
 typedef struct {
   /** The script to use when starting a new worker. */
   const char **start_worker_command;
+  /** The socket of the worker fork server, or NULL if workers should be
+   *  started with start_worker_command. */
+  const char *worker_fork_server_socket_name;
   /** Whether there is a global scheduler. */
   bool global_scheduler_exists;
 } local_scheduler_config;
@@ -84,9 +123,17 @@ typedef struct {
   /** List of the process IDs for child processes (workers) started by the
    *  local scheduler that have not sent a REGISTER_PID message yet. */
   UT_array *child_pids;
+  /** List of the process IDs of workers forked by the worker fork server that
+   *  have not sent a REGISTER_PID message yet. */
+  UT_array *forked_pids;
   /** A hash table mapping actor IDs to the db_client_id of the local scheduler
    *  that is responsible for the actor. */
   actor_map_entry *actor_mapping;
+  /** A hash table of the objects that reconstruction has been requested for
+   *  and that have not appeared in the local object store since. This is used
+   *  to back off from checking the same object over and over. Entries that are
+   *  no longer asked for are expired by a timer. */
+  reconstruction_entry *reconstruction_requests;
   /** The handle to the database. */
   db_handle *db;
   /** The Plasma client. */
@@ -117,6 +164,9 @@ typedef struct {
   pid_t pid;
   /** Whether the client is a child process of the local scheduler. */
   bool is_child;
+  /** Whether the client was forked by the worker fork server. Such a client
+   *  is a child of the fork server, so the fork server kills and reaps it. */
+  bool is_forked;
   /** The ID of the actor on this worker. If there is no actor running on this
    *  worker, this should be NIL_ACTOR_ID. */
   actor_id actor_id;
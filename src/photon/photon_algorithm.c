@@ -789,25 +789,44 @@ void update_result_table(local_scheduler_state *state, task_spec *spec) {
   }
 }
 
-void handle_task_submitted(local_scheduler_state *state,
-                           scheduling_algorithm_state *algorithm_state,
-                           task_spec *spec) {
+/**
+ * Place a task that was submitted by a worker in the appropriate queue without
+ * triggering task dispatch.
+ *
+ * @param state The scheduler state.
+ * @param algorithm_state The scheduling algorithm state.
+ * @param spec The task specification to queue.
+ * @param num_free_workers The number of available workers that have not
+ *        already been claimed by tasks queued for dispatch.
+ * @return True if the task was put in the dispatch queue and false otherwise.
+ */
+bool queue_submitted_task(local_scheduler_state *state,
+                          scheduling_algorithm_state *algorithm_state,
+                          task_spec *spec,
+                          int64_t num_free_workers) {
   /* TODO(atumanov): if static is satisfied and local objects ready, but dynamic
    * resource is currently unavailable, then consider queueing task locally and
    * recheck dynamic next time. */
 
   /* If this task's constraints are satisfied, dependencies are available
    * locally, and there is an available worker, then enqueue the task in the
-   * dispatch queue and trigger task dispatch. Otherwise, pass the task along to
-   * the global scheduler if there is one. */
-  if (resource_constraints_satisfied(state, spec) &&
-      (utarray_len(algorithm_state->available_workers) > 0) &&
+   * dispatch queue. Otherwise, pass the task along to the global scheduler if
+   * there is one. */
+  if (resource_constraints_satisfied(state, spec) && (num_free_workers > 0) &&
       can_run(algorithm_state, spec)) {
     queue_dispatch_task(state, algorithm_state, spec, false);
-  } else {
-    /* Give the task to the global scheduler to schedule, if it exists. */
-    give_task_to_global_scheduler(state, algorithm_state, spec);
+    return true;
   }
+  /* Give the task to the global scheduler to schedule, if it exists. */
+  give_task_to_global_scheduler(state, algorithm_state, spec);
+  return false;
+}
+
+void handle_task_submitted(local_scheduler_state *state,
+                           scheduling_algorithm_state *algorithm_state,
+                           task_spec *spec) {
+  queue_submitted_task(state, algorithm_state, spec,
+                       utarray_len(algorithm_state->available_workers));
 
   /* Try to dispatch tasks, since we may have added one to the queue. */
   dispatch_tasks(state, algorithm_state);
@@ -817,6 +836,31 @@ void handle_task_submitted(local_scheduler_state *state,
   update_result_table(state, spec);
 }
 
+void handle_task_batch_submitted(local_scheduler_state *state,
+                                 scheduling_algorithm_state *algorithm_state,
+                                 task_spec **specs,
+                                 int64_t num_tasks) {
+  /* Queue all of the tasks first. Each task that is queued for dispatch claims
+   * one of the available workers so that we don't keep more tasks locally than
+   * we can run right away. */
+  int64_t num_free_workers = utarray_len(algorithm_state->available_workers);
+  for (int64_t i = 0; i < num_tasks; ++i) {
+    if (queue_submitted_task(state, algorithm_state, specs[i],
+                             num_free_workers)) {
+      --num_free_workers;
+    }
+  }
+
+  /* Dispatch once for the whole batch. */
+  dispatch_tasks(state, algorithm_state);
+
+  /* Update the result table, which holds mappings of object ID -> ID of the
+   * task that created it. */
+  for (int64_t i = 0; i < num_tasks; ++i) {
+    update_result_table(state, specs[i]);
+  }
+}
+
 void handle_actor_task_submitted(local_scheduler_state *state,
                                  scheduling_algorithm_state *algorithm_state,
                                  task_spec *spec) {
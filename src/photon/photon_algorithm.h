@@ -61,6 +61,23 @@ void handle_task_submitted(local_scheduler_state *state,
                            scheduling_algorithm_state *algorithm_state,
                            task_spec *spec);
 
+/**
+ * This version of handle_task_submitted is used when a worker submits many
+ * tasks in a single message. The tasks are queued exactly as they would be by
+ * handle_task_submitted, but tasks are only dispatched once for the whole
+ * batch. None of the tasks may be actor tasks.
+ *
+ * @param state The state of the local scheduler.
+ * @param algorithm_state State maintained by the scheduling algorithm.
+ * @param specs The tasks that were submitted by the worker.
+ * @param num_tasks The number of tasks in specs.
+ * @return Void.
+ */
+void handle_task_batch_submitted(local_scheduler_state *state,
+                                 scheduling_algorithm_state *algorithm_state,
+                                 task_spec **specs,
+                                 int64_t num_tasks);
+
 /**
  * This version of handle_task_submitted is used when the task being submitted
  * is a method of an actor.
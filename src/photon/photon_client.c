@@ -50,8 +50,32 @@ void photon_submit(photon_conn *conn, task_spec *task) {
                 (uint8_t *) task);
 }
 
-task_spec *photon_get_task(photon_conn *conn) {
+void photon_submit_batch(photon_conn *conn,
+                         task_spec **tasks,
+                         int64_t num_tasks) {
+  int64_t message_length = sizeof(num_tasks);
+  for (int64_t i = 0; i < num_tasks; ++i) {
+    message_length += TASK_BATCH_PADDED_SIZE(task_spec_size(tasks[i]));
+  }
+  /* Zero the memory so that the padding after each task spec is initialized. */
+  uint8_t *message = calloc(message_length, 1);
+  int64_t offset = 0;
+  memcpy(&message[offset], &num_tasks, sizeof(num_tasks));
+  offset += sizeof(num_tasks);
+  for (int64_t i = 0; i < num_tasks; ++i) {
+    memcpy(&message[offset], tasks[i], task_spec_size(tasks[i]));
+    offset += TASK_BATCH_PADDED_SIZE(task_spec_size(tasks[i]));
+  }
+  CHECK(offset == message_length);
+  write_message(conn->conn, SUBMIT_TASK_BATCH, message_length, message);
+  free(message);
+}
+
+void photon_request_task(photon_conn *conn) {
   write_message(conn->conn, GET_TASK, 0, NULL);
+}
+
+task_spec *photon_receive_task(photon_conn *conn) {
   int64_t type;
   int64_t length;
   uint8_t *message;
@@ -64,6 +88,11 @@ task_spec *photon_get_task(photon_conn *conn) {
   return task;
 }
 
+task_spec *photon_get_task(photon_conn *conn) {
+  photon_request_task(conn);
+  return photon_receive_task(conn);
+}
+
 void photon_task_done(photon_conn *conn) {
   write_message(conn->conn, TASK_DONE, 0, NULL);
 }
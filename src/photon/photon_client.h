@@ -37,6 +37,20 @@ void photon_disconnect(photon_conn *conn);
  */
 void photon_submit(photon_conn *conn, task_spec *task);
 
+/**
+ * Submit a batch of tasks to the local scheduler. All of the tasks are sent in
+ * a single message, so this is much cheaper than calling photon_submit once
+ * per task when submitting many tasks at once.
+ *
+ * @param conn The connection information.
+ * @param tasks An array of the addresses of the tasks to submit.
+ * @param num_tasks The number of tasks in the array.
+ * @return Void.
+ */
+void photon_submit_batch(photon_conn *conn,
+                         task_spec **tasks,
+                         int64_t num_tasks);
+
 /**
  * Log an event to the event log. This will call RPUSH key value. We use RPUSH
  * instead of SET so that it is possible to flush the log multiple times with
@@ -68,6 +82,27 @@ void photon_log_event(photon_conn *conn,
  */
 task_spec *photon_get_task(photon_conn *conn);
 
+/**
+ * Ask the local scheduler for the next task for this client. This only sends
+ * the request, so that the caller can serialize it with the other messages
+ * that are sent on the connection without holding a lock while the scheduler
+ * assigns a task. The task must then be received with photon_receive_task.
+ *
+ * @param conn The connection information.
+ * @return Void.
+ */
+void photon_request_task(photon_conn *conn);
+
+/**
+ * Receive the task that was requested with photon_request_task. This will
+ * block until the scheduler assigns a task to this worker. This allocates and
+ * returns a task, which must be freed by the caller.
+ *
+ * @param conn The connection information.
+ * @return The address of the assigned task.
+ */
+task_spec *photon_receive_task(photon_conn *conn);
+
 /**
  * Tell the local scheduler that the client has finished executing a task.
  *
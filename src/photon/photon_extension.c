@@ -42,6 +42,34 @@ static PyObject *PyPhotonClient_submit(PyObject *self, PyObject *args) {
   Py_RETURN_NONE;
 }
 
+static PyObject *PyPhotonClient_submit_batch(PyObject *self, PyObject *args) {
+  PyObject *py_tasks;
+  if (!PyArg_ParseTuple(args, "O", &py_tasks)) {
+    return NULL;
+  }
+  PyObject *py_task_list = PySequence_Fast(py_tasks, "tasks must be a list");
+  if (py_task_list == NULL) {
+    return NULL;
+  }
+  Py_ssize_t num_tasks = PySequence_Fast_GET_SIZE(py_task_list);
+  task_spec **tasks = malloc(num_tasks * sizeof(task_spec *));
+  for (Py_ssize_t i = 0; i < num_tasks; ++i) {
+    PyObject *py_task = PySequence_Fast_GET_ITEM(py_task_list, i);
+    if (!PyObject_IsInstance(py_task, (PyObject *) &PyTaskType)) {
+      PyErr_SetString(PyExc_TypeError, "tasks must be a list of Task objects");
+      free(tasks);
+      Py_DECREF(py_task_list);
+      return NULL;
+    }
+    tasks[i] = ((PyTask *) py_task)->spec;
+  }
+  photon_submit_batch(((PyPhotonClient *) self)->photon_connection, tasks,
+                      num_tasks);
+  free(tasks);
+  Py_DECREF(py_task_list);
+  Py_RETURN_NONE;
+}
+
 // clang-format off
 static PyObject *PyPhotonClient_get_task(PyObject *self) {
   task_spec *task_spec;
@@ -52,8 +80,23 @@ static PyObject *PyPhotonClient_get_task(PyObject *self) {
   Py_END_ALLOW_THREADS
   return PyTask_make(task_spec);
 }
+
+static PyObject *PyPhotonClient_receive_task(PyObject *self) {
+  task_spec *task_spec;
+  /* Drop the global interpreter lock while we receive a task because
+   * photon_receive_task may block for a long time. */
+  Py_BEGIN_ALLOW_THREADS
+  task_spec = photon_receive_task(((PyPhotonClient *) self)->photon_connection);
+  Py_END_ALLOW_THREADS
+  return PyTask_make(task_spec);
+}
 // clang-format on
 
+static PyObject *PyPhotonClient_request_task(PyObject *self) {
+  photon_request_task(((PyPhotonClient *) self)->photon_connection);
+  Py_RETURN_NONE;
+}
+
 static PyObject *PyPhotonClient_reconstruct_object(PyObject *self,
                                                    PyObject *args) {
   object_id object_id;
@@ -83,8 +126,14 @@ static PyObject *PyPhotonClient_log_event(PyObject *self, PyObject *args) {
 static PyMethodDef PyPhotonClient_methods[] = {
     {"submit", (PyCFunction) PyPhotonClient_submit, METH_VARARGS,
      "Submit a task to the local scheduler."},
+    {"submit_batch", (PyCFunction) PyPhotonClient_submit_batch, METH_VARARGS,
+     "Submit a list of tasks to the local scheduler in one message."},
     {"get_task", (PyCFunction) PyPhotonClient_get_task, METH_NOARGS,
      "Get a task from the local scheduler."},
+    {"request_task", (PyCFunction) PyPhotonClient_request_task, METH_NOARGS,
+     "Ask the local scheduler for a task without waiting for it."},
+    {"receive_task", (PyCFunction) PyPhotonClient_receive_task, METH_NOARGS,
+     "Receive the task that was asked for with request_task."},
     {"reconstruct_object", (PyCFunction) PyPhotonClient_reconstruct_object,
      METH_VARARGS, "Ask the local scheduler to reconstruct an object."},
     {"log_event", (PyCFunction) PyPhotonClient_log_event, METH_VARARGS,
@@ -138,6 +187,8 @@ static PyMethodDef photon_methods[] = {
      "Should the object be passed by value?"},
     {"compute_put_id", compute_put_id, METH_VARARGS,
      "Return the object ID for a put call within a task."},
+    {"compute_return_id", compute_return_id, METH_VARARGS,
+     "Return the object ID of a return value of a task."},
     {"task_from_string", PyTask_from_string, METH_VARARGS,
      "Creates a Python PyTask object from a string representation of "
      "task_spec."},
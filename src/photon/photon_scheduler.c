@@ -3,6 +3,7 @@
 #include <stdio.h>
 #include <stdlib.h>
 #include <sys/socket.h>
+#include <sys/time.h>
 #include <sys/un.h>
 #include <sys/wait.h>
 #include <unistd.h>
@@ -57,6 +58,118 @@ void print_resource_info(const local_scheduler_state *state,
 #endif
 }
 
+/* The types of the requests that are sent to the worker fork server. These
+ * must be kept in sync with python/ray/workers/worker_fork_server.py. */
+enum worker_fork_server_request_type {
+  /** Fork a new worker. */
+  FORK_SERVER_START_WORKER = 0,
+  /** Kill a worker that the fork server forked and wait for it to exit. */
+  FORK_SERVER_KILL_WORKER,
+};
+
+/**
+ * Connect to the worker fork server. Reads and writes on the returned socket
+ * time out after FORK_SERVER_TIMEOUT_MILLISECONDS, so that a stalled fork
+ * server cannot block the event loop of the local scheduler.
+ *
+ * @param state The state of the local scheduler.
+ * @return The file descriptor of the socket, or -1 if the connection failed.
+ */
+static int connect_fork_server(local_scheduler_state *state) {
+  int fd = connect_ipc_sock(state->config.worker_fork_server_socket_name);
+  if (fd < 0) {
+    return -1;
+  }
+  struct timeval timeout;
+  timeout.tv_sec = FORK_SERVER_TIMEOUT_MILLISECONDS / 1000;
+  timeout.tv_usec = (FORK_SERVER_TIMEOUT_MILLISECONDS % 1000) * 1000;
+  if (setsockopt(fd, SOL_SOCKET, SO_RCVTIMEO, &timeout, sizeof(timeout)) != 0 ||
+      setsockopt(fd, SOL_SOCKET, SO_SNDTIMEO, &timeout, sizeof(timeout)) != 0) {
+    close(fd);
+    return -1;
+  }
+  return fd;
+}
+
+/**
+ * Write a buffer to the worker fork server. Unlike write_bytes, this gives up
+ * when the write times out instead of retrying.
+ *
+ * @param fd The socket returned by connect_fork_server.
+ * @param cursor The bytes to write.
+ * @param length The number of bytes to write.
+ * @return 0 if all bytes were written and -1 otherwise.
+ */
+static int write_fork_server(int fd, uint8_t *cursor, size_t length) {
+  while (length > 0) {
+    ssize_t nbytes = write(fd, cursor, length);
+    if (nbytes < 0 && errno == EINTR) {
+      continue;
+    } else if (nbytes <= 0) {
+      return -1;
+    }
+    cursor += nbytes;
+    length -= nbytes;
+  }
+  return 0;
+}
+
+/**
+ * Read a buffer from the worker fork server. Unlike read_bytes, this gives up
+ * when the read times out instead of retrying.
+ *
+ * @param fd The socket returned by connect_fork_server.
+ * @param cursor The buffer to read into.
+ * @param length The number of bytes to read.
+ * @return 0 if all bytes were read and -1 otherwise.
+ */
+static int read_fork_server(int fd, uint8_t *cursor, size_t length) {
+  while (length > 0) {
+    ssize_t nbytes = read(fd, cursor, length);
+    if (nbytes < 0 && errno == EINTR) {
+      continue;
+    } else if (nbytes <= 0) {
+      return -1;
+    }
+    cursor += nbytes;
+    length -= nbytes;
+  }
+  return 0;
+}
+
+/**
+ * Ask the worker fork server to kill a worker that it forked. The request
+ * consists of the 64-bit request type followed by the 64-bit process ID of the
+ * worker. The fork server only kills the process if it is one of its children
+ * that has not been reaped yet, so a reused process ID is never killed. It
+ * replies once it has reaped the worker.
+ *
+ * @param state The state of the local scheduler.
+ * @param pid The process ID of the worker.
+ * @param wait Whether to wait until the worker has exited.
+ * @return Void.
+ */
+void kill_worker_from_fork_server(local_scheduler_state *state,
+                                  pid_t pid,
+                                  bool wait) {
+  int fd = connect_fork_server(state);
+  if (fd < 0) {
+    LOG_WARN("Failed to ask the fork server at %s to kill worker %d",
+             state->config.worker_fork_server_socket_name, pid);
+    return;
+  }
+  int64_t request[2] = {FORK_SERVER_KILL_WORKER, pid};
+  int64_t reply;
+  if (write_fork_server(fd, (uint8_t *) request, sizeof(request)) != 0) {
+    LOG_WARN("Failed to ask the fork server at %s to kill worker %d",
+             state->config.worker_fork_server_socket_name, pid);
+  } else if (wait &&
+             read_fork_server(fd, (uint8_t *) &reply, sizeof(reply)) != 0) {
+    LOG_WARN("Timed out waiting for the fork server to kill worker %d", pid);
+  }
+  close(fd);
+}
+
 /**
  * Kill a worker, if it is a child process, and clean up all of its associated
  * state.
@@ -91,10 +204,14 @@ void kill_worker(local_scheduler_client *worker, bool wait) {
   /* If the worker has registered a process ID with us and it's a child
    * process, use it to send a kill signal. */
   if (worker->is_child && worker->pid != 0) {
-    kill(worker->pid, SIGKILL);
-    if (wait) {
-      /* Wait for the process to exit. */
-      waitpid(worker->pid, NULL, 0);
+    if (worker->is_forked) {
+      kill_worker_from_fork_server(state, worker->pid, wait);
+    } else {
+      kill(worker->pid, SIGKILL);
+      if (wait) {
+        /* Wait for the process to exit. */
+        waitpid(worker->pid, NULL, 0);
+      }
     }
   }
 
@@ -145,6 +262,13 @@ void free_local_scheduler(local_scheduler_state *state) {
     LOG_DEBUG("Killed pid %d", *worker_pid);
   }
   utarray_free(state->child_pids);
+  for (worker_pid = (pid_t *) utarray_front(state->forked_pids);
+       worker_pid != NULL;
+       worker_pid = (pid_t *) utarray_next(state->forked_pids, worker_pid)) {
+    kill_worker_from_fork_server(state, *worker_pid, true);
+    LOG_DEBUG("Killed pid %d", *worker_pid);
+  }
+  utarray_free(state->forked_pids);
 
   /* Free the list of workers and any tasks that are still in progress on those
    * workers. */
@@ -157,6 +281,13 @@ void free_local_scheduler(local_scheduler_state *state) {
   utarray_free(state->workers);
   state->workers = NULL;
 
+  /* The fork server's socket is needed to kill the forked workers, so it is
+   * freed after them. */
+  if (state->config.worker_fork_server_socket_name != NULL) {
+    free((void *) state->config.worker_fork_server_socket_name);
+    state->config.worker_fork_server_socket_name = NULL;
+  }
+
   /* Free the mapping from the actor ID to the ID of the local scheduler
    * responsible for that actor. */
   actor_map_entry *current_actor_map_entry, *temp_actor_map_entry;
@@ -166,6 +297,14 @@ void free_local_scheduler(local_scheduler_state *state) {
     free(current_actor_map_entry);
   }
 
+  /* Free the backoff state of objects that reconstruction was requested for. */
+  reconstruction_entry *current_reconstruction_entry, *temp_reconstruction_entry;
+  HASH_ITER(hh, state->reconstruction_requests, current_reconstruction_entry,
+            temp_reconstruction_entry) {
+    HASH_DEL(state->reconstruction_requests, current_reconstruction_entry);
+    free(current_reconstruction_entry);
+  }
+
   /* Free the algorithm state. */
   free_scheduling_algorithm_state(state->algorithm_state);
   state->algorithm_state = NULL;
@@ -179,6 +318,63 @@ void free_local_scheduler(local_scheduler_state *state) {
   free(state);
 }
 
+/**
+ * Ask the worker fork server to fork a new worker. The request consists of the
+ * 64-bit request type and a 64-bit length followed by the options of the
+ * worker command (the arguments that start with "--") and the actor ID option,
+ * each terminated by a null character. The fork server replies with the 64-bit
+ * process ID of the worker. If the fork server does not answer in time, the
+ * request fails and the caller forks the worker itself.
+ *
+ * @param state The state of the local scheduler.
+ * @param actor_id The ID of the actor for this worker.
+ * @return True if the worker was started and false otherwise.
+ */
+bool start_worker_from_fork_server(local_scheduler_state *state,
+                                   actor_id actor_id) {
+  char id_string[ID_STRING_SIZE];
+  object_id_to_string(actor_id, id_string, ID_STRING_SIZE);
+  const char *actor_id_option = "--actor-id=";
+  const char **command = state->config.start_worker_command;
+  int64_t length = strlen(actor_id_option) + strlen(id_string) + 1;
+  for (int i = 0; command[i] != NULL; ++i) {
+    if (strncmp(command[i], "--", 2) == 0) {
+      length += strlen(command[i]) + 1;
+    }
+  }
+  char *request = malloc(length);
+  char *cursor = request;
+  for (int i = 0; command[i] != NULL; ++i) {
+    if (strncmp(command[i], "--", 2) == 0) {
+      strcpy(cursor, command[i]);
+      cursor += strlen(command[i]) + 1;
+    }
+  }
+  sprintf(cursor, "%s%s", actor_id_option, id_string);
+
+  bool success = false;
+  int fd = connect_fork_server(state);
+  if (fd >= 0) {
+    int64_t request_type = FORK_SERVER_START_WORKER;
+    int64_t pid;
+    if (write_fork_server(fd, (uint8_t *) &request_type,
+                          sizeof(request_type)) == 0 &&
+        write_fork_server(fd, (uint8_t *) &length, sizeof(length)) == 0 &&
+        write_fork_server(fd, (uint8_t *) request, length) == 0 &&
+        read_fork_server(fd, (uint8_t *) &pid, sizeof(pid)) == 0 && pid > 0) {
+      /* The worker is a child of the fork server and not of the local
+       * scheduler, so the local scheduler asks the fork server to kill it. */
+      pid_t worker_pid = (pid_t) pid;
+      utarray_push_back(state->forked_pids, &worker_pid);
+      LOG_DEBUG("Started worker with pid %d from the fork server", worker_pid);
+      success = true;
+    }
+    close(fd);
+  }
+  free(request);
+  return success;
+}
+
 /**
  * Start a new worker as a child process.
  *
@@ -188,6 +384,17 @@ void free_local_scheduler(local_scheduler_state *state) {
 void start_worker(local_scheduler_state *state, actor_id actor_id) {
   /* We can't start a worker if we don't have the path to the worker script. */
   CHECK(state->config.start_worker_command != NULL);
+  /* Fork the worker from the fork server if there is one. This is much faster
+   * than starting a new interpreter, since the fork server has already
+   * imported everything. If the fork server is not available, fall back to
+   * running the worker command. */
+  if (state->config.worker_fork_server_socket_name != NULL) {
+    if (start_worker_from_fork_server(state, actor_id)) {
+      return;
+    }
+    LOG_WARN("Failed to start a worker from the fork server at %s",
+             state->config.worker_fork_server_socket_name);
+  }
   /* Launch the process to create the worker. */
   pid_t pid = fork();
   if (pid != 0) {
@@ -271,6 +478,7 @@ local_scheduler_state *init_local_scheduler(
     bool global_scheduler_exists,
     const double static_resource_conf[],
     const char *start_worker_command,
+    const char *worker_fork_server_socket_name,
     int num_workers) {
   local_scheduler_state *state = malloc(sizeof(local_scheduler_state));
   /* Set the configuration struct for the local scheduler. */
@@ -279,6 +487,12 @@ local_scheduler_state *init_local_scheduler(
   } else {
     state->config.start_worker_command = NULL;
   }
+  if (worker_fork_server_socket_name != NULL) {
+    state->config.worker_fork_server_socket_name =
+        strdup(worker_fork_server_socket_name);
+  } else {
+    state->config.worker_fork_server_socket_name = NULL;
+  }
   state->config.global_scheduler_exists = global_scheduler_exists;
 
   state->loop = loop;
@@ -287,6 +501,8 @@ local_scheduler_state *init_local_scheduler(
   /* Initialize the hash table mapping actor ID to the ID of the local scheduler
    * that is responsible for that actor. */
   state->actor_mapping = NULL;
+  /* Initialize the table of objects that reconstruction was requested for. */
+  state->reconstruction_requests = NULL;
   /* Connect to Redis if a Redis address is provided. */
   if (redis_addr != NULL) {
     int num_args;
@@ -336,6 +552,7 @@ local_scheduler_state *init_local_scheduler(
 
   /* Start the initial set of workers. */
   utarray_new(state->child_pids, &pid_t_icd);
+  utarray_new(state->forked_pids, &pid_t_icd);
   for (int i = 0; i < num_workers; ++i) {
     start_worker(state, NIL_ACTOR_ID);
   }
@@ -406,6 +623,15 @@ void process_plasma_notification(event_loop *loop,
   if (object_info.is_deletion) {
     handle_object_removed(state, object_info.obj_id);
   } else {
+    /* The object is local, so if it gets lost again, reconstruction should
+     * start without backing off. */
+    reconstruction_entry *entry;
+    HASH_FIND(hh, state->reconstruction_requests, &object_info.obj_id,
+              sizeof(object_info.obj_id), entry);
+    if (entry != NULL) {
+      HASH_DEL(state->reconstruction_requests, entry);
+      free(entry);
+    }
     handle_object_available(state, state->algorithm_state, object_info.obj_id);
   }
 }
@@ -438,10 +664,15 @@ void reconstruct_task_update_callback(task *task, void *user_context) {
 void reconstruct_result_lookup_callback(object_id reconstruct_object_id,
                                         task_id task_id,
                                         void *user_context) {
-  /* TODO(swang): The following check will fail if an object was created by a
-   * put. */
-  CHECKM(!IS_NIL_ID(task_id),
-         "No task information found for object during reconstruction");
+  /* TODO(swang): Track task lineage for puts. Objects that were created by a
+   * put have no entry in the result table, so they cannot be reconstructed. */
+  if (IS_NIL_ID(task_id)) {
+    LOG_ERROR(
+        "No task information found for object during reconstruction. The "
+        "object was probably created by a put, and it cannot be "
+        "reconstructed.");
+    return;
+  }
   local_scheduler_state *state = user_context;
   /* Try to claim the responsibility for reconstruction by doing a test-and-set
    * of the task's scheduling state in the global state. If the task's
@@ -471,11 +702,83 @@ void reconstruct_object_lookup_callback(object_id reconstruct_object_id,
   }
 }
 
+/**
+ * Get the current time in milliseconds.
+ *
+ * @return The number of milliseconds since the epoch.
+ */
+static int64_t current_time_ms(void) {
+  struct timeval tv;
+  gettimeofday(&tv, NULL);
+  return (int64_t) tv.tv_sec * 1000 + tv.tv_usec / 1000;
+}
+
+/**
+ * Check whether a reconstruction check for an object is allowed now. Workers
+ * and the fetch timer keep asking for objects that have not appeared yet, most
+ * of which are not lost but still being computed. To avoid a storm of state
+ * table lookups for long-running tasks, the checks for each object are spaced
+ * out with exponential backoff until the object appears locally.
+ *
+ * @param state The local scheduler state.
+ * @param object_id The ID of the object to check.
+ * @return True if the object should be checked now and false otherwise.
+ */
+static bool should_attempt_reconstruction(local_scheduler_state *state,
+                                          object_id object_id) {
+  int64_t now = current_time_ms();
+  reconstruction_entry *entry;
+  HASH_FIND(hh, state->reconstruction_requests, &object_id, sizeof(object_id),
+            entry);
+  if (entry == NULL) {
+    entry = malloc(sizeof(reconstruction_entry));
+    entry->object_id = object_id;
+    entry->backoff = RECONSTRUCTION_INITIAL_BACKOFF_MILLISECONDS;
+    HASH_ADD(hh, state->reconstruction_requests, object_id, sizeof(object_id),
+             entry);
+  } else if (now < entry->next_attempt_time) {
+    return false;
+  }
+  entry->next_attempt_time = now + entry->backoff;
+  entry->backoff = MIN(2 * entry->backoff,
+                       RECONSTRUCTION_MAX_BACKOFF_MILLISECONDS);
+  return true;
+}
+
+/**
+ * Drop the backoff state of the objects that nobody has asked for since they
+ * could have been checked again. Otherwise, the state of objects that are
+ * never sealed locally, for example because the workers that waited for them
+ * died or moved on, would stay around for the lifetime of the local scheduler.
+ *
+ * @param loop The local scheduler event loop.
+ * @param id The ID of the timer.
+ * @param context The local scheduler state.
+ * @return The number of milliseconds until this is called again.
+ */
+int reconstruction_requests_timeout_handler(event_loop *loop,
+                                            timer_id id,
+                                            void *context) {
+  local_scheduler_state *state = context;
+  int64_t now = current_time_ms();
+  reconstruction_entry *entry, *temp_entry;
+  HASH_ITER(hh, state->reconstruction_requests, entry, temp_entry) {
+    if (now > entry->next_attempt_time + RECONSTRUCTION_EXPIRY_MILLISECONDS) {
+      HASH_DEL(state->reconstruction_requests, entry);
+      free(entry);
+    }
+  }
+  return RECONSTRUCTION_EXPIRY_MILLISECONDS;
+}
+
 void reconstruct_object(local_scheduler_state *state,
                         object_id reconstruct_object_id) {
-  LOG_DEBUG("Starting reconstruction");
   /* TODO(swang): Track task lineage for puts. */
   CHECK(state->db != NULL);
+  if (!should_attempt_reconstruction(state, reconstruct_object_id)) {
+    return;
+  }
+  LOG_DEBUG("Starting reconstruction");
   /* Determine if reconstruction is necessary by checking if the object exists
    * on a node. */
   object_table_lookup(state->db, reconstruct_object_id,
@@ -505,6 +808,30 @@ void process_message(event_loop *loop,
     }
 
   } break;
+  case SUBMIT_TASK_BATCH: {
+    uint8_t *message = (uint8_t *) utarray_front(state->input_buffer);
+    int64_t offset = 0;
+    int64_t num_tasks;
+    memcpy(&num_tasks, &message[offset], sizeof(num_tasks));
+    offset += sizeof(num_tasks);
+    /* Actor tasks are handled one at a time. The remaining tasks are handed to
+     * the scheduling algorithm together so that they are dispatched once. */
+    task_spec **specs = malloc(num_tasks * sizeof(task_spec *));
+    int64_t num_specs = 0;
+    for (int64_t i = 0; i < num_tasks; ++i) {
+      task_spec *spec = (task_spec *) &message[offset];
+      offset += TASK_BATCH_PADDED_SIZE(task_spec_size(spec));
+      if (actor_ids_equal(task_spec_actor_id(spec), NIL_ACTOR_ID)) {
+        specs[num_specs++] = spec;
+      } else {
+        handle_actor_task_submitted(state, state->algorithm_state, spec);
+      }
+    }
+    CHECK(offset == length);
+    handle_task_batch_submitted(state, state->algorithm_state, specs,
+                                num_specs);
+    free(specs);
+  } break;
   case TASK_DONE: {
   } break;
   case EVENT_LOG_MESSAGE: {
@@ -574,6 +901,20 @@ void process_message(event_loop *loop,
       }
       ++index;
     }
+    /* Determine if this worker was forked by the worker fork server. */
+    index = 0;
+    for (child_pid = (pid_t *) utarray_front(state->forked_pids);
+         child_pid != NULL;
+         child_pid = (pid_t *) utarray_next(state->forked_pids, child_pid)) {
+      if (*child_pid == info->worker_pid) {
+        worker->is_child = true;
+        worker->is_forked = true;
+        utarray_erase(state->forked_pids, index, 1);
+        LOG_DEBUG("Found matching forked pid %d", info->worker_pid);
+        break;
+      }
+      ++index;
+    }
   } break;
   case GET_TASK: {
     /* If this worker reports a completed task: account for resources. */
@@ -641,6 +982,7 @@ void new_client_connection(event_loop *loop,
   worker->task_in_progress = NULL;
   worker->pid = 0;
   worker->is_child = false;
+  worker->is_forked = false;
   worker->actor_id = NIL_ACTOR_ID;
   worker->local_scheduler_state = state;
   utarray_push_back(state->workers, &worker);
@@ -736,6 +1078,7 @@ void start_server(const char *node_ip_address,
                   bool global_scheduler_exists,
                   const double static_resource_conf[],
                   const char *start_worker_command,
+                  const char *worker_fork_server_socket_name,
                   int num_workers) {
   /* Ignore SIGPIPE signals. If we don't do this, then when we attempt to write
    * to a client that has already died, the local scheduler could die. */
@@ -746,7 +1089,7 @@ void start_server(const char *node_ip_address,
       node_ip_address, loop, redis_addr, redis_port, socket_name,
       plasma_store_socket_name, plasma_manager_socket_name,
       plasma_manager_address, global_scheduler_exists, static_resource_conf,
-      start_worker_command, num_workers);
+      start_worker_command, worker_fork_server_socket_name, num_workers);
   /* Register a callback for registering new clients. */
   event_loop_add_file(loop, fd, EVENT_LOOP_READ, new_client_connection,
                       g_state);
@@ -779,6 +1122,10 @@ void start_server(const char *node_ip_address,
   /* Create a timer for fetching queued tasks' missing object dependencies. */
   event_loop_add_timer(loop, LOCAL_SCHEDULER_FETCH_TIMEOUT_MILLISECONDS,
                        fetch_object_timeout_handler, g_state);
+  /* Create a timer for expiring the backoff state of objects that are no
+   * longer waited on. */
+  event_loop_add_timer(loop, RECONSTRUCTION_EXPIRY_MILLISECONDS,
+                       reconstruction_requests_timeout_handler, g_state);
   /* Run event loop. */
   event_loop_run(loop);
 }
@@ -805,11 +1152,13 @@ int main(int argc, char *argv[]) {
   double static_resource_conf[MAX_RESOURCE_INDEX];
   /* The command to run when starting new workers. */
   char *start_worker_command = NULL;
+  /* The socket of the worker fork server. */
+  char *worker_fork_server_socket_name = NULL;
   /* The number of workers to start. */
   char *num_workers_str = NULL;
   int c;
   bool global_scheduler_exists = true;
-  while ((c = getopt(argc, argv, "s:r:p:m:ga:h:c:w:n:")) != -1) {
+  while ((c = getopt(argc, argv, "s:r:p:m:ga:h:c:w:z:n:")) != -1) {
     switch (c) {
     case 's':
       scheduler_socket_name = optarg;
@@ -838,6 +1187,9 @@ int main(int argc, char *argv[]) {
     case 'w':
       start_worker_command = optarg;
       break;
+    case 'z':
+      worker_fork_server_socket_name = optarg;
+      break;
     case 'n':
       num_workers_str = optarg;
       break;
@@ -917,6 +1269,7 @@ int main(int argc, char *argv[]) {
   start_server(node_ip_address, scheduler_socket_name, redis_addr, redis_port,
                plasma_store_socket_name, plasma_manager_socket_name,
                plasma_manager_address, global_scheduler_exists,
-               static_resource_conf, start_worker_command, num_workers);
+               static_resource_conf, start_worker_command,
+               worker_fork_server_socket_name, num_workers);
 }
 #endif
@@ -57,7 +57,9 @@ void process_plasma_notification(event_loop *loop,
  * Reconstruct an object. If the object does not exist on any nodes, according
  * to the state tables, and if the object is not already being reconstructed,
  * this triggers a single reexecution of the task that originally created the
- * object.
+ * object. Repeated requests for an object that has not appeared locally are
+ * checked with exponential backoff, so callers may request reconstruction of
+ * an object as often as they like.
  *
  * @param state The local scheduler state.
  * @param object_id The ID of the object to reconstruct.
@@ -81,6 +83,7 @@ local_scheduler_state *init_local_scheduler(
     bool global_scheduler_exists,
     const double static_resource_vector[],
     const char *worker_path,
+    const char *worker_fork_server_socket_name,
     int num_workers);
 
 void free_local_scheduler(local_scheduler_state *state);
@@ -95,7 +98,8 @@ void process_message(event_loop *loop,
 void kill_worker(local_scheduler_client *worker, bool wait);
 
 /**
- * Start a new worker by forking.
+ * Start a new worker by forking, or by asking the worker fork server to fork
+ * one if the local scheduler was configured with a fork server.
  *
  * @param state The local scheduler state.
  * @param actor_id The ID of the actor for this worker. If this worker is not an
@@ -154,6 +154,18 @@ void object_created(eviction_state *eviction_state,
   add_object_to_lru_cache(eviction_state, obj_id);
 }
 
+void object_deleted(eviction_state *eviction_state,
+                    plasma_store_info *plasma_store_info,
+                    object_id obj_id) {
+  object_table_entry *entry;
+  HASH_FIND(handle, plasma_store_info->objects, &obj_id, sizeof(obj_id), entry);
+  CHECK(entry != NULL);
+  /* Objects that are not being used are in the LRU cache. */
+  remove_object_from_lru_cache(eviction_state, obj_id);
+  eviction_state->memory_used -=
+      (entry->info.data_size + entry->info.metadata_size);
+}
+
 bool require_space(eviction_state *eviction_state,
                    plasma_store_info *plasma_store_info,
                    int64_t size,
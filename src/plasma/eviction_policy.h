@@ -119,6 +119,21 @@ void end_object_access(eviction_state *eviction_state,
                        int64_t *num_objects_to_evict,
                        object_id **objects_to_evict);
 
+/**
+ * This method will be called when an object that is not being used is deleted
+ * from the Plasma store at the request of a client, so that the eviction
+ * policy stops tracking it.
+ *
+ * @param eviction_state The state managed by the eviction policy.
+ * @param plasma_store_info Information about the Plasma store that is exposed
+ *        to the eviction policy.
+ * @param obj_id The object ID of the object that will be deleted.
+ * @return Void.
+ */
+void object_deleted(eviction_state *eviction_state,
+                    plasma_store_info *plasma_store_info,
+                    object_id obj_id);
+
 /**
  * Choose some objects to evict from the Plasma store. When this method is
  * called, the eviction policy will assume that the objects chosen to be evicted
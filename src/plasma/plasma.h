@@ -106,6 +106,9 @@ typedef struct {
   object_state state;
   /** The digest of the object. Used to see if two objects are the same. */
   unsigned char digest[DIGEST_SIZE];
+  /** True if a client requested that this object be deleted while it was
+   *  being used. The object is deleted once no client is using it. */
+  bool delete_when_released;
 } object_table_entry;
 
 /** The plasma store information that is exposed to the eviction policy. */
@@ -524,8 +524,22 @@ void plasma_seal(plasma_connection *conn, object_id object_id) {
 }
 
 void plasma_delete(plasma_connection *conn, object_id object_id) {
-  /* TODO(rkn): In the future, we can use this method to give hints to the
-   * eviction policy about when an object will no longer be needed. */
+  /* Perform any pending releases of this object right away, so that the store
+   * does not have to wait for this client to release the object before it can
+   * delete it. */
+  pending_release *element, *temp;
+  DL_FOREACH_SAFE(conn->release_history, element, temp) {
+    if (object_ids_equal(element->object_id, object_id)) {
+      plasma_perform_release(conn, object_id);
+      DL_DELETE(conn->release_history, element);
+      free(element);
+      conn->release_history_length -= 1;
+    }
+  }
+  /* The store deletes the object once no client is using it. No reply is
+   * sent. */
+  CHECK(plasma_send_DeleteRequest(conn->store_conn, conn->builder, object_id) >=
+        0);
 }
 
 int64_t plasma_evict(plasma_connection *conn, int64_t num_bytes) {
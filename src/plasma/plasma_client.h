@@ -183,11 +183,9 @@ bool plasma_compute_object_hash(plasma_connection *conn,
 void plasma_seal(plasma_connection *conn, object_id object_id);
 
 /**
- * Delete an object from the object store. This currently assumes that the
- * object is present and has been sealed.
- *
- * @todo We may want to allow the deletion of objects that are not present or
- *       haven't been sealed.
+ * Delete an object from the object store. If other clients are using the
+ * object, the store deletes it once they have all released it. Objects that
+ * are not present or have not been sealed are not deleted.
  *
  * @param conn The object containing the connection state.
  * @param object_id The ID of the object to delete.
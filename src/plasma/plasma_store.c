@@ -220,6 +220,7 @@ int create_object(client *client_context,
   entry->map_size = map_size;
   entry->offset = offset;
   entry->state = PLASMA_CREATED;
+  entry->delete_when_released = false;
   utarray_new(entry->clients, &client_icd);
   HASH_ADD(handle, plasma_state->plasma_store_info->objects, object_id,
            sizeof(object_id), entry);
@@ -522,6 +523,14 @@ int remove_client_from_object_clients(object_table_entry *entry,
                           &objects_to_evict);
         remove_objects(client_info->plasma_state, num_objects_to_evict,
                        objects_to_evict);
+        /* If a client asked to delete the object while it was being used,
+         * delete it now. */
+        if (entry->delete_when_released) {
+          object_deleted(client_info->plasma_state->eviction_state,
+                         client_info->plasma_state->plasma_store_info,
+                         entry->object_id);
+          delete_object(client_info->plasma_state, entry->object_id);
+        }
       }
       /* Return 1 to indicate that the client was removed. */
       return 1;
@@ -541,6 +550,23 @@ void release_object(client *client_context, object_id object_id) {
   CHECK(remove_client_from_object_clients(entry, client_context) == 1);
 }
 
+void delete_object_when_released(client *client_context, object_id object_id) {
+  plasma_store_state *plasma_state = client_context->plasma_state;
+  object_table_entry *entry;
+  HASH_FIND(handle, plasma_state->plasma_store_info->objects, &object_id,
+            sizeof(object_id), entry);
+  if (entry == NULL || entry->state != PLASMA_SEALED) {
+    return;
+  }
+  if (utarray_len(entry->clients) > 0) {
+    entry->delete_when_released = true;
+    return;
+  }
+  object_deleted(plasma_state->eviction_state, plasma_state->plasma_store_info,
+                 object_id);
+  delete_object(plasma_state, object_id);
+}
+
 /* Check if an object is present. */
 int contains_object(client *client_context, object_id object_id) {
   plasma_store_state *plasma_state = client_context->plasma_state;
@@ -750,6 +776,10 @@ void process_message(event_loop *loop,
     plasma_read_ReleaseRequest(input, &object_ids[0]);
     release_object(client_context, object_ids[0]);
     break;
+  case MessageType_PlasmaDeleteRequest:
+    plasma_read_DeleteRequest(input, &object_ids[0]);
+    delete_object_when_released(client_context, object_ids[0]);
+    break;
   case MessageType_PlasmaContainsRequest:
     plasma_read_ContainsRequest(input, &object_ids[0]);
     if (contains_object(client_context, object_ids[0]) == OBJECT_FOUND) {
@@ -88,6 +88,17 @@ void seal_object(client *client_context,
                  object_id object_id,
                  unsigned char digest[]);
 
+/**
+ * Delete an object at the request of a client. If other clients are using the
+ * object, it is deleted once they have all released it. Requests to delete
+ * objects that are not present or have not been sealed are ignored.
+ *
+ * @param client_context The context of the client making this request.
+ * @param object_id Object ID of the object to be deleted.
+ * @return Void.
+ */
+void delete_object_when_released(client *client_context, object_id object_id);
+
 /**
  * Check if the plasma store contains an object:
  *
@@ -114,6 +125,8 @@ void send_notifications(event_loop *loop,
                         void *plasma_state,
                         int events);
 
+void delete_object(plasma_store_state *plasma_state, object_id object_id);
+
 void remove_objects(plasma_store_state *plasma_state,
                     int64_t num_objects_to_evict,
                     object_id *objects_to_evict);
@@ -70,6 +70,23 @@ class ActorAPI(unittest.TestCase):
 
     ray.worker.cleanup()
 
+  def testRemoteBatch(self):
+    ray.init(num_workers=0)
+
+    @ray.actor
+    class Actor(object):
+      def __init__(self):
+        self.value = 0
+      def increase(self, amount):
+        self.value += amount
+        return self.value
+
+    actor = Actor()
+    object_ids = actor.increase.remote_batch([(1,) for _ in range(100)])
+    self.assertEqual(ray.get(object_ids), list(range(1, 101)))
+
+    ray.worker.cleanup()
+
   def testNoArgs(self):
     ray.init(num_workers=0)
 
@@ -3,6 +3,7 @@ from __future__ import division
 from __future__ import print_function
 
 import os
+import subprocess
 import unittest
 import ray
 import sys
@@ -36,6 +37,20 @@ class MicroBenchmarkTest(unittest.TestCase):
     print("    worst:           {}".format(elapsed_times[999]))
     # average_elapsed_time should be about 0.00038
 
+    # measure the time required to submit a batch of remote tasks to the scheduler
+    elapsed_times = []
+    for _ in range(100):
+      start_time = time.time()
+      test_functions.empty_function.remote_batch(100 * [()])
+      end_time = time.time()
+      elapsed_times.append((end_time - start_time) / 100)
+    elapsed_times = np.sort(elapsed_times)
+    average_elapsed_time = sum(elapsed_times) / 100
+    print("Time per task required to submit a batch of 100 empty function calls:")
+    print("    Average: {}".format(average_elapsed_time))
+    print("    90th percentile: {}".format(elapsed_times[90]))
+    print("    99th percentile: {}".format(elapsed_times[99]))
+
     # measure the time required to submit a remote task to the scheduler (where the remote task returns one value)
     elapsed_times = []
     for _ in range(1000):
@@ -85,6 +100,24 @@ class MicroBenchmarkTest(unittest.TestCase):
     print("    worst:           {}".format(elapsed_times[999]))
     # average_elapsed_time should be about 0.00087
 
+    # measure the time required to put and get a list of floats, an array with
+    # the same values and a record array
+    for value, description in [(np.random.normal(size=100000).tolist(), "a list of 100000 floats"),
+                               (np.random.normal(size=100000), "an array of 100000 floats"),
+                               (np.zeros(100000, dtype=[("x", np.float64), ("y", np.int32)]), "a record array of 100000 records")]:
+      elapsed_times = []
+      for _ in range(100):
+        start_time = time.time()
+        ray.get(ray.put(value))
+        end_time = time.time()
+        elapsed_times.append(end_time - start_time)
+      elapsed_times = np.sort(elapsed_times)
+      average_elapsed_time = sum(elapsed_times) / 100
+      print("Time required to put and get {}:".format(description))
+      print("    Average: {}".format(average_elapsed_time))
+      print("    90th percentile: {}".format(elapsed_times[90]))
+      print("    99th percentile: {}".format(elapsed_times[99]))
+
     ray.worker.cleanup()
 
   def testCache(self):
@@ -111,5 +144,39 @@ class MicroBenchmarkTest(unittest.TestCase):
 
     ray.worker.cleanup()
 
+  def testStartupTiming(self):
+    # measure the time required to import ray in a new interpreter
+    import_script = ("import sys, time\n"
+                     "start_time = time.time()\n"
+                     "import ray\n"
+                     "print(time.time() - start_time)\n"
+                     "print(' '.join(sorted(set(['colorama', 'psutil', 'multiprocessing', 'tarfile']) & set(sys.modules))))\n")
+    elapsed_times = []
+    for _ in range(5):
+      output = subprocess.check_output([sys.executable, "-c", import_script])
+      elapsed_time, eagerly_imported = output.decode("ascii").split("\n")[:2]
+      elapsed_times.append(float(elapsed_time))
+      # These modules are only imported when they are needed.
+      self.assertEqual(eagerly_imported, "")
+    elapsed_times = np.sort(elapsed_times)
+    print("Time required to import ray:")
+    print("    Average: {}".format(sum(elapsed_times) / 5))
+    print("    worst:   {}".format(elapsed_times[4]))
+
+    # measure the time required to start ray
+    start_time = time.time()
+    ray.init(num_workers=1)
+    print("Time required to start ray: {}".format(time.time() - start_time))
+
+    # measure the time required to run the first task of a new remote function
+    @ray.remote
+    def f():
+      return 1
+    start_time = time.time()
+    ray.get(f.remote())
+    print("Time required to run the first task: {}".format(time.time() - start_time))
+
+    ray.worker.cleanup()
+
 if __name__ == "__main__":
   unittest.main(verbosity=2)
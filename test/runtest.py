@@ -2,6 +2,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import hashlib
 import os
 import unittest
 import ray
@@ -10,6 +11,7 @@ import time
 import shutil
 import string
 import sys
+import threading
 from collections import namedtuple
 
 if sys.version_info >= (3, 0):
@@ -181,6 +183,98 @@ class SerializationTest(unittest.TestCase):
 
     ray.worker.cleanup()
 
+  def testListsOfRegisteredObjects(self):
+    ray.init(num_workers=0)
+
+    class Record(object):
+      def __init__(self, i):
+        self.value = float(i)
+        self.name = str(i)
+        self.point = Point(i, -i)
+
+    ray.register_class(Point)
+    ray.register_class(Record)
+
+    # Long lists of instances of one registered class are serialized column by
+    # column. Lists that mix classes or whose instances have different fields
+    # are serialized one instance at a time.
+    records = [Record(i) for i in range(100)]
+    odd_records = [Record(i) for i in range(100)]
+    odd_records[50].extra = [1, 2, 3]
+    del odd_records[60].name
+    values = [[Point(i, i * 2) for i in range(100)], records, odd_records,
+              [Point(1, 2)] * 50 + [Record(1)] * 50, {"records": records}]
+    for value in values:
+      result = ray.get(ray.put(value))
+      self.assertEqual(type(result), type(value))
+      result = result["records"] if isinstance(value, dict) else result
+      value = value["records"] if isinstance(value, dict) else value
+      self.assertEqual([type(obj) for obj in result], [type(obj) for obj in value])
+      self.assertEqual([obj if isinstance(obj, Point) else obj.__dict__ for obj in result],
+                       [obj if isinstance(obj, Point) else obj.__dict__ for obj in value])
+
+    ray.worker.cleanup()
+
+  def testPickledObjectsWithLargeArrays(self):
+    ray.init(num_workers=0)
+
+    class ArrayHolder(object):
+      def __init__(self):
+        self.large = np.random.normal(size=[100, 100])
+        self.same_large = self.large
+        self.small = np.arange(3)
+        self.records = np.zeros(10000, dtype=[("x", np.float64), ("y", np.int8)])
+        self.objects = np.array([1, "a"] * 10000, dtype=object)
+
+    ray.register_class(ArrayHolder, pickle=True)
+
+    # Large arrays are stored next to the pickle in the object store, so they
+    # are read without a copy and are not writeable. Small arrays and arrays
+    # of Python objects are part of the pickle.
+    holder = ArrayHolder()
+    result = ray.get(ray.put(holder))
+    for field in ["large", "small", "records", "objects"]:
+      assert_equal(getattr(result, field), getattr(holder, field))
+      self.assertEqual(getattr(result, field).dtype, getattr(holder, field).dtype)
+    self.assertIs(result.same_large, result.large)
+    self.assertFalse(result.large.flags.writeable)
+    self.assertFalse(result.records.flags.writeable)
+    self.assertTrue(result.small.flags.writeable)
+    self.assertTrue(result.objects.flags.writeable)
+
+    ray.worker.cleanup()
+
+  def testInliningSmallArguments(self):
+    ray.init(num_workers=1)
+
+    @ray.remote
+    def f(x):
+      return x
+
+    def num_puts():
+      return ray.worker.global_worker.thread_context().put_index
+
+    # Small arguments are passed in the task spec and are not put in the object
+    # store.
+    small_args = [np.arange(50), {"a": np.zeros(3), "b": [1, 2]}, (1, "hi")]
+    put_index = num_puts()
+    for arg in small_args:
+      assert_equal(arg, ray.get(f.remote(arg)))
+    self.assertEqual(num_puts(), put_index)
+
+    # Large arguments are put in the object store.
+    large_args = [np.arange(10000), [np.zeros(1000)]]
+    for arg in large_args:
+      assert_equal(arg, ray.get(f.remote(arg)))
+    self.assertEqual(num_puts(), put_index + len(large_args))
+
+    # Inlining can be turned off.
+    ray.experimental.set_inline_argument_threshold(0)
+    assert_equal(small_args[0], ray.get(f.remote(small_args[0])))
+    self.assertEqual(num_puts(), put_index + len(large_args) + 1)
+
+    ray.worker.cleanup()
+
 class WorkerTest(unittest.TestCase):
 
   def testPythonWorkers(self):
@@ -199,6 +293,28 @@ class WorkerTest(unittest.TestCase):
     self.assertEqual(values, [1] * (num_workers * 2))
     ray.worker.cleanup()
 
+  def testWorkerForkServer(self):
+    ray.init(num_workers=2)
+
+    @ray.remote
+    def f():
+      time.sleep(0.1)
+      return os.getpid(), os.getppid(), np.random.randint(2 ** 30)
+
+    # The workers are forked from the fork server, and they do not share the
+    # state of their random number generators.
+    fork_servers = ray.services.all_processes[ray.services.PROCESS_TYPE_WORKER_FORK_SERVER]
+    self.assertEqual(len(fork_servers), 1)
+    results = ray.get([f.remote() for _ in range(10)])
+    self.assertEqual(len(set(pid for pid, _, _ in results)), 2)
+    self.assertEqual(set(ppid for _, ppid, _ in results), {fork_servers[0].pid})
+    worker_random_values = {}
+    for pid, _, value in results:
+      worker_random_values.setdefault(pid, set()).add(value)
+    self.assertEqual(len(set.intersection(*worker_random_values.values())), 0)
+
+    ray.worker.cleanup()
+
   def testPutGet(self):
     ray.init(num_workers=0)
 
@@ -228,6 +344,101 @@ class WorkerTest(unittest.TestCase):
 
     ray.worker.cleanup()
 
+  def testPutGetArrays(self):
+    ray.init(num_workers=1)
+
+    # Contiguous and non-contiguous arrays should round trip.
+    arrays = [np.random.normal(size=[100, 100]),
+              np.arange(100, dtype=np.int8),
+              np.zeros([], dtype=np.uint32),
+              np.zeros([0, 5], dtype=np.float32),
+              np.random.normal(size=[10, 10])[:, ::2],
+              np.random.normal(size=[10, 10]).T]
+    for array in arrays:
+      result = ray.get(ray.put(array))
+      assert_equal(result, array)
+      self.assertEqual(result.dtype, array.dtype)
+      self.assertFalse(result.flags.writeable)
+
+    # Arrays can be created in the object store and filled in place.
+    object_id, array = ray.experimental.create_array([3, 4], np.float64)
+    self.assertEqual(array.shape, (3, 4))
+    array[:] = np.arange(12).reshape(3, 4)
+    ray.experimental.seal_array(object_id)
+    self.assertFalse(array.flags.writeable)
+    assert_equal(ray.get(object_id), np.arange(12).reshape(3, 4))
+
+    @ray.remote
+    def f(x):
+      return x.sum()
+    self.assertEqual(ray.get(f.remote(object_id)), 66)
+
+    self.assertRaises(TypeError, lambda: ray.experimental.create_array([2], object))
+
+    ray.worker.cleanup()
+
+  def testPutGetNonNumericArrays(self):
+    ray.init(num_workers=0)
+
+    # Arrays without Python objects are stored as raw data and are not copied
+    # when they are retrieved.
+    records = np.zeros(100, dtype=[("x", np.float64), ("y", np.int32, (2,)), ("name", "S8")])
+    records["x"] = np.arange(100)
+    records["name"] = b"record"
+    arrays = [records, records[::3], records.reshape(10, 10),
+              np.array(["hi", "there"]), np.array([b"a", b"bc"]),
+              np.array([True, False]), np.arange(10, dtype=np.float16),
+              np.arange(10, dtype=np.complex128), np.zeros([], dtype="S3"),
+              np.zeros([0, 3], dtype="U5"),
+              np.array(["2017-01-01", "2017-06-01"], dtype="datetime64[D]"),
+              np.zeros(3, dtype=np.dtype([("x", "f8"), ("y", "i1")], align=True)),
+              np.zeros(3, dtype=np.dtype({"names": ["a", "b"], "formats": ["i4", "f8"],
+                                          "offsets": [0, 16], "itemsize": 32}))]
+    for array in arrays:
+      result = ray.get(ray.put(array))
+      assert_equal(result, array)
+      self.assertEqual(result.dtype, array.dtype)
+      self.assertEqual(result.dtype.names, array.dtype.names)
+      self.assertEqual(result.dtype.itemsize, array.dtype.itemsize)
+      self.assertEqual(result.shape, array.shape)
+      self.assertFalse(result.flags.writeable)
+
+    # Arrays of Python objects keep their shape and elements, including
+    # elements that are sequences.
+    objects = np.empty([2, 2], dtype=object)
+    objects[0, 0] = [1, 2]
+    objects[0, 1] = (3, 4)
+    objects[1, 0] = "five"
+    objects[1, 1] = None
+    arrays = [objects, np.array([1.5, "a", None], dtype=object),
+              np.array([float(i) for i in range(1000)], dtype=object)]
+    for array in arrays:
+      result = ray.get(ray.put(array))
+      self.assertEqual(result.dtype, array.dtype)
+      self.assertEqual(result.shape, array.shape)
+      self.assertEqual(result.tolist(), array.tolist())
+
+    ray.worker.cleanup()
+
+  def testPutGetSmallObjects(self):
+    ray.init(num_workers=0)
+
+    # Small values of builtin types are stored in a compact encoding. Values
+    # that are too large or contain other types are stored with Arrow, so
+    # check values on both sides of the limit.
+    values = [None, True, False, 0, -1, 1 << 62, 0.5, "", "a", u"\u262F",
+              b"bytes", [], (), {}, [1, 2.0, "three"], (None, (True,)),
+              {"a": [1, {"b": (2, 3)}], (1, 2): None}, [[[[[[]]]]]],
+              "h" * 1000, "h" * 2000, list(range(100)), list(range(1000)),
+              [np.int64(1)], {"x": Point(1, 2)}]
+    for value in values:
+      result = ray.get(ray.put(value))
+      self.assertEqual(result, value)
+      self.assertEqual(type(result), type(value))
+    self.assertEqual(type(ray.get(ray.put({"x": Point(1, 2)}))["x"]), Point)
+
+    ray.worker.cleanup()
+
 class APITest(unittest.TestCase):
 
   def testRegisterClass(self):
@@ -360,6 +571,99 @@ class APITest(unittest.TestCase):
 
     ray.worker.cleanup()
 
+  def testDefiningManyRemoteFunctions(self):
+    # Define many remote functions before and after starting Ray so that the
+    # workers import many exports at once.
+    def make_remote_function(i):
+      @ray.remote
+      def f():
+        return i
+      return f
+    functions = [make_remote_function(i) for i in range(100)]
+    ray.init(num_workers=2)
+    functions += [make_remote_function(i) for i in range(100, 200)]
+    self.assertEqual(ray.get([f.remote() for f in functions]), list(range(200)))
+
+    ray.worker.cleanup()
+
+  def testRedefiningIdenticalRemoteFunctions(self):
+    ray.init(num_workers=1)
+    redis_client = ray.worker.global_worker.redis_client
+
+    def define_f():
+      @ray.remote
+      def f():
+        return 1
+      return f
+
+    f = define_f()
+    self.assertEqual(ray.get(f.remote()), 1)
+    num_function_blobs = len(redis_client.keys(b"FunctionBlob:*"))
+    # Redefining the same function does not store the function again, and the
+    # worker does not import it again.
+    for _ in range(3):
+      f = define_f()
+      self.assertEqual(ray.get(f.remote()), 1)
+    self.assertEqual(len(redis_client.keys(b"FunctionBlob:*")), num_function_blobs)
+    function_id = hashlib.sha256(f.func_name.encode("ascii")).digest()[:20]
+    self.assertEqual(redis_client.llen("FunctionTable:{}".format(function_id)), 1)
+
+    # Large functions are stored compressed.
+    data = np.zeros(10 ** 5)
+    @ray.remote
+    def g():
+      return data.sum()
+    self.assertEqual(ray.get(g.remote()), 0)
+    pickled_data = ray.pickling.dumps(data)
+    blob = ray.worker.encode_function_blob(pickled_data)
+    self.assertLess(len(blob), len(pickled_data))
+    self.assertEqual(ray.worker.decode_function_blob(blob), pickled_data)
+
+    ray.worker.cleanup()
+
+  def testRemoteBatch(self):
+    ray.init(num_workers=3)
+
+    @ray.remote
+    def f(x, y=10):
+      return x + y
+
+    @ray.remote(num_return_vals=2)
+    def g(x):
+      return x, x + 1
+
+    object_ids = f.remote_batch([(i,) for i in range(100)])
+    self.assertEqual(ray.get(object_ids), [i + 10 for i in range(100)])
+    object_ids = f.remote_batch([(i, i) for i in range(100)])
+    self.assertEqual(ray.get(object_ids), [2 * i for i in range(100)])
+    # Arguments that are object IDs and arguments that must be put in the
+    # object store should work too.
+    x = ray.put(1)
+    self.assertEqual(ray.get(f.remote_batch([(x,), (np.ones(3), 1)])[0]), 11)
+    results = g.remote_batch([(i,) for i in range(10)])
+    self.assertEqual([ray.get(ids) for ids in results], [[i, i + 1] for i in range(10)])
+    self.assertEqual(f.remote_batch([]), [])
+
+    ray.worker.cleanup()
+
+  def testManyObjectArguments(self):
+    ray.init(num_workers=1)
+
+    @ray.remote
+    def f(*xs):
+      return sum(xs)
+
+    @ray.remote
+    def g(i):
+      return i
+
+    xs = [g.remote(i) for i in range(100)]
+    self.assertEqual(ray.get(f.remote(*xs)), sum(range(100)))
+    # The same object ID may be passed multiple times and mixed with values.
+    self.assertEqual(ray.get(f.remote(xs[1], 2, xs[1], ray.put(3), xs[1])), 8)
+
+    ray.worker.cleanup()
+
   def testGetMultiple(self):
     ray.init(num_workers=0)
     object_ids = [ray.put(i) for i in range(10)]
@@ -402,6 +706,117 @@ class APITest(unittest.TestCase):
 
     ray.worker.cleanup()
 
+  def testAsCompleted(self):
+    ray.init(num_workers=2)
+
+    @ray.remote
+    def f(delay, i):
+      time.sleep(delay)
+      return i
+
+    # Objects are yielded in the order in which they finish.
+    objectids = [f.remote(1.0, 0), f.remote(0.1, 1), f.remote(0.5, 2)]
+    batches = list(ray.as_completed(objectids))
+    self.assertEqual(batches, [[objectids[1]], [objectids[2]], [objectids[0]]])
+
+    # Objects that are already ready are yielded in batches.
+    objectids = [ray.put(i) for i in range(10)]
+    batches = list(ray.as_completed(objectids, batch_size=4))
+    self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+    self.assertEqual(sum(batches, []), objectids)
+
+    # The values can be yielded instead of the IDs.
+    objectids = [f.remote(0, i) for i in range(20)]
+    values = sum(ray.as_completed(objectids, batch_size=3, fetch_values=True), [])
+    self.assertEqual(sorted(values), list(range(20)))
+
+    # Verify that calling as_completed with duplicate object IDs throws an
+    # exception.
+    x = ray.put(1)
+    self.assertRaises(Exception, lambda : list(ray.as_completed([x, x])))
+
+    ray.worker.cleanup()
+
+  @unittest.skipIf(sys.version_info < (3, 5), "asyncio requires Python 3.5.")
+  def testGetAsyncAndWaitAsync(self):
+    import asyncio
+    ray.init(num_workers=1)
+
+    @ray.remote
+    def f(delay):
+      time.sleep(delay)
+      return delay
+
+    loop = asyncio.get_event_loop()
+    self.assertEqual(loop.run_until_complete(ray.get_async(f.remote(0))), 0)
+    object_ids = [f.remote(0.5), f.remote(0), ray.put(1)]
+    self.assertEqual(loop.run_until_complete(ray.get_async(object_ids)), [0.5, 0, 1])
+
+    # Other callbacks should be able to run on the event loop while we wait for
+    # the result.
+    ticks = []
+    for i in range(3):
+      loop.call_later(0.1 * i, ticks.append, i)
+    self.assertEqual(loop.run_until_complete(ray.get_async(f.remote(0.5))), 0.5)
+    self.assertEqual(ticks, [0, 1, 2])
+
+    object_ids = [f.remote(1.0), f.remote(0.2), f.remote(0.2)]
+    ready_ids, remaining_ids = loop.run_until_complete(ray.wait_async(object_ids))
+    self.assertEqual(len(ready_ids), 1)
+    self.assertEqual(len(remaining_ids), 2)
+    ready_ids, remaining_ids = loop.run_until_complete(ray.wait_async(object_ids, num_returns=3))
+    self.assertEqual(set(ready_ids), set(object_ids))
+    self.assertEqual(remaining_ids, [])
+    object_ids = [f.remote(1.0)]
+    ready_ids, remaining_ids = loop.run_until_complete(ray.wait_async(object_ids, timeout=100))
+    self.assertEqual(ready_ids, [])
+    self.assertEqual(remaining_ids, object_ids)
+
+    ray.worker.cleanup()
+
+  def testMultithreading(self):
+    ray.init(num_workers=2)
+
+    @ray.remote
+    def f(x):
+      return x + 1
+
+    def run_in_thread(i):
+      # Use put, get, wait, and task submission from this thread.
+      x = ray.put(i)
+      assert ray.get(x) == i
+      object_ids = [f.remote(x) for _ in range(10)]
+      ready_ids, _ = ray.wait(object_ids, num_returns=10)
+      assert len(ready_ids) == 10
+      return ray.get(object_ids) + ray.get(f.remote_batch([(i,), (i,)]))
+
+    threads = []
+    results = {}
+    for i in range(10):
+      t = threading.Thread(target=lambda i=i: results.update({i: run_in_thread(i)}))
+      threads.append(t)
+      t.start()
+    for t in threads:
+      t.join()
+    for i in range(10):
+      self.assertEqual(results[i], 12 * [i + 1])
+
+    # Object IDs created from different threads must be distinct.
+    object_ids = []
+    lock = threading.Lock()
+    def put_in_thread():
+      ids = [ray.put(0) for _ in range(100)]
+      with lock:
+        object_ids.extend(ids)
+    threads = [threading.Thread(target=put_in_thread) for _ in range(5)]
+    for t in threads:
+      t.start()
+    for t in threads:
+      t.join()
+    self.assertEqual(len(set([object_id.id() for object_id in object_ids])), 500)
+
+    ray.worker.cleanup()
+
   def testMultipleWaitsAndGets(self):
     # It is important to use three workers here, so that the three tasks
     # launched in this experiment can run at the same time.
@@ -579,6 +994,9 @@ class APITest(unittest.TestCase):
     # Wait for the event to appear in the event log.
     wait_for_num_events(1)
     self.assertEqual(len(events()), 1)
+    logged_events = ray.event_log.decode_events(events()[0][0])
+    self.assertIn(("event_type1", ray.worker.LOG_POINT, {"key": "val"}),
+                  [event[1:] for event in logged_events])
 
     # Make sure that we can call ray.log_span in a remote function.
     ray.get(test_log_span.remote())
@@ -597,6 +1015,323 @@ class APITest(unittest.TestCase):
     wait_for_num_events(3)
     self.assertEqual(len(events()), 3)
 
+    # Make sure that no events are logged if the sampling rate is zero.
+    ray.experimental.set_event_log_sampling_rate(0)
+    ray.get([test_log_event.remote() for _ in range(10)])
+    time.sleep(0.5)
+    self.assertEqual(len(events()), 3)
+    ray.experimental.set_event_log_sampling_rate(1)
+    ray.get(test_log_event.remote())
+    wait_for_num_events(4)
+    self.assertEqual(len(events()), 4)
+
+    ray.worker.cleanup()
+
+  def testObjectCache(self):
+    ray.init(num_workers=1)
+    ray.experimental.enable_object_cache(10 ** 6)
+
+    @ray.remote
+    def f(x):
+      return x["a"].sum()
+
+    x = ray.put({"a": np.ones(100)})
+    self.assertEqual(ray.get(f.remote(x)), 100)
+    self.assertEqual(ray.get(f.remote(x)), 100)
+
+    # The second get of the same object on the driver is a cache hit.
+    cache = ray.worker.global_worker.object_cache
+    assert_equal(ray.get(x), {"a": np.ones(100)})
+    self.assertEqual((cache.hits, cache.misses), (0, 1))
+    self.assertIs(ray.get(x), ray.get(x))
+    self.assertEqual(cache.hits, 2)
+
+    # Values larger than the cache are not cached, and the least recently used
+    # values are evicted.
+    large_id = ray.put(np.zeros(10 ** 6))
+    ray.get(large_id)
+    self.assertEqual(cache.stats()["num_objects"], 1)
+    object_ids = [ray.put(np.zeros(10 ** 5 // 8)) for _ in range(20)]
+    ray.get(object_ids)
+    self.assertLessEqual(cache.num_bytes, 10 ** 6)
+    self.assertGreater(cache.evictions, 0)
+
+    # The workers publish their statistics to Redis after executing a task.
+    driver_id = ray.worker.global_worker.worker_id
+    deadline = time.time() + 30
+    while True:
+      time.sleep(1.5)
+      ray.get(f.remote(x))
+      stats = ray.experimental.object_cache_stats()
+      worker_stats = [v for k, v in stats.items() if k != driver_id]
+      if len(worker_stats) == 1 and worker_stats[0]["hits"] >= 1:
+        break
+      if time.time() > deadline:
+        self.fail("The worker did not publish its cache statistics.")
+    self.assertEqual(stats[driver_id], cache.stats())
+
+    ray.worker.cleanup()
+
+  def testProfiling(self):
+    ray.init(num_workers=2)
+
+    def profiled_helper():
+      return sum(range(1000))
+
+    @ray.remote(profile=True)
+    def f():
+      return profiled_helper()
+
+    @ray.remote
+    def g():
+      return 1
+
+    self.assertIsNone(ray.experimental.profile_stats(f))
+    ray.get([f.remote() for _ in range(10)] + [g.remote()])
+    self.assertIsNone(ray.experimental.profile_stats(g))
+
+    # The workers publish their profiles in the background.
+    deadline = time.time() + 30
+    while True:
+      stats = ray.experimental.profile_stats(f)
+      if stats is not None:
+        num_calls = sum([v[1] for k, v in stats.stats.items() if k[2] == "profiled_helper"])
+        if num_calls == 10:
+          break
+      if time.time() > deadline:
+        self.fail("The profiles were not published.")
+      time.sleep(0.5)
+
+    ray.worker.cleanup()
+
+  def testTaskStats(self):
+    ray.init(num_workers=2)
+
+    @ray.remote
+    def f(x):
+      time.sleep(0.01)
+      return x
+
+    ray.get([f.remote(i) for i in range(20)])
+
+    # The workers publish their statistics in the background.
+    deadline = time.time() + 30
+    while True:
+      stats = ray.experimental.task_stats()
+      function_name = [name for name in stats if name.endswith(".f")]
+      if len(function_name) == 1 and stats[function_name[0]]["execute"]["count"] == 20:
+        break
+      if time.time() > deadline:
+        self.fail("The task statistics were not published.")
+      time.sleep(0.5)
+    f_stats = stats[function_name[0]]
+    self.assertEqual(set(f_stats.keys()), {"wait_for_function", "get_arguments", "execute", "store_outputs"})
+    for phase_stats in f_stats.values():
+      self.assertEqual(phase_stats["count"], 20)
+      self.assertLessEqual(phase_stats["p50"], phase_stats["p99"])
+      self.assertLessEqual(phase_stats["p99"], phase_stats["max"])
+    self.assertGreaterEqual(f_stats["execute"]["p50"], 0.009)
+
+    # Methods with the same name on different actor classes are reported
+    # separately.
+    @ray.actor
+    class Adder(object):
+      def __init__(self):
+        pass
+      def get(self):
+        return 1
+
+    @ray.actor
+    class Multiplier(object):
+      def __init__(self):
+        pass
+      def get(self):
+        return 2
+
+    adder = Adder()
+    multiplier = Multiplier()
+    ray.get([adder.get() for _ in range(3)] + [multiplier.get() for _ in range(5)])
+
+    deadline = time.time() + 30
+    while True:
+      stats = ray.experimental.task_stats()
+      adder_name = [name for name in stats if name.endswith(".Adder.get")]
+      multiplier_name = [name for name in stats if name.endswith(".Multiplier.get")]
+      if (len(adder_name) == 1 and len(multiplier_name) == 1 and
+          stats[adder_name[0]]["execute"]["count"] == 3 and
+          stats[multiplier_name[0]]["execute"]["count"] == 5):
+        break
+      if time.time() > deadline:
+        self.fail("The actor task statistics were not published.")
+      time.sleep(0.5)
+
+    ray.worker.cleanup()
+
+  def testCachedRemoteFunctions(self):
+    ray.init(num_workers=1)
+
+    @ray.remote(cache=True)
+    def f(x, y=0):
+      return np.random.rand()
+
+    @ray.remote(cache=True, num_return_vals=2)
+    def g(x):
+      return x, np.random.rand()
+
+    # Equivalent tasks return the same object IDs.
+    x_id = f.remote(1)
+    self.assertEqual(f.remote(1).id(), x_id.id())
+    self.assertEqual(f.remote(1, y=0).id(), x_id.id())
+    self.assertNotEqual(f.remote(2).id(), x_id.id())
+    self.assertNotEqual(f.remote({"a": 1}).id(), f.remote({"a": 2}).id())
+    self.assertEqual(ray.get(f.remote(1)), ray.get(x_id))
+
+    # Object IDs are compared by ID.
+    self.assertEqual(f.remote(x_id).id(), f.remote(x_id).id())
+    self.assertNotEqual(f.remote(x_id).id(), f.remote(ray.put(1)).id())
+
+    # Batches reuse earlier tasks and tasks earlier in the batch.
+    results = g.remote_batch([(1,), (3,), (3,)])
+    self.assertEqual([object_id.id() for object_id in results[0]],
+                     [object_id.id() for object_id in g.remote(1)])
+    self.assertEqual([object_id.id() for object_id in results[1]],
+                     [object_id.id() for object_id in results[2]])
+    self.assertEqual(ray.get(results[1][0]), 3)
+
+    # The entries of the cache expire.
+    ray.experimental.set_task_cache_ttl(1)
+    y_id = f.remote(5)
+    time.sleep(2)
+    self.assertNotEqual(f.remote(5).id(), y_id.id())
+
+    ray.experimental.clear_task_cache()
+    self.assertNotEqual(f.remote(1).id(), x_id.id())
+
+    # Redefining a function does not reuse the results of the old definition.
+    ray.experimental.set_task_cache_ttl(3600)
+
+    @ray.remote(cache=True)
+    def h(x):
+      return x
+
+    self.assertEqual(ray.get(h.remote(1)), 1)
+
+    @ray.remote(cache=True)
+    def h(x):
+      return -x
+
+    self.assertEqual(ray.get(h.remote(1)), -1)
+
+    ray.worker.cleanup()
+
+  def testStreamingRemoteFunctions(self):
+    ray.init(num_workers=2)
+
+    @ray.remote
+    def f(n):
+      for i in range(n):
+        yield i * np.ones(3)
+
+    values = [ray.get(object_id) for object_id in f.remote(5)]
+    assert_equal(values, [i * np.ones(3) for i in range(5)])
+    self.assertEqual(list(f.remote(0)), [])
+    streams = f.remote_batch([(1,), (2,)])
+    self.assertEqual([len(list(stream)) for stream in streams], [1, 2])
+
+    # The values can be consumed while the task is still running.
+    @ray.remote
+    def g():
+      yield 0
+      time.sleep(2)
+      yield 1
+
+    stream = g.remote()
+    self.assertEqual(ray.get(next(stream)), 0)
+    _, remaining_ids = ray.wait([stream.done_id], timeout=0)
+    self.assertEqual(len(remaining_ids), 1)
+    self.assertEqual(ray.get(next(stream)), 1)
+    self.assertRaises(StopIteration, lambda: next(stream))
+
+    # Values yielded before an exception are available.
+    @ray.remote
+    def h():
+      yield 0
+      raise Exception("The generator failed.")
+
+    stream = h.remote()
+    self.assertEqual(ray.get(next(stream)), 0)
+    self.assertRaises(Exception, lambda: next(stream))
+
+    ray.worker.cleanup()
+
+  def testReferenceCounting(self):
+    ray.init(num_workers=1)
+    untracked = ray.put(np.arange(100))
+    ray.experimental.enable_reference_counting()
+    plasma_client = ray.worker.global_worker.plasma_client
+
+    def wait_for_deletion(object_id_str):
+      for _ in range(50):
+        if not plasma_client.contains(object_id_str):
+          return
+        time.sleep(0.1)
+      self.fail("The object was not deleted.")
+
+    # An object is deleted once its last object ID is garbage collected.
+    x = ray.put(np.zeros(100))
+    y = x
+    x_id = x.id()
+    del x
+    time.sleep(0.5)
+    self.assertTrue(plasma_client.contains(x_id))
+    del y
+    wait_for_deletion(x_id)
+
+    # An object stays alive while an object that contains its ID does.
+    z = ray.put(np.ones(100))
+    z_id = z.id()
+    container = ray.put([z])
+    container_id = container.id()
+    del z
+    time.sleep(0.5)
+    assert_equal(ray.get(ray.get(container)[0]), np.ones(100))
+    del container
+    wait_for_deletion(container_id)
+    wait_for_deletion(z_id)
+
+    # The arguments of a task stay alive until the task has executed and its
+    # return value has been deleted.
+    @ray.remote
+    def f(x):
+      time.sleep(1)
+      return x.sum()
+
+    a = ray.put(np.ones(100))
+    a_id = a.id()
+    result = f.remote(a)
+    del a
+    self.assertEqual(ray.get(result), 100)
+    time.sleep(0.5)
+    self.assertTrue(plasma_client.contains(a_id))
+    result_id = result.id()
+    del result
+    wait_for_deletion(result_id)
+    wait_for_deletion(a_id)
+
+    # Objects that were put before reference counting was enabled are never
+    # deleted, even after they are passed to tasks.
+    self.assertEqual(ray.get(f.remote(untracked)), 4950)
+    time.sleep(0.5)
+    assert_equal(ray.get(untracked), np.arange(100))
+
+    # Cached remote functions submit a new task for every call, since the cache
+    # does not keep its return values alive.
+    @ray.remote(cache=True)
+    def g(x):
+      return x
+
+    self.assertNotEqual(g.remote(1).id(), g.remote(1).id())
+
     ray.worker.cleanup()
 
 class PythonModeTest(unittest.TestCase):
@@ -622,6 +1357,14 @@ class PythonModeTest(unittest.TestCase):
     assert_equal(aref, np.array([0, 0])) # python_mode_g should not mutate aref
     assert_equal(bref, np.array([1, 0]))
 
+    # ray.wait and ray.wait_async treat all values as ready.
+    self.assertEqual(ray.wait([1, 2, 3], num_returns=2), ([1, 2], [3]))
+    self.assertEqual(list(ray.as_completed([1, 2, 3], batch_size=2)), [[1, 2], [3]])
+    if sys.version_info >= (3, 5):
+      import asyncio
+      loop = asyncio.get_event_loop()
+      self.assertEqual(loop.run_until_complete(ray.wait_async([1, 2, 3])), ([1], [2, 3]))
+
     ray.worker.cleanup()
 
   def testEnvironmentVariablesInPythonMode(self):
@@ -201,6 +201,41 @@ class ReconstructionTests(unittest.TestCase):
       value = ray.get(args[i])
       self.assertEqual(value[0], i)
 
+  def testStreaming(self):
+    # Define a remote function that yields values that together take up half
+    # of the plasma stores' combined allotted memory.
+    num_values = 10
+    value_size = self.plasma_store_memory // (2 * num_values * 8)
+
+    @ray.remote
+    def stream(size):
+      for i in range(num_values):
+        array = np.zeros(size)
+        array[0] = i
+        yield array
+
+    value_ids = list(stream.remote(value_size))
+    for i in range(num_values):
+      value = ray.get(value_ids[i])
+      self.assertEqual(value[0], i)
+
+    # Fill the object stores with other objects so that the streamed values are
+    # evicted.
+    num_objects = 100
+    size = self.plasma_store_memory * 2 // (num_objects * 8)
+
+    @ray.remote
+    def foo(size):
+      return np.zeros(size)
+
+    for _ in range(num_objects):
+      ray.get(foo.remote(size))
+
+    # Get each streamed value again to force reconstruction.
+    for i in range(num_values):
+      value = ray.get(value_ids[i])
+      self.assertEqual(value[0], i)
+
   def testRecursive(self):
     # Define the size of one task's return argument so that the combined sum of
     # all objects' sizes is at least twice the plasma stores' combined allotted
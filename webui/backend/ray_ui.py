@@ -12,6 +12,8 @@ import sys
 import time
 import websockets
 
+from ray.event_log import decode_events
+
 parser = argparse.ArgumentParser(description="parse information for the web ui")
 parser.add_argument("--redis-address", required=True, type=str, help="the address to use for redis")
 
@@ -132,7 +134,7 @@ async def handle_get_recent_tasks(websocket, redis_conn, num_tasks):
     contents = []
     for key in keys:
       content = await redis_conn.execute("lrange", key, "0", "-1")
-      contents.append(json.loads(content[0].decode()))
+      contents.append(decode_events(content[0]))
       timestamps += [timestamp for (timestamp, task, kind, info) in contents[-1] if task == "ray:task"]
 
     timestamps.sort()
@@ -279,7 +281,7 @@ async def serve_requests(websocket, path):
       for key in await redis_conn.execute("keys", "event_log:*"):
         worker_id, task_id = key_to_hex_identifiers(key)
         content = await redis_conn.execute("lrange", key, "0", "-1")
-        data = json.loads(content[0].decode())
+        data = decode_events(content[0])
         begin_and_end_time = [timestamp for (timestamp, task, kind, info) in data if task == "ray:task"]
         tasks[worker_id].append({"task_id": task_id,
                                  "start_task": min(begin_and_end_time),
@@ -291,7 +293,7 @@ async def serve_requests(websocket, path):
         worker_id, task_id = key_to_hex_identifiers(key)
         answer = await redis_conn.execute("lrange", key, "0", "-1")
         assert len(answer) == 1
-        events = json.loads(answer[0].decode())
+        events = decode_events(answer[0])
         result.extend([{"worker_id": worker_id,
                         "task_id": task_id,
                         "time": event[0],